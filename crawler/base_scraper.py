@@ -9,6 +9,7 @@
 import asyncio
 import random
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional, TypeVar, Generic
 from dataclasses import dataclass
 from datetime import datetime
@@ -57,6 +58,15 @@ except ImportError:
 
 T = TypeVar('T')
 
+# chromium 실행 옵션 (단독 실행/공유 브라우저 공통)
+BROWSER_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-infobars',
+    '--window-size=1920,1080',
+]
+
 
 @dataclass
 class ScraperConfig:
@@ -72,6 +82,36 @@ class ScraperConfig:
     page_load_delay: float = 3.0
     anti_bot_delay_min: float = 1.0
     anti_bot_delay_max: float = 3.0
+    # playwright_browser_pool()로 띄운 공유 브라우저 (있으면 컨텍스트만 새로 생성)
+    shared_browser: Optional[Browser] = None
+
+
+@asynccontextmanager
+async def playwright_browser_pool(headless: bool = True):
+    """
+    여러 스크래퍼가 함께 쓰는 브라우저
+
+    chromium 기동 비용을 한 번만 지불하고, 스크래퍼마다
+    BrowserContext만 새로 연다.
+
+    사용법:
+        async with playwright_browser_pool() as browser:
+            config = ScraperConfig(shared_browser=browser)
+            async with GenericScraper("costco", scraper_config=config) as scraper:
+                ...
+    """
+    if not PLAYWRIGHT_AVAILABLE:
+        raise RuntimeError("Playwright가 설치되어 있지 않습니다. pip install playwright && playwright install chromium")
+
+    playwright = await async_playwright().start()
+    browser = await playwright.chromium.launch(headless=headless, args=BROWSER_LAUNCH_ARGS)
+    try:
+        yield browser
+    finally:
+        try:
+            await browser.close()
+        finally:
+            await playwright.stop()
 
 
 class BaseScraper(ABC, Generic[T]):
@@ -106,18 +146,15 @@ class BaseScraper(ABC, Generic[T]):
         if self._is_initialized and self.page:
             return
 
-        self.playwright = await async_playwright().start()
-
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.config.headless,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-infobars',
-                '--window-size=1920,1080',
-            ]
-        )
+        if self.config.shared_browser is not None:
+            # 공유 브라우저: 프로세스는 재사용하고 컨텍스트만 분리
+            self.browser = self.config.shared_browser
+        else:
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.config.headless,
+                args=BROWSER_LAUNCH_ARGS
+            )
 
         self.context = await self.browser.new_context(
             viewport={
@@ -171,7 +208,8 @@ class BaseScraper(ABC, Generic[T]):
                 await self.page.close()
             if self.context:
                 await self.context.close()
-            if self.browser:
+            # 공유 브라우저는 소유자(playwright_browser_pool)가 종료
+            if self.browser and self.browser is not self.config.shared_browser:
                 await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
@@ -257,6 +295,30 @@ class BaseScraper(ABC, Generic[T]):
         except Exception:
             return False
 
+    async def _wait_for_any_selector(self, selectors: List[str], timeout: int = None) -> bool:
+        """
+        여러 셀렉터 중 하나가 나타날 때까지 대기
+
+        순서대로 하나씩 기다리면 최악의 경우 timeout × 셀렉터 수가 걸리므로
+        모두 동시에 기다리고 가장 먼저 찾은 셀렉터에서 멈춘다.
+        """
+        if not selectors:
+            return False
+
+        pending = {
+            asyncio.create_task(self._wait_for_selector_safe(selector, timeout=timeout))
+            for selector in selectors
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(task.result() for task in done):
+                    return True
+            return False
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def _evaluate_safe(self, script: str, default: Any = None) -> Any:
         """안전한 JavaScript 실행"""
         try:
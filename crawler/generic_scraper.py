@@ -6,12 +6,15 @@
 - 코드 중복 최소화
 """
 import re
+import sys
 import asyncio
+import functools
+import operator
 import urllib.parse
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from dataclasses import dataclass, field
 
-from base_scraper import BaseScraper, ScraperConfig
+from base_scraper import BaseScraper, ScraperConfig, playwright_browser_pool
 from scraper_configs import StoreConfig, StoreSelectors, get_store_config, STORE_CONFIGS
 
 
@@ -45,40 +48,32 @@ class Product:
     extra: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict:
-        """딕셔너리 변환"""
-        result = {
-            "product_id": self.product_id,
-            "name": self.name,
-            "store": self.store,
-            "price": self.price,
-            "original_price": self.original_price,
-            "image_url": self.image_url,
-            "product_url": self.product_url,
-            "category": self.category,
-            "brand": self.brand,
-            "rating": self.rating,
-            "review_count": self.review_count,
-        }
-
-        # 값이 있는 확장 필드만 포함
-        if self.type_name:
-            result["type_name"] = self.type_name
-        if self.unit_price:
-            result["unit_price"] = self.unit_price
-        if self.event_type:
-            result["event_type"] = self.event_type
-        if self.is_best:
-            result["is_best"] = self.is_best
-        if self.is_sale:
-            result["is_sale"] = self.is_sale
-        if self.is_new:
-            result["is_new"] = self.is_new
+        """딕셔너리 변환 (값이 있는 확장 필드만 포함)"""
+        result = dict(zip(_REQUIRED_FIELDS, _get_required_fields(self)))
+        result.update(
+            (key, value) for key in _OPTIONAL_FIELDS
+            if (value := getattr(self, key))
+        )
         if self.extra:
             result["extra"] = self.extra
-
         return result
 
 
+# to_dict 직렬화 필드 (클래스 정의 시 한 번만 구성)
+_REQUIRED_FIELDS = (
+    "product_id", "name", "store", "price", "original_price", "image_url",
+    "product_url", "category", "brand", "rating", "review_count",
+)
+_OPTIONAL_FIELDS = ("type_name", "unit_price", "event_type", "is_best", "is_sale", "is_new")
+_get_required_fields = operator.attrgetter(*_REQUIRED_FIELDS)
+
+
+@functools.lru_cache(maxsize=1024)
+def _search_url(base: str, param: str, query: str) -> str:
+    """검색 URL 생성 (같은 검색어를 여러 스토어에 쓰는 경우 재사용)"""
+    return f"{base}?{urllib.parse.urlencode({param: query})}"
+
+
 class GenericScraper(BaseScraper[Product]):
     """
     설정 기반 통합 스크래퍼
@@ -114,7 +109,9 @@ class GenericScraper(BaseScraper[Product]):
 
         # BaseScraper 초기화
         super().__init__(scraper_config)
-        self.store_name = self.store_config.code
+        # 모든 Product가 같은 문자열 객체를 공유하도록 intern
+        self.store_name = sys.intern(self.store_config.code)
+        self._bot_checked_url: Optional[str] = None
 
     @classmethod
     def from_config(cls, store_config: StoreConfig, scraper_config: ScraperConfig = None):
@@ -132,44 +129,53 @@ class GenericScraper(BaseScraper[Product]):
         Returns:
             상품 목록
         """
+        try:
+            return [p async for p in self.search_products_iter(query, limit)]
+        except Exception as e:
+            self.logger.error(f"검색 실패 ({query}): {e}")
+            return []
+
+    async def search_products_iter(self, query: str, limit: int = 20) -> AsyncIterator[Product]:
+        """
+        상품 검색 (파싱되는 대로 하나씩 반환)
+
+        전체 목록을 만들지 않고 DB 저장 등으로 바로 흘려보낼 때 사용
+        """
+        # 검색 URL 생성
+        search_url = _search_url(
+            self.store_config.search_url,
+            self.store_config.search_query_param,
+            query,
+        )
+
         if not self.page:
             await self._init_browser()
 
-        try:
-            # 메인 페이지 먼저 방문 필요시 (올리브영 등)
-            if self.store_config.needs_main_page_first:
-                self.logger.info(f"메인 페이지 접속: {self.store_config.base_url}")
-                await self._goto_with_retry(f"{self.store_config.base_url}")
-                await self._random_delay(2, 4)
-
-            # 검색 URL 생성
-            encoded_query = urllib.parse.quote(query)
-            param = self.store_config.search_query_param
-            search_url = f"{self.store_config.search_url}?{param}={encoded_query}"
-
-            self.logger.info(f"검색: '{query}'")
-            success = await self._goto_with_retry(search_url)
-            if not success:
-                return []
+        # 메인 페이지 먼저 방문 필요시 (올리브영 등)
+        if self.store_config.needs_main_page_first:
+            self.logger.info(f"메인 페이지 접속: {self.store_config.base_url}")
+            await self._goto_with_retry(f"{self.store_config.base_url}")
+            await self._random_delay(2, 4)
 
-            # 추가 대기
-            await asyncio.sleep(self.store_config.page_load_delay)
+        self.logger.info(f"검색: '{query}'")
+        success = await self._goto_with_retry(search_url)
+        if not success:
+            return
 
-            # 쿠키 팝업 처리
-            if self.store_config.selectors.cookie_popup:
-                await self._handle_popup(self.store_config.selectors.cookie_popup)
+        # 추가 대기
+        await asyncio.sleep(self.store_config.page_load_delay)
 
-            # 스크롤 필요시
-            if self.store_config.requires_scroll:
-                await self._scroll_page(times=self.store_config.scroll_times)
+        # 쿠키 팝업 처리
+        if self.store_config.selectors.cookie_popup:
+            await self._handle_popup(self.store_config.selectors.cookie_popup)
 
-            # 파싱
-            products = await self._parse_products(limit)
-            return products
+        # 스크롤 필요시
+        if self.store_config.requires_scroll:
+            await self._scroll_page(times=self.store_config.scroll_times)
 
-        except Exception as e:
-            self.logger.error(f"검색 실패 ({query}): {e}")
-            return []
+        # 파싱
+        async for product in self._parse_products(limit):
+            yield product
 
     async def get_category_products(self, category_path: str, limit: int = 50) -> List[Product]:
         """
@@ -179,18 +185,18 @@ class GenericScraper(BaseScraper[Product]):
             category_path: 카테고리 경로 또는 코드
             limit: 최대 결과 수
         """
+        # 카테고리 URL 생성
+        if category_path.startswith("http"):
+            category_url = category_path
+        elif self.store_config.category_url_pattern:
+            category_url = self.store_config.category_url_pattern.replace("{code}", category_path)
+        else:
+            category_url = f"{self.store_config.base_url}/{category_path}"
+
         if not self.page:
             await self._init_browser()
 
         try:
-            # 카테고리 URL 생성
-            if category_path.startswith("http"):
-                category_url = category_path
-            elif self.store_config.category_url_pattern:
-                category_url = self.store_config.category_url_pattern.replace("{code}", category_path)
-            else:
-                category_url = f"{self.store_config.base_url}/{category_path}"
-
             self.logger.info(f"카테고리 접속: {category_path}")
             success = await self._goto_with_retry(category_url)
             if not success:
@@ -202,8 +208,7 @@ class GenericScraper(BaseScraper[Product]):
             if self.store_config.selectors.cookie_popup:
                 await self._handle_popup(self.store_config.selectors.cookie_popup)
 
-            products = await self._parse_products(limit)
-            return products
+            return [p async for p in self._parse_products(limit)]
 
         except Exception as e:
             self.logger.error(f"카테고리 수집 실패 ({category_path}): {e}")
@@ -228,11 +233,10 @@ class GenericScraper(BaseScraper[Product]):
             self.logger.info(f"이벤트 상품 수집: {event_type}")
 
             # 이벤트 타입별 URL 처리
+            query_string = self.store_config.event_url_params.get(event_type, "")
             event_url = self.store_config.search_url
-            if event_type == "2+1" and "emart24" in self.store_name:
-                event_url += "?eventTypeCode=TWO_TO_ONE"
-            elif event_type == "1+1" and "emart24" in self.store_name:
-                event_url += "?eventTypeCode=ONE_TO_ONE"
+            if query_string:
+                event_url = f"{event_url}?{query_string}"
 
             success = await self._goto_with_retry(event_url)
             if not success:
@@ -241,14 +245,15 @@ class GenericScraper(BaseScraper[Product]):
             await asyncio.sleep(self.store_config.page_load_delay)
 
             # 탭 선택 (CU 등)
-            if event_type == "2+1":
-                tab_selector = 'a[data-tab="2"], .tab_2plus1, #tab2'
+            tab_selector = self.store_config.selectors.event_tab.get(event_type)
+            if tab_selector:
                 await self._handle_popup(tab_selector, action="click")
                 await asyncio.sleep(2)
 
-            products = await self._parse_products(limit)
+            products = [p async for p in self._parse_products(limit)]
 
             # 이벤트 타입 설정
+            event_type = sys.intern(event_type)
             for p in products:
                 p.event_type = event_type
 
@@ -258,79 +263,88 @@ class GenericScraper(BaseScraper[Product]):
             self.logger.error(f"이벤트 상품 수집 실패: {e}")
             return []
 
-    async def _parse_products(self, limit: int) -> List[Product]:
+    async def _parse_products(self, limit: int) -> AsyncIterator[Product]:
         """
-        페이지에서 상품 파싱
+        페이지에서 상품 파싱 (생성되는 대로 하나씩 반환)
 
         JavaScript로 DOM에서 데이터 추출
         """
-        products = []
-        selectors = self.store_config.selectors
-
-        # 상품 목록 로딩 대기
-        for selector in selectors.product_list:
-            if await self._wait_for_selector_safe(selector, timeout=10000):
-                break
+        # 상품 목록 로딩 대기 (후보 셀렉터 동시 대기)
+        await self._wait_for_any_selector(self.store_config.selectors.product_list, timeout=10000)
 
         try:
             # JavaScript로 데이터 추출
-            js_script = self._build_parse_script()
+            js_script = self._build_parse_script(limit)
             product_data = await self._evaluate_safe(js_script, default=[])
 
             if not product_data:
                 self.logger.warning("상품을 찾지 못함")
-                # 봇 차단 확인
-                content = await self.page.content()
-                if "blocked" in content.lower() or "captcha" in content.lower():
+                if await self._detect_bot_block():
                     self.logger.warning("봇 차단 또는 캡챠 감지됨")
-                return []
-
-            self.logger.info(f"{len(product_data)}개 상품 발견")
-
-            # Product 객체 생성
-            seen_ids = set()
-            for item in product_data:
-                try:
-                    product_id = item.get('productId', '')
-                    if not product_id or product_id in seen_ids:
-                        continue
-                    seen_ids.add(product_id)
-
-                    name = item.get('name', '')
-                    if not name:
-                        continue
-
-                    product = Product(
-                        product_id=product_id,
-                        name=name,
-                        store=self.store_name,
-                        price=item.get('price', 0),
-                        original_price=item.get('originalPrice', 0),
-                        image_url=item.get('imageUrl', ''),
-                        product_url=item.get('productUrl', ''),
-                        brand=item.get('brand', ''),
-                        rating=item.get('rating', 0),
-                        review_count=item.get('reviewCount', 0),
-                        type_name=item.get('typeName', ''),
-                        event_type=item.get('eventType', ''),
-                        is_best=item.get('isBest', False),
-                        is_sale=item.get('isSale', False),
-                    )
-                    products.append(product)
-
-                    if len(products) >= limit:
-                        break
-
-                except Exception:
-                    continue
+                return
 
         except Exception as e:
             self.logger.error(f"파싱 실패: {e}")
+            return
+
+        self.logger.info(f"{len(product_data)}개 상품 발견")
+
+        # Product 객체 생성 (중복 제거/limit은 JS에서 처리됨)
+        for item in product_data:
+            try:
+                # 종류가 적은 문자열(브랜드, 이벤트 타입)은 intern해서 공유
+                brand = item.get('brand', '')
+                event_type = item.get('eventType', '')
+                product = Product(
+                    product_id=item['productId'],
+                    name=item['name'],
+                    store=self.store_name,
+                    price=item.get('price', 0),
+                    original_price=item.get('originalPrice', 0),
+                    image_url=item.get('imageUrl', ''),
+                    product_url=item.get('productUrl', ''),
+                    brand=sys.intern(brand) if brand else '',
+                    rating=item.get('rating', 0),
+                    review_count=item.get('reviewCount', 0),
+                    type_name=item.get('typeName', ''),
+                    event_type=sys.intern(event_type) if event_type else '',
+                    is_best=item.get('isBest', False),
+                    is_sale=item.get('isSale', False),
+                )
+            except Exception:
+                continue
+
+            yield product
+
+    async def _detect_bot_block(self) -> bool:
+        """
+        봇 차단/캡챠 페이지 여부 확인
 
-        return products
+        전체 DOM 대신 본문 텍스트 앞부분만 가져오고, 같은 페이지는 한 번만 확인
+        """
+        if not self.store_config.check_bot_block:
+            return False
+
+        url = self.page.url
+        if url == self._bot_checked_url:
+            return False
+        self._bot_checked_url = url
+
+        snippet = await self._evaluate_safe(
+            "() => (document.body && document.body.innerText || '').slice(0, 2000)",
+            default=""
+        )
+        snippet = (snippet or "").lower()
+        return "blocked" in snippet or "captcha" in snippet
+
+    def _build_parse_script(self, limit: int = 0) -> str:
+        """
+        상품 파싱용 JavaScript 생성
 
-    def _build_parse_script(self) -> str:
-        """상품 파싱용 JavaScript 생성"""
+        Args:
+            limit: 최대 결과 수 (0이면 제한 없음). JS 안에서 중복 제거와
+                   함께 처리해 limit개만 Python으로 넘어온다.
+        """
         s = self.store_config.selectors
         base_url = self.store_config.base_url
 
@@ -345,6 +359,8 @@ class GenericScraper(BaseScraper[Product]):
 
         return f'''() => {{
             const results = [];
+            const seen = new Set();
+            const LIMIT = {int(limit or 0)};
             const baseUrl = "{base_url}";
             const idPattern = "{s.id_pattern}";
             const idAttr = "{s.id_attribute}";
@@ -388,26 +404,30 @@ class GenericScraper(BaseScraper[Product]):
                 if (items.length > 0) break;
             }}
 
-            items.forEach((item, idx) => {{
-                try {{
-                    const nameSelectors = [{name_selectors}];
-                    const priceSelectors = [{price_selectors}];
-                    const origPriceSelectors = [{orig_price_selectors}];
-                    const linkSelectors = [{link_selectors}];
-                    const ratingSelectors = [{rating_selectors}];
-                    const brandSelectors = [{brand_selectors}];
+            const nameSelectors = [{name_selectors}];
+            const priceSelectors = [{price_selectors}];
+            const origPriceSelectors = [{orig_price_selectors}];
+            const linkSelectors = [{link_selectors}];
+            const ratingSelectors = [{rating_selectors}];
+            const brandSelectors = [{brand_selectors}];
 
+            for (let idx = 0; idx < items.length; idx++) {{
+                if (LIMIT && results.length >= LIMIT) break;
+                const item = items[idx];
+                try {{
                     // 이름
                     const nameEl = findElement(item, nameSelectors);
                     const name = nameEl ? nameEl.textContent.trim() : '';
-                    if (!name) return;
+                    if (!name) continue;
 
                     // 링크
                     const linkEl = findElement(item, linkSelectors);
 
-                    // ID 추출
+                    // ID 추출 (중복은 건너뜀)
                     let productId = extractId(item, linkEl);
                     if (!productId) productId = idx.toString();
+                    if (seen.has(productId)) continue;
+                    seen.add(productId);
 
                     // 가격
                     const priceEl = findElement(item, priceSelectors);
@@ -452,7 +472,7 @@ class GenericScraper(BaseScraper[Product]):
                         isSale: originalPrice > 0 && originalPrice > price
                     }});
                 }} catch (e) {{}}
-            }});
+            }}
 
             return results;
         }}'''
@@ -473,7 +493,65 @@ async def search_store(store_code: str, query: str, limit: int = 20) -> List[Pro
         return await scraper.search_products(query, limit)
 
 
-async def search_all_stores(query: str, limit_per_store: int = 10) -> Dict[str, List[Product]]:
+async def iter_all_stores(
+    query: str,
+    limit_per_store: int = 10,
+    max_concurrency: int = 3
+) -> AsyncIterator[Tuple[str, Product]]:
+    """
+    모든 스토어에서 상품 검색 (도착하는 대로 (스토어 코드, 상품) 반환)
+
+    스토어마다 호스트가 다르므로 max_concurrency개까지 동시에 검색한다.
+    브라우저는 한 번만 띄워 모든 스토어가 공유한다.
+
+    Example:
+        async for store, product in iter_all_stores("선크림"):
+            db.insert(store, product)
+    """
+    non_event_stores = [code for code, cfg in STORE_CONFIGS.items() if not cfg.is_event_store]
+    semaphore = asyncio.Semaphore(max_concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async with playwright_browser_pool() as browser:
+        scraper_config = ScraperConfig(shared_browser=browser)
+
+        async def search_one(store_code: str):
+            async with semaphore:
+                try:
+                    async with GenericScraper(store_code, scraper_config=scraper_config) as scraper:
+                        async for product in scraper.search_products_iter(query, limit_per_store):
+                            await queue.put((store_code, product))
+                except Exception as e:
+                    print(f"[에러] {store_code} 검색 실패: {e}")
+
+        async def run_all():
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for store_code in non_event_stores:
+                        tg.create_task(search_one(store_code))
+            finally:
+                queue.put_nowait(done)
+
+        runner = asyncio.create_task(run_all())
+        try:
+            while (item := await queue.get()) is not done:
+                yield item
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+                try:
+                    await runner
+                except asyncio.CancelledError:
+                    pass
+
+
+async def search_all_stores(
+    query: str,
+    limit_per_store: int = 10,
+    max_concurrency: int = 3
+) -> Dict[str, List[Product]]:
     """
     모든 스토어에서 상품 검색
 
@@ -482,19 +560,11 @@ async def search_all_stores(query: str, limit_per_store: int = 10) -> Dict[str,
         for store, products in results.items():
             print(f"{store}: {len(products)}개")
     """
-    results = {}
-    non_event_stores = [code for code, cfg in STORE_CONFIGS.items() if not cfg.is_event_store]
-
-    for store_code in non_event_stores:
-        try:
-            async with GenericScraper(store_code) as scraper:
-                products = await scraper.search_products(query, limit_per_store)
-                results[store_code] = products
-        except Exception as e:
-            print(f"[에러] {store_code} 검색 실패: {e}")
-            results[store_code] = []
+    # 스토어 설정 순서 유지 (실패한 스토어는 빈 목록)
+    results = {code: [] for code, cfg in STORE_CONFIGS.items() if not cfg.is_event_store}
 
-        await asyncio.sleep(2)  # 부하 방지
+    async for store_code, product in iter_all_stores(query, limit_per_store, max_concurrency):
+        results[store_code].append(product)
 
     return results
 
@@ -509,16 +579,19 @@ async def get_all_event_products(event_type: str = "1+1", limit_per_store: int =
     results = {}
     event_stores = [code for code, cfg in STORE_CONFIGS.items() if cfg.is_event_store]
 
-    for store_code in event_stores:
-        try:
-            async with GenericScraper(store_code) as scraper:
-                products = await scraper.get_event_products(event_type, limit_per_store)
-                results[store_code] = products
-        except Exception as e:
-            print(f"[에러] {store_code} 수집 실패: {e}")
-            results[store_code] = []
+    async with playwright_browser_pool() as browser:
+        scraper_config = ScraperConfig(shared_browser=browser)
+
+        for store_code in event_stores:
+            try:
+                async with GenericScraper(store_code, scraper_config=scraper_config) as scraper:
+                    products = await scraper.get_event_products(event_type, limit_per_store)
+                    results[store_code] = products
+            except Exception as e:
+                print(f"[에러] {store_code} 수집 실패: {e}")
+                results[store_code] = []
 
-        await asyncio.sleep(2)
+            await asyncio.sleep(2)
 
     return results
 
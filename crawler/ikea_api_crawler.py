@@ -4,21 +4,103 @@ IKEA Korea API 크롤러
 - 공식 API를 사용하여 정확한 가격/리뷰 데이터 수집
 - 하드코딩 대신 실제 사이트 데이터 사용
 """
+import asyncio
+import aiohttp
+import json
+import logging
+import random
 import requests
 import sqlite3
-import time
 import re
 from datetime import datetime
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import Callable, List, Dict, Optional, Tuple
+from dataclasses import dataclass
+
+from rate_limiter import get_limiter
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 동기 클라이언트 (h2 없으면 requests.Session 사용)
+try:
+    import httpx
+    import h2  # noqa: F401
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # DB 경로 설정
 DB_PATH = '../data/products.db'
 
+
+# 연결마다 적용할 SQLite 설정 (WAL + 완화된 fsync, 메모리 캐시)
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+"""
+
+
+def _open_db(**kwargs):
+    """SQLite 연결 (WAL 및 성능 PRAGMA 적용, 준비된 문장 캐시 확대)"""
+    conn = sqlite3.connect(DB_PATH, cached_statements=256, **kwargs)
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
+
 # IKEA Korea API 설정
 IKEA_API_BASE = "https://sik.search.blue.cdtapps.com/kr/ko/search"
+# 카테고리 목록 페이지(PLP)가 쓰는 API (검색어 대신 카테고리 ID로 목록 조회)
+IKEA_CATEGORY_API = "https://sik.search.blue.cdtapps.com/kr/ko/product-list-page/more-products"
 IKEA_PRODUCT_API = "https://www.ikea.com/kr/ko/products"
 
+# 상대 경로로 오는 이미지/상품 URL 앞에 붙일 주소
+_BASE = "https://www.ikea.com"
+
+# 없는 키의 기본값으로 공유하는 빈 dict (상품마다 새 dict를 만들지 않음, 읽기 전용)
+_EMPTY = {}
+
+IKEA_API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'ko-KR,ko;q=0.9',
+}
+
+# 카테고리 동시 요청 수 (API 부하 방지)
+MAX_CONCURRENT_REQUESTS = 8
+
+# 검색 API 한 번에 받을 수 있는 최대 상품 수 (초과분은 start 오프셋으로 페이지 요청)
+PAGE_SIZE = 100
+
+# 초당 요청 수 제한 (동시 요청과 별개로 IKEA 서버 부하 방지)
+IKEA_LIMITER = get_limiter("ikea", requests_per_second=5, burst_size=5)
+
+# 일시적 오류(타임아웃, 5xx, 429) 재시도 설정
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# 긴 크롤링에서 중간 커밋 간격 (상품 수)
+COMMIT_EVERY = 500
+
+# 카테고리 URL 끝의 카테고리 ID (예: .../cat/sofas-fu003/ -> fu003, .../desks-20649/ -> 20649)
+_CATEGORY_ID_RE = re.compile(r'-([a-z]*\d+)/?$')
+
+
+def category_id_from_url(url: str) -> str:
+    """카테고리 URL -> 카테고리 ID (없으면 빈 문자열)"""
+    match = _CATEGORY_ID_RE.search(url)
+    return match.group(1) if match else ''
+
+
 # 인기 검색 카테고리
 IKEA_CATEGORIES = [
     "책상", "의자", "수납장", "선반", "옷장",
@@ -30,9 +112,9 @@ IKEA_CATEGORIES = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class IkeaProduct:
-    """IKEA 상품 데이터"""
+    """IKEA 상품 데이터 (크롤링마다 수천 개 생성되므로 __slots__ 사용)"""
     product_no: str
     name: str
     name_ko: str
@@ -46,17 +128,56 @@ class IkeaProduct:
     is_new: bool = False
     is_sale: bool = False
 
+    def as_row(self) -> tuple:
+        """UPSERT_SQL 컬럼 순서의 DB 행"""
+        return (
+            self.product_no, self.name, self.name_ko,
+            self.price, self.original_price,
+            self.image_url, self.product_url, self.category,
+            self.rating, self.review_count,
+            1 if self.is_new else 0,
+            1 if self.is_sale else 0,
+        )
+
 
 class IkeaAPICrawler:
     """IKEA Korea API 크롤러"""
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'ko-KR,ko;q=0.9',
-        })
+        if HTTPX_AVAILABLE:
+            # 같은 호스트 반복 요청을 HTTP/2 연결 하나로 다중화
+            self.session = httpx.Client(
+                http2=True,
+                headers=IKEA_API_HEADERS,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            )
+        else:
+            self.session = requests.Session()
+            self.session.headers.update(IKEA_API_HEADERS)
+
+    def close(self):
+        """연결 정리"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def search_params(query: str, limit: int, start: int = 0) -> Dict:
+        """IKEA Search API 파라미터"""
+        params = {
+            'q': query,
+            'size': min(limit, PAGE_SIZE),
+            'c': 'sr',  # search results
+            'v': '20231101',
+        }
+        if start:
+            params['start'] = start
+        return params
 
     def search_products(self, query: str, limit: int = 50) -> List[IkeaProduct]:
         """상품 검색"""
@@ -64,167 +185,407 @@ class IkeaAPICrawler:
 
         try:
             # IKEA Search API 호출
-            params = {
-                'q': query,
-                'size': min(limit, 100),
-                'c': 'sr',  # search results
-                'v': '20231101',
-            }
-
+            params = self.search_params(query, limit)
             response = self.session.get(IKEA_API_BASE, params=params, timeout=30)
 
             if response.status_code != 200:
-                print(f"[IKEA API] 검색 실패: {response.status_code}")
+                logger.warning("[IKEA API] 검색 실패: %s", response.status_code)
                 return products
 
-            data = response.json()
+            products = self.parse_search_body(response.content, query)
+            logger.debug("[IKEA] '%s' 검색: %d개 상품 발견", query, len(products))
 
-            # 상품 데이터 파싱
-            search_results = data.get('searchResultPage', {})
-            product_list = search_results.get('products', {}).get('main', {}).get('items', [])
+        except Exception as e:
+            logger.warning("[IKEA API] 오류: %s", e)
 
-            for item in product_list:
-                try:
-                    product = self._parse_product(item, query)
-                    if product and product.price > 0:
-                        products.append(product)
-                except Exception as e:
-                    print(f"[IKEA] 상품 파싱 실패: {e}")
-                    continue
+        return products
 
-            print(f"[IKEA] '{query}' 검색: {len(products)}개 상품 발견")
+    async def search_products_async(
+        self,
+        session: aiohttp.ClientSession,
+        query: str,
+        limit: int = 50
+    ) -> List[IkeaProduct]:
+        """상품 검색 (비동기, 여러 카테고리를 동시에 요청할 때 사용)
+
+        limit이 PAGE_SIZE보다 크면 start 오프셋별 페이지를 동시에 요청해서 합침
+        """
+        pages = await asyncio.gather(*(
+            self._fetch_page(session, IKEA_API_BASE, self.search_params(query, limit - start, start), query,
+                             self._parse_search_results)
+            for start in range(0, limit, PAGE_SIZE)
+        ))
+
+        products = [p for page in pages for p in page][:limit]
+        logger.debug("[IKEA] '%s' 검색: %d개 상품 발견", query, len(products))
+        return products
 
-        except Exception as e:
-            print(f"[IKEA API] 오류: {e}")
+    @staticmethod
+    def category_params(category_id: str, limit: int, start: int = 0) -> Dict:
+        """카테고리 목록 API 파라미터 (start 이상 end 미만 구간)"""
+        return {
+            'category': category_id,
+            'start': start,
+            'end': start + min(limit, PAGE_SIZE),
+            'c': 'plp',  # product list page
+            'v': '20231101',
+        }
 
+    async def category_products_async(
+        self,
+        session: aiohttp.ClientSession,
+        category_id: str,
+        category: str,
+        limit: int = 50
+    ) -> List[IkeaProduct]:
+        """카테고리 ID로 목록 페이지 상품 조회 (검색어 검색과 달리 카테고리에 속한 상품만)
+
+        limit이 PAGE_SIZE보다 크면 start 오프셋별 페이지를 동시에 요청해서 합침
+        """
+        pages = await asyncio.gather(*(
+            self._fetch_page(session, IKEA_CATEGORY_API, self.category_params(category_id, limit - start, start),
+                             category, self._parse_category_page)
+            for start in range(0, limit, PAGE_SIZE)
+        ))
+
+        products = [p for page in pages for p in page][:limit]
+        logger.debug("[IKEA] 카테고리 %s(%s): %d개 상품 발견", category, category_id, len(products))
         return products
 
-    def _parse_product(self, item: Dict, category: str) -> Optional[IkeaProduct]:
-        """API 응답에서 상품 정보 파싱"""
-        try:
-            product_data = item.get('product', {})
-
-            # 기본 정보
-            product_id = product_data.get('itemNo', '')
-            if not product_id:
-                return None
-
-            name = product_data.get('name', '')
-            type_name = product_data.get('typeName', '')
-            full_name = f"{name} {type_name}".strip()
-
-            # 가격 정보
-            price_info = product_data.get('salesPrice', {})
-            price = 0
-            original_price = None
-
-            # 현재 가격
-            current_price = price_info.get('numeral', 0)
-            if current_price:
-                price = int(current_price)
-
-            # 원래 가격 (할인 상품인 경우)
-            was_price_info = product_data.get('wasPrice', {})
-            if was_price_info:
-                orig = was_price_info.get('numeral', 0)
-                if orig and orig > price:
-                    original_price = int(orig)
-
-            # 이미지 URL
-            main_image = product_data.get('mainImageUrl', '')
-            if main_image and not main_image.startswith('http'):
-                main_image = f"https://www.ikea.com{main_image}"
-
-            # 상품 URL
-            pip_url = product_data.get('pipUrl', '')
-            if pip_url and not pip_url.startswith('http'):
-                pip_url = f"https://www.ikea.com{pip_url}"
-
-            # 리뷰 정보
-            rating_info = product_data.get('rating', {})
-            rating = rating_info.get('average', None)
-            review_count = rating_info.get('count', 0)
-
-            if rating:
-                rating = round(float(rating), 1)
-
-            # 신상품/할인 플래그
-            is_new = product_data.get('isNew', False)
-            is_sale = original_price is not None and original_price > price
-
-            return IkeaProduct(
-                product_no=product_id,
-                name=name,
-                name_ko=full_name,
-                price=price,
-                original_price=original_price,
-                image_url=main_image,
-                product_url=pip_url,
-                category=category,
-                rating=rating,
-                review_count=review_count,
-                is_new=is_new,
-                is_sale=is_sale,
-            )
+    async def _fetch_page(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        params: Dict,
+        category: str,
+        parse: Callable[[Dict, str], List[IkeaProduct]]
+    ) -> List[IkeaProduct]:
+        """API 한 페이지 요청 후 parse(응답, category)로 파싱 (일시적 오류는 재시도)"""
+        for attempt in range(MAX_RETRIES):
+            retryable = False
+            try:
+                await IKEA_LIMITER.wait_async()
+                async with session.get(
+                    url,
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=30)
+                ) as response:
+                    if response.status != 200:
+                        logger.warning("[IKEA API] 요청 실패: %s", response.status)
+                        retryable = response.status in RETRY_STATUSES
+                    else:
+                        return parse(_json_loads(await response.read()), category)
 
-        except Exception as e:
-            print(f"[IKEA] 파싱 오류: {e}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning("[IKEA API] 네트워크 오류: %s", e)
+                retryable = True
+            except Exception as e:
+                logger.warning("[IKEA API] 오류: %s", e)
+
+            if not retryable or attempt == MAX_RETRIES - 1:
+                break
+
+            # 지수 백오프 + jitter
+            delay = random.uniform(0, min(RETRY_BASE_DELAY * (2 ** attempt), RETRY_MAX_DELAY))
+            logger.info("[IKEA API] '%s' %.1f초 후 재시도 (%d/%d)", category, delay, attempt + 1, MAX_RETRIES)
+            await asyncio.sleep(delay)
+
+        return []
+
+    @classmethod
+    def parse_search_body(cls, body: bytes, query: str) -> List[IkeaProduct]:
+        """검색 API 응답 본문(JSON 바이트) -> 상품 목록 (연결 없이 클래스에서 바로 호출)"""
+        return cls._parse_search_results(_json_loads(body), query)
+
+    @classmethod
+    def _parse_search_results(cls, data: Dict, query: str) -> List[IkeaProduct]:
+        """검색 API 응답에서 상품 목록 파싱"""
+        products = []
+
+        search_results = data.get('searchResultPage', {})
+        product_list = search_results.get('products', {}).get('main', {}).get('items', [])
+
+        for item in product_list:
+            try:
+                product = cls._parse_product(item, query)
+                if product and product.price > 0:
+                    products.append(product)
+            except Exception as e:
+                logger.debug("[IKEA] 상품 파싱 실패: %s", e)
+                continue
+
+        return products
+
+    @classmethod
+    def _parse_category_page(cls, data: Dict, category: str) -> List[IkeaProduct]:
+        """카테고리 목록 API 응답에서 상품 목록 파싱 (productWindow 항목은 검색 아이템의 product와 같은 형태)"""
+        products = []
+
+        for product_data in (data.get('moreProducts') or _EMPTY).get('productWindow', []):
+            try:
+                product = cls._parse_product({'product': product_data}, category)
+                if product and product.price > 0:
+                    products.append(product)
+            except Exception as e:
+                logger.debug("[IKEA] 상품 파싱 실패: %s", e)
+                continue
+
+        return products
+
+    @staticmethod
+    def _parse_product(item: Dict, category: str) -> Optional[IkeaProduct]:
+        """API 응답에서 상품 정보 파싱 (예외는 _parse_search_results에서 처리)"""
+        product_data = item.get('product') or _EMPTY
+
+        # 기본 정보
+        product_id = product_data.get('itemNo')
+        if not product_id:
             return None
 
+        name = product_data.get('name', '')
+        type_name = product_data.get('typeName', '')
+        full_name = f"{name} {type_name}".strip()
+
+        # 가격 정보 (원래 가격은 할인 상품인 경우에만)
+        price = int((product_data.get('salesPrice') or _EMPTY).get('numeral') or 0)
+        orig = int((product_data.get('wasPrice') or _EMPTY).get('numeral') or 0)
+        original_price = orig if orig > price else None
+
+        # 이미지 URL
+        main_image = product_data.get('mainImageUrl', '')
+        if main_image and not main_image.startswith('http'):
+            main_image = _BASE + main_image
+
+        # 상품 URL
+        pip_url = product_data.get('pipUrl', '')
+        if pip_url and not pip_url.startswith('http'):
+            pip_url = _BASE + pip_url
+
+        # 리뷰 정보
+        rating_info = product_data.get('rating') or _EMPTY
+        rating = rating_info.get('average')
+        review_count = rating_info.get('count', 0)
+
+        if rating:
+            rating = round(float(rating), 1)
+
+        return IkeaProduct(
+            product_no=product_id,
+            name=name,
+            name_ko=full_name,
+            price=price,
+            original_price=original_price,
+            image_url=main_image,
+            product_url=pip_url,
+            category=category,
+            rating=rating,
+            review_count=review_count,
+            is_new=product_data.get('isNew', False),
+            is_sale=original_price is not None,
+        )
+
 
 def create_ikea_catalog_table():
     """IKEA 카탈로그 테이블 생성 (rating/review_count 포함)"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
-    # 기존 테이블 스키마 확인 및 업데이트
-    cur.execute("PRAGMA table_info(ikea_catalog)")
-    columns = {row[1] for row in cur.fetchall()}
-
-    if 'ikea_catalog' not in [t[0] for t in cur.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()]:
-        # 테이블이 없으면 새로 생성
-        cur.execute('''
-            CREATE TABLE ikea_catalog (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                product_no TEXT UNIQUE,
-                name TEXT NOT NULL,
-                name_ko TEXT,
-                price INTEGER NOT NULL,
-                original_price INTEGER,
-                image_url TEXT,
-                product_url TEXT,
-                category TEXT,
-                rating REAL,
-                review_count INTEGER DEFAULT 0,
-                is_new INTEGER DEFAULT 0,
-                is_sale INTEGER DEFAULT 0,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-    else:
-        # 누락된 컬럼 추가
-        needed_columns = {
-            'rating': 'REAL',
-            'review_count': 'INTEGER DEFAULT 0',
-            'original_price': 'INTEGER',
-            'is_new': 'INTEGER DEFAULT 0',
-            'is_sale': 'INTEGER DEFAULT 0',
-            'name_ko': 'TEXT',
-        }
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS ikea_catalog (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_no TEXT UNIQUE,
+            name TEXT NOT NULL,
+            name_ko TEXT,
+            price INTEGER NOT NULL,
+            original_price INTEGER,
+            image_url TEXT,
+            product_url TEXT,
+            category TEXT,
+            rating REAL,
+            review_count INTEGER DEFAULT 0,
+            is_new INTEGER DEFAULT 0,
+            is_sale INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
 
-        for col_name, col_type in needed_columns.items():
-            if col_name not in columns:
-                try:
-                    cur.execute(f'ALTER TABLE ikea_catalog ADD COLUMN {col_name} {col_type}')
-                    print(f"[DB] ikea_catalog에 {col_name} 컬럼 추가됨")
-                except sqlite3.OperationalError:
-                    pass
+    # 예전 스키마로 만들어진 테이블에 누락된 컬럼 추가 (이미 있으면 duplicate column 오류 무시)
+    needed_columns = {
+        'rating': 'REAL',
+        'review_count': 'INTEGER DEFAULT 0',
+        'original_price': 'INTEGER',
+        'is_new': 'INTEGER DEFAULT 0',
+        'is_sale': 'INTEGER DEFAULT 0',
+        'name_ko': 'TEXT',
+    }
+
+    for col_name, col_type in needed_columns.items():
+        try:
+            cur.execute(f'ALTER TABLE ikea_catalog ADD COLUMN {col_name} {col_type}')
+            print(f"[DB] ikea_catalog에 {col_name} 컬럼 추가됨")
+        except sqlite3.OperationalError:
+            pass
+
+    # verify_ikea_data 조회용 부분 인덱스 (가격 정렬, 평점 통계)
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_ikea_price ON ikea_catalog(price) WHERE price > 0')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_ikea_rating ON ikea_catalog(rating) WHERE rating IS NOT NULL')
 
     conn.commit()
     conn.close()
 
 
+# product_no UNIQUE 제약을 이용한 UPSERT (행마다 SELECT 불필요)
+UPSERT_SQL = '''
+    INSERT INTO ikea_catalog
+    (product_no, name, name_ko, price, original_price,
+     image_url, product_url, category, rating, review_count,
+     is_new, is_sale, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(product_no) DO UPDATE SET
+        name=excluded.name, name_ko=excluded.name_ko, price=excluded.price,
+        original_price=excluded.original_price, image_url=excluded.image_url,
+        product_url=excluded.product_url, category=excluded.category,
+        rating=excluded.rating, review_count=excluded.review_count,
+        is_new=excluded.is_new, is_sale=excluded.is_sale,
+        updated_at=datetime('now')
+'''
+
+
+async def fetch_categories(
+    crawler: IkeaAPICrawler,
+    categories: List[str],
+    limit_per_category: int = 50,
+    queue: Optional[asyncio.Queue] = None
+) -> List:
+    """
+    여러 카테고리를 동시에 검색
+
+    Args:
+        queue: 지정하면 카테고리가 끝나는 대로 (인덱스, 결과)를 넣음
+
+    Returns:
+        카테고리 순서대로 상품 목록 (실패한 카테고리는 예외 객체)
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    results: List = [None] * len(categories)
+
+    async with aiohttp.ClientSession(headers=IKEA_API_HEADERS) as session:
+        async def bounded_search(index: int, category: str) -> Tuple[int, object]:
+            async with semaphore:
+                try:
+                    return index, await crawler.search_products_async(session, category, limit_per_category)
+                except Exception as e:
+                    return index, e
+
+        # 끝난 카테고리부터 꺼내서 바로 writer 큐로 넘김
+        for next_done in asyncio.as_completed(
+            [bounded_search(i, category) for i, category in enumerate(categories)]
+        ):
+            index, result = await next_done
+            results[index] = result
+            if queue is not None:
+                queue.put_nowait((index, result))
+
+    return results
+
+
+async def fetch_category_listings(
+    crawler: IkeaAPICrawler,
+    categories: List[Tuple[str, str]],
+    limit_per_category: int = 50
+) -> List:
+    """
+    여러 카테고리 목록을 카테고리 ID로 동시에 조회
+
+    Args:
+        categories: (카테고리 ID, 카테고리 이름) 목록
+
+    Returns:
+        카테고리 순서대로 상품 목록 (실패한 카테고리는 예외 객체)
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async with aiohttp.ClientSession(headers=IKEA_API_HEADERS) as session:
+        async def bounded_listing(category_id: str, category: str):
+            async with semaphore:
+                try:
+                    return await crawler.category_products_async(session, category_id, category, limit_per_category)
+                except Exception as e:
+                    return e
+
+        return await asyncio.gather(*(bounded_listing(cid, name) for cid, name in categories))
+
+
+def _write_rows(conn: sqlite3.Connection, rows: List[tuple]):
+    """UPSERT 일괄 실행 (COMMIT_EVERY개 단위 트랜잭션, 작업 스레드에서 호출)"""
+    cur = conn.cursor()
+    try:
+        for start in range(0, len(rows), COMMIT_EVERY):
+            conn.execute('BEGIN IMMEDIATE')
+            cur.executemany(UPSERT_SQL, rows[start:start + COMMIT_EVERY])
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+async def _db_writer(
+    queue: asyncio.Queue,
+    conn: sqlite3.Connection,
+    categories: List[str]
+) -> Tuple[Dict[str, int], int, int]:
+    """
+    검색이 끝난 카테고리부터 DB에 저장 (다음 HTTP 요청과 겹쳐서 실행)
+
+    Returns:
+        (상품 번호별 저장한 카테고리 인덱스, 수집 상품 수, 실패 카테고리 수)
+    """
+    # 카테고리 간 중복 상품은 나중 카테고리 우선 (완료 순서와 무관하게 순차 갱신과 동일한 결과)
+    owner: Dict[str, int] = {}
+    collected = 0
+    errors = 0
+
+    while (entry := await queue.get()) is not None:
+        index, products = entry
+        if isinstance(products, BaseException):
+            errors += 1
+            logger.warning("[IKEA] 카테고리 '%s' 크롤링 실패: %s", categories[index], products)
+            continue
+
+        collected += len(products)
+        rows = []
+        for product in products:
+            if owner.get(product.product_no, -1) > index:
+                continue
+            owner[product.product_no] = index
+            rows.append(product.as_row())
+
+        if rows:
+            await asyncio.to_thread(_write_rows, conn, rows)
+
+    return owner, collected, errors
+
+
+async def crawl_to_db(
+    crawler: IkeaAPICrawler,
+    categories: List[str],
+    limit_per_category: int,
+    conn: sqlite3.Connection
+) -> Tuple[Dict[str, int], int, int]:
+    """카테고리 검색과 DB 저장을 큐로 연결해서 동시에 진행"""
+    queue: asyncio.Queue = asyncio.Queue()
+    writer = asyncio.create_task(_db_writer(queue, conn, categories))
+
+    try:
+        await fetch_categories(crawler, categories, limit_per_category, queue=queue)
+    finally:
+        queue.put_nowait(None)
+
+    return await writer
+
+
 def run_ikea_catalog_crawl(categories: List[str] = None, limit_per_category: int = 50):
     """IKEA 카탈로그 크롤링 실행"""
     print("=== IKEA 카탈로그 크롤링 시작 ===\n")
@@ -236,84 +597,32 @@ def run_ikea_catalog_crawl(categories: List[str] = None, limit_per_category: int
     if categories is None:
         categories = IKEA_CATEGORIES
 
-    conn = sqlite3.connect(DB_PATH)
+    # 저장은 asyncio.to_thread 작업 스레드에서 실행 (writer 하나만 사용하므로 동시 접근 없음)
+    conn = _open_db(check_same_thread=False)
     cur = conn.cursor()
 
-    # 기존 수 확인
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog')
-    before_count = cur.fetchone()[0]
-    print(f"기존 카탈로그: {before_count}개\n")
-
-    total_added = 0
-    total_updated = 0
-    total_errors = 0
-
-    for i, category in enumerate(categories, 1):
-        print(f"[{i}/{len(categories)}] '{category}' 검색 중...")
+    # 기존 상품 번호 (신규/업데이트 집계용, 한 번만 조회)
+    existing = {row[0] for row in cur.execute('SELECT product_no FROM ikea_catalog')}
+    print(f"기존 카탈로그: {len(existing)}개\n")
 
-        try:
-            products = crawler.search_products(category, limit=limit_per_category)
-
-            for product in products:
-                try:
-                    # 기존 상품 확인
-                    cur.execute('SELECT id, price FROM ikea_catalog WHERE product_no = ?',
-                               (product.product_no,))
-                    existing = cur.fetchone()
-
-                    if existing:
-                        # 업데이트
-                        cur.execute('''
-                            UPDATE ikea_catalog
-                            SET name=?, name_ko=?, price=?, original_price=?,
-                                image_url=?, product_url=?, category=?,
-                                rating=?, review_count=?, is_new=?, is_sale=?,
-                                updated_at=datetime('now')
-                            WHERE product_no=?
-                        ''', (
-                            product.name, product.name_ko, product.price,
-                            product.original_price, product.image_url,
-                            product.product_url, product.category,
-                            product.rating, product.review_count,
-                            1 if product.is_new else 0,
-                            1 if product.is_sale else 0,
-                            product.product_no
-                        ))
-                        total_updated += 1
-                    else:
-                        # 신규 추가
-                        cur.execute('''
-                            INSERT INTO ikea_catalog
-                            (product_no, name, name_ko, price, original_price,
-                             image_url, product_url, category, rating, review_count,
-                             is_new, is_sale, created_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                        ''', (
-                            product.product_no, product.name, product.name_ko,
-                            product.price, product.original_price,
-                            product.image_url, product.product_url, product.category,
-                            product.rating, product.review_count,
-                            1 if product.is_new else 0,
-                            1 if product.is_sale else 0,
-                        ))
-                        total_added += 1
+    print(f"{len(categories)}개 카테고리 검색 중...")
+    try:
+        written, collected, total_errors = asyncio.run(
+            crawl_to_db(crawler, categories, limit_per_category, conn)
+        )
+    except Exception:
+        conn.close()
+        raise
+    finally:
+        crawler.close()
 
-                except Exception as e:
-                    total_errors += 1
-                    print(f"  [오류] {product.name}: {e}")
-
-            conn.commit()
-
-        except Exception as e:
-            total_errors += 1
-            print(f"  [오류] 카테고리 '{category}' 크롤링 실패: {e}")
-
-        # API 부하 방지
-        time.sleep(1)
+    print(f"총 수집: {collected}개 -> 중복제거: {len(written)}개")
 
     # 최종 통계
     cur.execute('SELECT COUNT(*) FROM ikea_catalog')
     after_count = cur.fetchone()[0]
+    total_added = sum(1 for product_no in written if product_no not in existing)
+    total_updated = len(written) - total_added
 
     cur.execute('SELECT COUNT(*) FROM ikea_catalog WHERE price > 0')
     valid_count = cur.fetchone()[0]
@@ -341,7 +650,7 @@ def run_ikea_catalog_crawl(categories: List[str] = None, limit_per_category: int
 
 def verify_ikea_data():
     """IKEA 데이터 검증"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
     print("\n=== IKEA 데이터 검증 ===")
@@ -383,6 +692,8 @@ def verify_ikea_data():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
     # 크롤링 실행
     result = run_ikea_catalog_crawl(limit_per_category=30)
 
@@ -3,12 +3,8 @@
 이케아 상품 카탈로그 크롤러
 이케아 인기 상품 수집
 """
-import requests
-import sqlite3
-import time
-from datetime import datetime
+from ikea_api_crawler import _open_db, create_ikea_catalog_table
 
-DB_PATH = '../data/products.db'
 
 # 이케아 인기 상품 목록 (유튜브에서 자주 추천되는 상품들)
 POPULAR_IKEA_PRODUCTS = [
@@ -72,27 +68,15 @@ POPULAR_IKEA_PRODUCTS = [
 ]
 
 
-def create_ikea_catalog_table():
-    """이케아 카탈로그 테이블 생성"""
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS ikea_catalog (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_no TEXT UNIQUE,
-            name TEXT NOT NULL,
-            price INTEGER,
-            image_url TEXT,
-            product_url TEXT,
-            category TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
+# product_no UNIQUE 제약을 이용한 UPSERT (한 번의 executemany로 저장)
+UPSERT_SQL = '''
+    INSERT INTO ikea_catalog (product_no, name, price, category, product_url, image_url, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(product_no) DO UPDATE SET
+        name=excluded.name, price=excluded.price, category=excluded.category,
+        product_url=excluded.product_url, image_url=excluded.image_url,
+        updated_at=datetime('now')
+'''
 
 
 def run_ikea_catalog():
@@ -101,7 +85,7 @@ def run_ikea_catalog():
 
     create_ikea_catalog_table()
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
     # 기존 수 확인
@@ -109,35 +93,20 @@ def run_ikea_catalog():
     before = cur.fetchone()[0]
     print(f'기존 카탈로그: {before}개')
 
-    added = 0
-    updated = 0
-
-    for product in POPULAR_IKEA_PRODUCTS:
-        # 이케아 검색 URL
-        search_name = product['name'].split()[0]  # 첫 단어 (영문명)
-        product_url = f"https://www.ikea.com/kr/ko/search/?q={search_name}"
-
-        cur.execute('SELECT id FROM ikea_catalog WHERE product_no = ?', (product['product_no'],))
-        existing = cur.fetchone()
-
-        if existing:
-            cur.execute('''
-                UPDATE ikea_catalog
-                SET name=?, price=?, category=?, product_url=?, image_url=?, updated_at=datetime('now')
-                WHERE product_no=?
-            ''', (product['name'], product['price'], product['category'], product_url, product.get('image_url', ''), product['product_no']))
-            updated += 1
-        else:
-            cur.execute('''
-                INSERT INTO ikea_catalog (product_no, name, price, category, product_url, image_url, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
-            ''', (product['product_no'], product['name'], product['price'], product['category'], product_url, product.get('image_url', '')))
-            added += 1
+    # 검색 URL은 첫 단어 (영문명)로 생성
+    rows = [
+        (p['product_no'], p['name'], p['price'], p['category'],
+         f"https://www.ikea.com/kr/ko/search/?q={p['name'].split()[0]}", p.get('image_url', ''))
+        for p in POPULAR_IKEA_PRODUCTS
+    ]
+    cur.executemany(UPSERT_SQL, rows)
 
     conn.commit()
 
     cur.execute('SELECT COUNT(*) FROM ikea_catalog')
     after = cur.fetchone()[0]
+    added = after - before
+    updated = len(rows) - added
 
     print(f'신규 추가: {added}개')
     print(f'업데이트: {updated}개')
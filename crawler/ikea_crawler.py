@@ -3,12 +3,65 @@
 이케아 코리아 카탈로그 크롤러
 API를 통한 상품 수집
 """
-import requests
+import asyncio
+import httpx
+import json
 import sqlite3
-import time
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from rate_limiter import get_limiter
+
+# 오타 허용 유사도 (없으면 단어 Jaccard 사용)
+try:
+    from rapidfuzz import fuzz, process, utils as fuzz_utils
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Brotli 응답 해제 지원 (httpx는 brotli 패키지가 있어야 br 디코딩 가능)
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 DB_PATH = '../data/products.db'
+COMMIT_EVERY = 500
+
+# threshold를 넘기지 않았을 때의 최소 점수
+# rapidfuzz WRatio 점수(0~100) / 단어 Jaccard + 영문명 가산점(0~1.3)
+FUZZY_SCORE_CUTOFF = 50
+JACCARD_THRESHOLD = 0.3
+
+# 영문 제품명이 검색어에 포함될 때 Jaccard 점수 가산점
+ENGLISH_NAME_BONUS = 0.3
+
+
+# 연결마다 적용할 SQLite 설정 (WAL + 완화된 fsync, 메모리 캐시)
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+"""
+
+
+def _open_db():
+    """SQLite 연결 (WAL 및 성능 PRAGMA 적용, 준비된 문장 캐시 확대)"""
+    conn = sqlite3.connect(DB_PATH, cached_statements=256)
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
 
 CATEGORIES = [
     ('10364', '침대'),
@@ -59,80 +112,244 @@ def create_ikea_table(conn):
     conn.commit()
 
 
-def crawl_ikea_search(session, query, limit=50):
-    url = "https://sik.search.blue.cdtapps.com/kr/ko/search-result-page"
-    params = {"q": query, "size": limit, "store": "482", "c": "sr"}
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "application/json",
-        "Origin": "https://www.ikea.com",
-        "Referer": "https://www.ikea.com/kr/ko/",
-    }
-    try:
-        resp = session.get(url, params=params, headers=headers, timeout=15)
+# product_no UNIQUE 제약을 이용한 UPSERT (기존 상품은 name/price/image_url/category만 갱신)
+UPSERT_SQL = """
+    INSERT INTO ikea_catalog (product_no, name, name_ko, price, image_url, product_url, category, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(product_no) DO UPDATE SET
+        name=excluded.name, price=excluded.price, image_url=excluded.image_url,
+        category=excluded.category, updated_at=datetime('now')
+"""
+
+
+# 없는 키의 기본값으로 공유하는 빈 dict (조회마다 새 dict를 만들지 않음, 읽기 전용)
+_EMPTY = {}
+
+
+def _dig(obj: dict, *path: str) -> dict:
+    """중첩 dict 경로 조회 (중간 키가 없으면 _EMPTY)"""
+    for key in path:
+        obj = obj.get(key) or _EMPTY
+    return obj
+
+
+SEARCH_API = "https://sik.search.blue.cdtapps.com/kr/ko/search-result-page"
+
+# 검색 API 초당 요청 수 제한 (같은 호스트를 쓰는 ikea_api_crawler와 "ikea" limiter 공유)
+SEARCH_LIMITER = get_limiter("ikea", requests_per_second=5, burst_size=5)
+SEARCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, br" if BROTLI_AVAILABLE else "gzip",
+    "Origin": "https://www.ikea.com",
+    "Referer": "https://www.ikea.com/kr/ko/",
+}
+
+
+@dataclass
+class IkeaProduct:
+    """이케아 검색 결과 상품"""
+    product_code: str
+    name: str  # 영문 제품명 (예: KALLAX)
+    type_name: str  # 한글 유형명 (예: 선반유닛)
+    price: int
+    image_url: str
+    product_url: str
+    category: str
+    rating: float = 0.0
+    review_count: int = 0
+
+
+class IkeaCrawler:
+    """이케아 검색 API 크롤러 (상품 매칭 및 카탈로그 수집)"""
+
+    SEARCH_API = SEARCH_API
+
+    def __init__(self):
+        self.limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        # 동기 검색용 연결 (인스턴스 수명 동안 HTTP/2 연결 재사용)
+        self.client = httpx.Client(http2=True, headers=SEARCH_HEADERS, limits=self.limits, timeout=15.0)
+
+    def close(self):
+        """연결 정리"""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def _search_params(query: str, max_results: int) -> dict:
+        """검색 API 쿼리 파라미터"""
+        return {"q": query, "size": max_results, "store": "482", "c": "sr"}
+
+    @staticmethod
+    def _response_items(resp: httpx.Response):
+        """검색 응답 -> 상품 아이템 목록 (200이 아니면 빈 값)"""
         if resp.status_code != 200:
+            return ()
+        return _dig(_json_loads(resp.content), "searchResultPage", "products", "main").get("items", ())
+
+    @classmethod
+    async def search_async(cls, client: httpx.AsyncClient, query: str, max_results: int = 50) -> List[IkeaProduct]:
+        """검색어 하나 조회 (SEARCH_LIMITER로 속도 제한, 실패하면 빈 목록)"""
+        try:
+            await SEARCH_LIMITER.wait_async()
+            resp = await client.get(cls.SEARCH_API, params=cls._search_params(query, max_results))
+            items = cls._response_items(resp)
+        except Exception as e:
+            print(f"  검색 에러 ({query}): {e}")
             return []
-        data = resp.json()
-        products = []
-        items = data.get("searchResultPage", {}).get("products", {}).get("main", {}).get("items", [])
-        for item in items:
-            product = item.get("product", {})
-            if not product:
-                continue
-            price_info = product.get("priceNumeral", 0)
-            p = {
-                "product_no": product.get("id", ""),
-                "name": product.get("name", ""),
-                "name_ko": product.get("typeName", "") or product.get("name", ""),
-                "price": int(price_info) if price_info else 0,
-                "image_url": product.get("mainImageUrl", ""),
-                "product_url": product.get("pipUrl", ""),
-                "category": query,
-            }
-            if p["product_no"] and p["name"]:
-                products.append(p)
-        return products
-    except Exception as e:
-        print(f"  검색 에러 ({query}): {e}")
-        return []
+        return list(cls._iter_products(items, query, max_results))
+
+    @classmethod
+    def _iter_products(cls, items: list, category: str, max_results: int) -> Iterator[IkeaProduct]:
+        """검색 API 아이템을 앞에서부터 max_results개까지 파싱 (복사 없이 순회)"""
+        for item in islice(items, max_results):
+            product = cls._parse_product(item, category)
+            if product:
+                yield product
+
+    async def search_many(self, queries: List[str], max_results: int = 50) -> List[List[IkeaProduct]]:
+        """여러 검색어를 한 연결 풀에서 동시에 조회 (검색어 순서대로 반환)"""
+        async with httpx.AsyncClient(
+            http2=True, headers=SEARCH_HEADERS, limits=self.limits, timeout=15.0
+        ) as client:
+            return await asyncio.gather(*(self.search_async(client, q, max_results) for q in queries))
+
+    def search_products(self, query: str, max_results: int = 20) -> List[IkeaProduct]:
+        """상품 검색 (동기 호출용, 공유 연결 사용, 실패하면 빈 목록)"""
+        try:
+            resp = self.client.get(self.SEARCH_API, params=self._search_params(query, max_results))
+            items = self._response_items(resp)
+        except Exception as e:
+            print(f"  검색 에러 ({query}): {e}")
+            return []
+        return list(self._iter_products(items, query, max_results))
+
+    @staticmethod
+    def _parse_product(item: dict, category: str) -> Optional[IkeaProduct]:
+        """검색 API 아이템 -> IkeaProduct"""
+        product = item.get("product") or _EMPTY
+        if not product:
+            return None
+        product_code = product.get("id", "")
+        name = product.get("name", "")
+        if not product_code or not name:
+            return None
+        price_info = product.get("priceNumeral", 0)
+        return IkeaProduct(
+            product_code=product_code,
+            name=name,
+            type_name=product.get("typeName", ""),
+            price=int(price_info) if price_info else 0,
+            image_url=product.get("mainImageUrl", ""),
+            product_url=product.get("pipUrl", ""),
+            category=category,
+            rating=float(product.get("ratingValue") or 0.0),
+            review_count=int(product.get("ratingCount") or 0),
+        )
+
+    @staticmethod
+    def _token_mask(words: List[str], vocab: dict) -> int:
+        """단어 목록 -> 비트마스크 (처음 보는 단어는 vocab에 새 id 부여)"""
+        mask = 0
+        for word in words:
+            mask |= 1 << vocab.setdefault(word, len(vocab))
+        return mask
+
+    def search_and_match(self, query: str, threshold: Optional[float] = None) -> Optional[IkeaProduct]:
+        """
+        상품명으로 검색 후 가장 유사한 상품 반환
+
+        rapidfuzz가 있으면 WRatio로 오타까지 허용하고 (최소 점수 threshold * 100),
+        없으면 단어 Jaccard + 영문명 가산점(threshold 이상)으로 매칭
+        threshold를 넘기지 않으면 FUZZY_SCORE_CUTOFF / JACCARD_THRESHOLD 사용
+        """
+        products = self.search_products(query, max_results=10)
+
+        if RAPIDFUZZ_AVAILABLE:
+            if not products:
+                return None
+            best = process.extractOne(
+                query,
+                [f"{p.name} {p.type_name}" for p in products],
+                scorer=fuzz.WRatio,
+                processor=fuzz_utils.default_process,
+                score_cutoff=FUZZY_SCORE_CUTOFF if threshold is None else threshold * 100,
+            )
+            return products[best[2]] if best else None
+
+        return self._jaccard_match(query, products, JACCARD_THRESHOLD if threshold is None else threshold)
+
+    def _jaccard_match(self, query: str, products: Iterable[IkeaProduct], threshold: float) -> Optional[IkeaProduct]:
+        """단어 Jaccard 유사도 + 영문명 가산점으로 최적 상품 선택 (만점이 나오면 나머지는 건너뜀)"""
+        # 단어를 정수 id로 바꿔 비트마스크로 표현 (Jaccard를 비트 연산으로 계산)
+        vocab = {}
+        query_lower = query.lower()
+        query_mask = self._token_mask(query_lower.split(), vocab)
+
+        best_match = None
+        best_score = 0.0
+        for product in products:
+            name_mask = self._token_mask(f"{product.name} {product.type_name}".lower().split(), vocab)
+            union = (query_mask | name_mask).bit_count()
+            score = (query_mask & name_mask).bit_count() / union if union else 0.0
+
+            # 영문 제품명(KALLAX 등)이 검색어에 그대로 있으면 가산점
+            if product.name.lower() in query_lower:
+                score += ENGLISH_NAME_BONUS
+
+            if score > best_score:
+                best_score = score
+                best_match = product
+                # 최고 점수보다 높은 점수는 나올 수 없음
+                if best_score >= 1.0 + ENGLISH_NAME_BONUS:
+                    break
+
+        return best_match if best_score >= threshold else None
 
 
 def run_ikea_catalog_crawl():
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     create_ikea_table(conn)
     cur = conn.cursor()
     cur.execute("SELECT COUNT(*) FROM ikea_catalog")
     before = cur.fetchone()[0]
     print(f"기존 이케아 카탈로그: {before}개")
-    session = requests.Session()
-    all_products = []
     print("=== 이케아 키워드 검색 ===")
-    for keyword in SEARCH_KEYWORDS:
-        print(f"  {keyword} 검색...")
-        products = crawl_ikea_search(session, keyword)
+    # 키워드 검색은 동시에 실행 (순차 요청 + 대기 대신)
+    with IkeaCrawler() as crawler:
+        results = asyncio.run(crawler.search_many(SEARCH_KEYWORDS, max_results=50))
+    all_products = []
+    for keyword, products in zip(SEARCH_KEYWORDS, results):
+        print(f"  {keyword} -> {len(products)}개")
         all_products.extend(products)
-        print(f"    -> {len(products)}개")
-        time.sleep(0.5)
-    seen = set()
-    unique = []
+    # product_code 기준 중복 제거 (먼저 나온 상품 우선)
+    merged = {}
     for p in all_products:
-        if p["product_no"] not in seen:
-            seen.add(p["product_no"])
-            unique.append(p)
+        merged.setdefault(p.product_code, p)
+    unique = list(merged.values())
     print(f"총 수집: {len(all_products)}개 -> 중복제거: {len(unique)}개")
-    added = 0
-    for p in unique:
-        cur.execute("SELECT id FROM ikea_catalog WHERE product_no = ?", (p["product_no"],))
-        if cur.fetchone():
-            cur.execute("UPDATE ikea_catalog SET name=?, price=?, image_url=?, category=?, updated_at=datetime('now') WHERE product_no=?",
-                (p["name"], p["price"], p["image_url"], p["category"], p["product_no"]))
-        else:
-            cur.execute("INSERT INTO ikea_catalog (product_no, name, name_ko, price, image_url, product_url, category, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))",
-                (p["product_no"], p["name"], p["name_ko"], p["price"], p["image_url"], p["product_url"], p["category"]))
-            added += 1
-    conn.commit()
+    rows = [
+        (p.product_code, p.name, p.type_name or p.name, p.price, p.image_url, p.product_url, p.category)
+        for p in unique
+    ]
+    # UPSERT 일괄 실행 (COMMIT_EVERY개 단위 트랜잭션)
+    try:
+        for start in range(0, len(rows), COMMIT_EVERY):
+            conn.execute("BEGIN IMMEDIATE")
+            cur.executemany(UPSERT_SQL, rows[start:start + COMMIT_EVERY])
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        conn.close()
+        raise
     cur.execute("SELECT COUNT(*) FROM ikea_catalog")
     after = cur.fetchone()[0]
+    added = after - before
     print(f"신규 추가: {added}개")
     print(f"최종 이케아 카탈로그: {after}개")
     conn.close()
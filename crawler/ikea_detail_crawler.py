@@ -5,65 +5,158 @@ IKEA 상품 상세페이지 크롤러
 - 한글 상품명, 이미지 URL, 카테고리, 평점, 리뷰 수 수집
 """
 import sqlite3
-import time
 import re
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+from rate_limiter import get_limiter
 
 # DB 경로 설정
 DB_PATH = '../data/products.db'
 
+# 상세 데이터 저장 트랜잭션 크기 (상품 수)
+COMMIT_EVERY = 500
+
+# 상세페이지 요청 속도 제한 (페이지 로드가 1초 넘게 걸리면 추가 대기 없음)
+PAGE_LIMITER = get_limiter("ikea_detail_page", requests_per_second=1, burst_size=1)
+
+
+# 연결마다 적용할 SQLite 설정 (WAL + 완화된 fsync, 메모리 캐시)
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+"""
+
 
-def extract_product_data(page):
+def _open_db():
+    """SQLite 연결 (WAL 및 성능 PRAGMA 적용, 준비된 문장 캐시 확대)"""
+    conn = sqlite3.connect(DB_PATH, cached_statements=256)
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
+
+# 상세페이지 주요 콘텐츠가 그려졌는지 판단하는 셀렉터 (평점 또는 제목)
+DETAIL_READY_SELECTOR = "[aria-label*='별점'], h1"
+DETAIL_READY_TIMEOUT = 5000
+
+# 데이터 추출에 필요 없는 리소스 (img src 속성은 남으므로 이미지 URL 수집에는 영향 없음)
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+
+def block_heavy_resources(route):
+    """이미지/폰트/미디어/CSS 요청 차단 (문서, 스크립트, XHR은 통과)"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+# 상세페이지에서 얻은 정보로 기존 상품 갱신
+UPDATE_SQL = '''
+    UPDATE ikea_catalog
+    SET name=?, name_ko=?, price=?, image_url=?, category=?,
+        rating=?, review_count=?, updated_at=datetime('now')
+    WHERE product_no=?
+'''
+
+
+# 상세페이지에서 원본 텍스트만 가져오는 스크립트 (정규식 파싱은 Python에서)
+PRODUCT_DETAIL_JS = '''() => {
+    // 브랜드명 (H1에서)
+    const h1 = document.querySelector('h1');
+    const brandName = h1?.firstChild?.textContent?.trim() || '';
+
+    // 가격 요소 / 평점 aria-label (본문 전체 텍스트 대신 해당 요소만)
+    const priceEl = document.querySelector('[class*="price__integer"], .pip-temp-price__integer, .pip-price__integer');
+    const ratingSpan = document.querySelector('[aria-label*="별점"]');
+
+    // 이미지 URL
+    const brandFirst = brandName.split('/')[0].trim().split(' ')[0];
+    const productImg = document.querySelector(`img[alt*="${brandFirst}"]`);
+
+    // 카테고리
+    const breadcrumbNav = document.querySelector('nav[aria-label="Breadcrumb"]');
+    const breadcrumbLinks = breadcrumbNav?.querySelectorAll('a') || [];
+    const categories = Array.from(breadcrumbLinks).map(a => a.textContent?.trim()).filter(Boolean);
+    const category = categories.length > 2 ? categories[categories.length - 2] : (categories[1] || '');
+
+    return {
+        title: document.title,
+        brandName,
+        priceText: priceEl?.textContent || '',
+        ratingLabel: ratingSpan?.getAttribute('aria-label') || '',
+        imageUrl: productImg?.src || '',
+        category,
+        productUrl: window.location.href
+    };
+}'''
+
+# 컨텍스트 생성 시 한 번 등록하면 새 문서마다 추출 함수가 설치됨
+# (페이지마다 스크립트 전체를 보내고 다시 파싱하지 않고 함수 호출만 평가)
+PRODUCT_DETAIL_INIT_JS = f'window.__ikeaExtract = {PRODUCT_DETAIL_JS};'
+PRODUCT_DETAIL_CALL_JS = '() => window.__ikeaExtract()'
+
+_PRICE_RE = re.compile(r'￦\s*([\d,]+)')
+_NON_DIGIT_RE = re.compile(r'[^0-9]')
+_RATING_RE = re.compile(r'([\d.]+)\s*/\s*5')
+_REVIEW_RE = re.compile(r'리뷰:\s*(\d+)')
+_PRODNO_RE = re.compile(r'-s?(\d+)/?$')
+
+
+def product_no_from_url(url):
+    """상품 URL 끝의 제품 번호 (예: .../kallax-shelf-unit-s12345678/ -> 12345678), 없으면 빈 문자열"""
+    match = _PRODNO_RE.search(url)
+    return match.group(1) if match else ''
+
+
+def parse_product_detail(raw, product_no):
+    """PRODUCT_DETAIL_JS 결과 -> 상품 데이터 (가격/평점/리뷰 수 파싱, 제품 번호는 호출 측에서 전달)"""
+    price_match = _PRICE_RE.search(raw['priceText'])
+    price_digits = _NON_DIGIT_RE.sub('', price_match.group(1) if price_match else raw['priceText'])
+
+    rating_match = _RATING_RE.search(raw['ratingLabel'])
+    review_match = _REVIEW_RE.search(raw['ratingLabel'])
+
+    return {
+        'productNo': product_no,
+        'fullName': raw['title'].replace(' - IKEA', '').strip(),
+        'brandName': raw['brandName'],
+        'price': int(price_digits) if price_digits else 0,
+        'rating': float(rating_match.group(1)) if rating_match else None,
+        'reviewCount': int(review_match.group(1)) if review_match else 0,
+        'imageUrl': raw['imageUrl'],
+        'category': raw['category'],
+        'productUrl': raw['productUrl'],
+    }
+
+
+def extract_product_data(page, product_no):
     """상품 상세페이지에서 데이터 추출"""
-    return page.evaluate('''() => {
-        // 1. 상품명 (페이지 타이틀에서)
-        const fullName = document.title.replace(' - IKEA', '').trim();
-
-        // 2. 브랜드명 (H1에서)
-        const h1 = document.querySelector('h1');
-        const brandName = h1?.firstChild?.textContent?.trim() || '';
-
-        // 3. 가격
-        let price = 0;
-        const priceMatch = document.body.innerText.match(/￦\\s*([\\d,]+)/);
-        if (priceMatch) price = parseInt(priceMatch[1].replace(/,/g, ''));
-
-        // 4. 평점 & 리뷰 (aria-label에서)
-        const ratingSpan = document.querySelector('[aria-label*="별점"]');
-        const ariaLabel = ratingSpan?.getAttribute('aria-label') || '';
-        const ratingMatch = ariaLabel.match(/([\\d.]+)\\s*\\/\\s*5/);
-        const reviewMatch = ariaLabel.match(/리뷰:\\s*(\\d+)/);
-        const rating = ratingMatch ? parseFloat(ratingMatch[1]) : null;
-        const reviewCount = reviewMatch ? parseInt(reviewMatch[1]) : 0;
-
-        // 5. 제품 번호 (URL에서)
-        const urlMatch = window.location.href.match(/-[s]?(\\d+)\\/?$/);
-        const productNo = urlMatch ? urlMatch[1] : '';
-
-        // 6. 이미지 URL
-        const brandFirst = brandName.split('/')[0].trim().split(' ')[0];
-        const productImg = document.querySelector(`img[alt*="${brandFirst}"]`);
-        const imageUrl = productImg?.src || '';
-
-        // 7. 카테고리
-        const breadcrumbNav = document.querySelector('nav[aria-label="Breadcrumb"]');
-        const breadcrumbLinks = breadcrumbNav?.querySelectorAll('a') || [];
-        const categories = Array.from(breadcrumbLinks).map(a => a.textContent?.trim()).filter(Boolean);
-        const category = categories.length > 2 ? categories[categories.length - 2] : (categories[1] || '');
-
-        return {
-            productNo,
-            fullName,
-            brandName,
-            price,
-            rating,
-            reviewCount,
-            imageUrl,
-            category,
-            productUrl: window.location.href
-        };
-    }''')
+    return parse_product_detail(page.evaluate(PRODUCT_DETAIL_CALL_JS), product_no)
+
+
+def _flush_rows(conn, rows):
+    """
+    대기 중인 행을 한 트랜잭션으로 저장 (실패하면 롤백, 예외는 밖으로 내보내지 않음)
+
+    Returns:
+        (저장된 행 수, 실패한 행 수)
+    """
+    count = len(rows)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(UPDATE_SQL, rows)
+        conn.commit()
+        return count, 0
+    except Exception as e:
+        conn.rollback()
+        print(f"  [ERROR] {count}개 저장 실패: {e}")
+        return 0, count
+    finally:
+        rows.clear()
 
 
 def crawl_ikea_details():
@@ -71,7 +164,7 @@ def crawl_ikea_details():
     print("=== IKEA 상세페이지 크롤링 시작 ===\n")
 
     # DB에서 상품 URL 목록 가져오기
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
     cur.execute('SELECT product_no, product_url FROM ikea_catalog WHERE product_url IS NOT NULL AND product_url != ""')
@@ -81,6 +174,7 @@ def crawl_ikea_details():
 
     updated = 0
     errors = 0
+    pending = []
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
@@ -88,6 +182,8 @@ def crawl_ikea_details():
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             locale='ko-KR'
         )
+        context.route("**/*", block_heavy_resources)
+        context.add_init_script(PRODUCT_DETAIL_INIT_JS)
         page = context.new_page()
 
         for i, (product_no, product_url) in enumerate(products, 1):
@@ -95,20 +191,18 @@ def crawl_ikea_details():
                 print(f"[{i}/{len(products)}] {product_url[:60]}...")
 
                 # 페이지 로드
+                PAGE_LIMITER.wait()
                 page.goto(product_url, wait_until='domcontentloaded', timeout=30000)
-                page.wait_for_timeout(2000)  # 동적 콘텐츠 로드 대기
+                try:
+                    page.wait_for_selector(DETAIL_READY_SELECTOR, timeout=DETAIL_READY_TIMEOUT)
+                except PlaywrightTimeoutError:
+                    pass  # 시간 초과 시 있는 데이터만 추출
 
                 # 데이터 추출
-                data = extract_product_data(page)
+                data = extract_product_data(page, product_no)
 
                 if data and data['price'] > 0:
-                    # DB 업데이트
-                    cur.execute('''
-                        UPDATE ikea_catalog
-                        SET name=?, name_ko=?, price=?, image_url=?, category=?,
-                            rating=?, review_count=?, updated_at=datetime('now')
-                        WHERE product_no=?
-                    ''', (
+                    pending.append((
                         data['brandName'],
                         data['fullName'],
                         data['price'],
@@ -118,8 +212,6 @@ def crawl_ikea_details():
                         data['reviewCount'],
                         product_no
                     ))
-                    conn.commit()
-                    updated += 1
                     print(f"  [OK] {data['fullName'][:40]} - {data['price']:,}won (rating: {data['rating']}, reviews: {data['reviewCount']})")
                 else:
                     print(f"  [FAIL] Data extraction failed")
@@ -129,9 +221,16 @@ def crawl_ikea_details():
                 print(f"  [ERROR] {e}")
                 errors += 1
 
-            # API 부하 방지
-            time.sleep(1)
+            # COMMIT_EVERY개씩 모아서 한 번에 저장 (커밋된 행만 업데이트로 집계)
+            if len(pending) >= COMMIT_EVERY:
+                saved, failed = _flush_rows(conn, pending)
+                updated += saved
+                errors += failed
 
+        if pending:
+            saved, failed = _flush_rows(conn, pending)
+            updated += saved
+            errors += failed
         browser.close()
 
     # 최종 통계
@@ -140,14 +239,15 @@ def crawl_ikea_details():
     print(f"오류: {errors}개")
 
     # 데이터 품질 확인
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog WHERE image_url IS NOT NULL AND image_url != ""')
-    with_image = cur.fetchone()[0]
-
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog WHERE rating IS NOT NULL')
-    with_rating = cur.fetchone()[0]
-
-    cur.execute('SELECT COUNT(DISTINCT category) FROM ikea_catalog WHERE category IS NOT NULL AND category != ""')
-    category_count = cur.fetchone()[0]
+    # 테이블을 한 번만 훑어서 한꺼번에 집계
+    cur.execute('''
+        SELECT
+            COALESCE(SUM(image_url IS NOT NULL AND image_url != ''), 0),
+            COUNT(rating),
+            COUNT(DISTINCT NULLIF(category, ''))
+        FROM ikea_catalog
+    ''')
+    with_image, with_rating, category_count = cur.fetchone()
 
     print(f"\n--- 데이터 품질 ---")
     print(f"이미지 있음: {with_image}개")
@@ -4,14 +4,78 @@ IKEA Korea 전체 카탈로그 크롤러
 - 모든 카테고리에서 상품 수집
 - Playwright로 정확한 데이터 추출
 """
+import asyncio
 import sqlite3
-import time
 import json
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from ikea_api_crawler import IKEA_API_BASE, IkeaAPICrawler, category_id_from_url, fetch_category_listings
+from ikea_detail_crawler import (
+    BLOCKED_RESOURCE_TYPES, DETAIL_READY_SELECTOR, DETAIL_READY_TIMEOUT,
+    PRODUCT_DETAIL_CALL_JS, PRODUCT_DETAIL_INIT_JS, parse_product_detail, product_no_from_url,
+)
+from rate_limiter import get_limiter
 
 DB_PATH = '../data/products.db'
 
+# 상세 데이터 저장 트랜잭션 크기 (상품 수)
+COMMIT_EVERY = 500
+
+# 카테고리 목록 API로 카테고리마다 가져올 최대 상품 수 (PAGE_SIZE 단위 페이지를 동시에 요청)
+CATEGORY_LIMIT = 300
+
+# 상세페이지 동시 수집 워커 수 (워커마다 BrowserContext 하나)
+DETAIL_WORKERS = 8
+
+# 카테고리 목록 페이지 요청 속도 제한 (API 실패 카테고리 렌더링 시)
+LISTING_LIMITER = get_limiter("ikea_listing", requests_per_second=2, burst_size=1)
+
+# 상세페이지 요청 속도 제한 (워커 전체 공유)
+DETAIL_LIMITER = get_limiter("ikea_detail", requests_per_second=8, burst_size=8)
+
+# 카테고리 목록 페이지의 상품 카드 셀렉터 (extract_products_from_list와 동일)
+LIST_READY_SELECTOR = '[data-testid="plp-product-card"], .plp-fragment-wrapper, .pip-product-compact'
+
+BROWSER_CONTEXT_OPTIONS = {
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'locale': 'ko-KR',
+}
+
+
+# 연결마다 적용할 SQLite 설정 (WAL + 완화된 fsync, 메모리 캐시)
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+"""
+
+
+def _open_db():
+    """SQLite 연결 (WAL 및 성능 PRAGMA 적용, 준비된 문장 캐시 확대)"""
+    conn = sqlite3.connect(DB_PATH, cached_statements=256)
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
+
+async def _block_heavy_resources(route):
+    """이미지/폰트/미디어/CSS 요청 차단 (문서, 스크립트, XHR은 통과)"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _new_context(browser):
+    """리소스 차단 및 상세 추출 함수가 적용된 BrowserContext 생성"""
+    context = await browser.new_context(**BROWSER_CONTEXT_OPTIONS)
+    await context.route("**/*", _block_heavy_resources)
+    await context.add_init_script(PRODUCT_DETAIL_INIT_JS)
+    return context
+
+
 # IKEA Korea 전체 카테고리 (실제 카테고리 URL에서 추출)
 IKEA_CATEGORIES = [
     # 가구
@@ -76,9 +140,9 @@ IKEA_CATEGORIES = [
 ]
 
 
-def extract_products_from_list(page):
-    """상품 목록 페이지에서 상품 정보 추출"""
-    return page.evaluate('''() => {
+async def extract_products_from_list(page):
+    """상품 목록 페이지에서 상품 정보 추출 (제품 번호는 상품 URL에서 Python으로 파싱)"""
+    items = await page.evaluate('''() => {
         const products = [];
         const items = document.querySelectorAll('[data-testid="plp-product-card"], .plp-fragment-wrapper, .pip-product-compact');
 
@@ -89,9 +153,6 @@ def extract_products_from_list(page):
                 if (!link) return;
 
                 const productUrl = link.href;
-                const urlMatch = productUrl.match(/-[s]?(\\d+)\\/?$/);
-                const productNo = urlMatch ? urlMatch[1] : '';
-                if (!productNo) return;
 
                 // 상품명
                 const nameEl = item.querySelector('.pip-header-section__title--small, .pip-header-section h3, [class*="product-compact__name"]');
@@ -109,9 +170,8 @@ def extract_products_from_list(page):
                 const imgEl = item.querySelector('img[src*="ikea"]');
                 const imageUrl = imgEl ? imgEl.src : '';
 
-                if (productNo && price > 0) {
+                if (price > 0) {
                     products.push({
-                        productNo,
                         name,
                         price,
                         imageUrl,
@@ -124,54 +184,54 @@ def extract_products_from_list(page):
         return products;
     }''')
 
+    products = []
+    for item in items:
+        item['productNo'] = product_no_from_url(item['productUrl'])
+        if item['productNo']:
+            products.append(item)
+    return products
 
-def extract_product_detail(page):
+
+async def extract_product_detail(page, product_no):
     """상품 상세페이지에서 정확한 데이터 추출"""
-    return page.evaluate('''() => {
-        const fullName = document.title.replace(' - IKEA', '').trim();
-        const h1 = document.querySelector('h1');
-        const brandName = h1?.firstChild?.textContent?.trim() || '';
-
-        let price = 0;
-        const priceMatch = document.body.innerText.match(/￦\\s*([\\d,]+)/);
-        if (priceMatch) price = parseInt(priceMatch[1].replace(/,/g, ''));
-
-        const ratingSpan = document.querySelector('[aria-label*="별점"]');
-        const ariaLabel = ratingSpan?.getAttribute('aria-label') || '';
-        const ratingMatch = ariaLabel.match(/([\\d.]+)\\s*\\/\\s*5/);
-        const reviewMatch = ariaLabel.match(/리뷰:\\s*(\\d+)/);
-        const rating = ratingMatch ? parseFloat(ratingMatch[1]) : null;
-        const reviewCount = reviewMatch ? parseInt(reviewMatch[1]) : 0;
-
-        const urlMatch = window.location.href.match(/-[s]?(\\d+)\\/?$/);
-        const productNo = urlMatch ? urlMatch[1] : '';
-
-        const brandFirst = brandName.split('/')[0].trim().split(' ')[0];
-        const productImg = document.querySelector('img[alt*="' + brandFirst + '"]');
-        const imageUrl = productImg?.src || '';
-
-        const breadcrumbNav = document.querySelector('nav[aria-label="Breadcrumb"]');
-        const breadcrumbLinks = breadcrumbNav?.querySelectorAll('a') || [];
-        const categories = Array.from(breadcrumbLinks).map(a => a.textContent?.trim()).filter(Boolean);
-        const category = categories.length > 2 ? categories[categories.length - 2] : (categories[1] || '');
-
-        return {
-            productNo,
-            fullName,
-            brandName,
-            price,
-            rating,
-            reviewCount,
-            imageUrl,
-            category,
-            productUrl: window.location.href
-        };
-    }''')
+    return parse_product_detail(await page.evaluate(PRODUCT_DETAIL_CALL_JS), product_no)
+
+
+def _detail_from_product(product):
+    """검색 API 상품(IkeaProduct) -> extract_product_detail 형식"""
+    return {
+        'productNo': product.product_no,
+        'fullName': product.name_ko,
+        'brandName': product.name,
+        'price': product.price,
+        'rating': product.rating,
+        'reviewCount': product.review_count,
+        'imageUrl': product.image_url,
+        'category': '',
+        'productUrl': product.product_url,
+    }
+
+
+async def fetch_product_json(context, product_no):
+    """
+    검색 API JSON에서 상품 상세 데이터 조회 (페이지 렌더링 없음)
+
+    사이트 목록 페이지가 쓰는 검색 API를 브라우저 컨텍스트의 요청 API로 호출해서
+    extract_product_detail과 같은 형식으로 반환. 못 찾으면 None
+    """
+    resp = await context.request.get(IKEA_API_BASE, params=IkeaAPICrawler.search_params(product_no, 10))
+    if not resp.ok:
+        return None
+
+    for product in IkeaAPICrawler.parse_search_body(await resp.body(), ''):
+        if product.product_no == product_no:
+            return _detail_from_product(product)
+    return None
 
 
 def create_table():
     """테이블 생성"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
     cur.execute('''
@@ -193,11 +253,79 @@ def create_table():
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+
+    # 이번 실행에서 찾은 상품 URL (product_no 중복 제거용 작업 테이블)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS ikea_catalog_urls (
+            product_no TEXT PRIMARY KEY,
+            product_url TEXT,
+            category TEXT,
+            saved INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
     conn.commit()
     conn.close()
 
 
-def crawl_ikea_full():
+# product_no UNIQUE 제약을 이용한 UPSERT (행마다 SELECT 불필요)
+UPSERT_SQL = '''
+    INSERT INTO ikea_catalog
+    (product_no, name, name_ko, price, image_url, product_url,
+     category, rating, review_count, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(product_no) DO UPDATE SET
+        name=excluded.name, name_ko=excluded.name_ko, price=excluded.price,
+        image_url=excluded.image_url, product_url=excluded.product_url,
+        category=excluded.category, rating=excluded.rating,
+        review_count=excluded.review_count, updated_at=datetime('now')
+'''
+
+
+# 처음 발견한 상품만 들어감 (이미 있으면 무시, rowcount 0)
+STAGE_URL_SQL = '''
+    INSERT OR IGNORE INTO ikea_catalog_urls (product_no, product_url, category, saved)
+    VALUES (?, ?, ?, ?)
+'''
+
+
+def _flush_rows(conn, rows):
+    """
+    대기 중인 행을 한 트랜잭션으로 저장 (실패하면 롤백, 예외는 밖으로 내보내지 않음)
+
+    Returns:
+        (저장된 행 수, 실패한 행 수)
+    """
+    count = len(rows)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(UPSERT_SQL, rows)
+        conn.commit()
+        return count, 0
+    except Exception as e:
+        conn.rollback()
+        print(f"[ERROR] {count}개 저장 실패: {e}")
+        return 0, count
+    finally:
+        rows.clear()
+
+
+async def collect_category_from_page(page, cat):
+    """카테고리 목록 페이지를 렌더링해서 상품 목록 수집 (검색 API 실패 시 사용)"""
+    await page.goto(cat['url'], wait_until='domcontentloaded', timeout=30000)
+    try:
+        await page.wait_for_selector(LIST_READY_SELECTOR, timeout=DETAIL_READY_TIMEOUT)
+    except PlaywrightTimeoutError:
+        return []  # 상품 카드가 없는 페이지
+
+    # 스크롤해서 더 많은 상품 로드
+    for _ in range(3):
+        await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+        await page.wait_for_timeout(1000)
+
+    return await extract_products_from_list(page)
+
+
+async def crawl_ikea_full_async():
     """IKEA 전체 카탈로그 크롤링"""
     print("=" * 60)
     print("IKEA FULL CATALOG CRAWL")
@@ -205,7 +333,7 @@ def crawl_ikea_full():
 
     create_table()
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
     cur.execute('SELECT COUNT(*) FROM ikea_catalog')
@@ -213,123 +341,165 @@ def crawl_ikea_full():
     print(f"Existing products: {before_count}")
     print()
 
+    # 기존 상품 번호 (신규/업데이트 집계용, 한 번만 조회)
+    existing = {row[0] for row in cur.execute('SELECT product_no FROM ikea_catalog')}
+
     total_added = 0
     total_updated = 0
     total_errors = 0
-    all_products = {}  # product_no -> product data
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            locale='ko-KR'
-        )
-        page = context.new_page()
-
-        # 1단계: 모든 카테고리에서 상품 목록 수집
-        print("Step 1: Collecting product URLs from categories...")
-        print("-" * 60)
-
-        for i, cat in enumerate(IKEA_CATEGORIES, 1):
-            try:
-                print(f"[{i}/{len(IKEA_CATEGORIES)}] {cat['name']}...", end=" ")
-
-                page.goto(cat['url'], wait_until='domcontentloaded', timeout=30000)
-                page.wait_for_timeout(2000)
+    total_unique = 0
+    pending = []
 
-                # 스크롤해서 더 많은 상품 로드
-                for _ in range(3):
-                    page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                    page.wait_for_timeout(1000)
-
-                products = extract_products_from_list(page)
+    # 지난 실행의 작업 테이블 비우기
+    conn.execute('DELETE FROM ikea_catalog_urls')
+    conn.commit()
 
-                for prod in products:
-                    if prod['productNo'] not in all_products:
-                        prod['category'] = cat['name']
-                        all_products[prod['productNo']] = prod
+    def flush():
+        """대기열 저장 (신규/업데이트는 커밋된 행만 집계, 실패한 행은 오류로 집계)"""
+        nonlocal total_added, total_updated, total_errors
+
+        product_nos = [row[0] for row in pending]
+        saved, failed = _flush_rows(conn, pending)
+        total_errors += failed
+        if not saved:
+            return
+
+        for product_no in product_nos:
+            if product_no in existing:
+                total_updated += 1
+            else:
+                existing.add(product_no)
+                total_added += 1
+
+    def record(detail, category):
+        """상세 데이터를 저장 대기열에 추가 (COMMIT_EVERY개씩 모아서 한 번에 저장)"""
+        pending.append((
+            detail['productNo'], detail['brandName'], detail['fullName'],
+            detail['price'], detail['imageUrl'], detail['productUrl'],
+            detail['category'] or category,
+            detail['rating'], detail['reviewCount']
+        ))
+
+        if len(pending) >= COMMIT_EVERY:
+            flush()
+
+    # 1단계: 카테고리 URL의 ID로 목록 API 조회 (브라우저 없이 동시 요청)
+    # 카테고리 이름으로 검색하면 검색 관련도 결과가 섞이므로 ID로 조회, ID를 못 얻으면 브라우저로
+    print("Step 1: Collecting products from category listing API...")
+    print("-" * 60)
+
+    api_categories = [cat for cat in IKEA_CATEGORIES if category_id_from_url(cat['url'])]
+    with IkeaAPICrawler() as api_crawler:
+        results = await fetch_category_listings(
+            api_crawler, [(category_id_from_url(cat['url']), cat['name']) for cat in api_categories], CATEGORY_LIMIT
+        )
 
-                print(f"found {len(products)} products (total unique: {len(all_products)})")
+    # API 데이터가 있는 상품은 카테고리별로 바로 저장 (중복은 작업 테이블 UNIQUE로 걸러냄)
+    failed_categories = [cat for cat in IKEA_CATEGORIES if not category_id_from_url(cat['url'])]
+    for cat, products in zip(api_categories, results):
+        if isinstance(products, BaseException) or not products:
+            failed_categories.append(cat)
+            continue
+
+        new_products = [
+            product for product in products
+            if conn.execute(STAGE_URL_SQL, (product.product_no, product.product_url, cat['name'], 1)).rowcount
+        ]
+        conn.commit()
 
-            except Exception as e:
-                print(f"ERROR: {str(e)[:50]}")
-                total_errors += 1
+        for product in new_products:
+            record(_detail_from_product(product), cat['name'])
+        total_unique += len(new_products)
 
-            time.sleep(0.5)
+        print(f"{cat['name']}: found {len(products)} products (total unique: {total_unique})")
 
-        print()
-        print(f"Total unique products found: {len(all_products)}")
-        print()
+    print()
+    print(f"Total unique products found: {total_unique}")
+    print()
 
-        # 2단계: 각 상품 상세페이지 방문하여 정확한 데이터 수집
-        print("Step 2: Fetching product details...")
+    # 2단계: API에서 못 가져온 카테고리만 브라우저로 목록/상세페이지 수집
+    if failed_categories:
+        print("Step 2: Rendering failed categories...")
         print("-" * 60)
-
-        product_list = list(all_products.values())
-
-        for i, prod in enumerate(product_list, 1):
-            try:
-                if i % 10 == 0 or i == 1:
-                    print(f"[{i}/{len(product_list)}] Processing...")
-
-                page.goto(prod['productUrl'], wait_until='domcontentloaded', timeout=30000)
-                page.wait_for_timeout(1500)
-
-                detail = extract_product_detail(page)
-
-                if detail and detail['price'] > 0:
-                    # DB에 저장
-                    cur.execute('SELECT id FROM ikea_catalog WHERE product_no = ?', (detail['productNo'],))
-                    existing = cur.fetchone()
-
-                    if existing:
-                        cur.execute('''
-                            UPDATE ikea_catalog
-                            SET name=?, name_ko=?, price=?, image_url=?, product_url=?,
-                                category=?, rating=?, review_count=?, updated_at=datetime('now')
-                            WHERE product_no=?
-                        ''', (
-                            detail['brandName'], detail['fullName'], detail['price'],
-                            detail['imageUrl'], detail['productUrl'],
-                            detail['category'] or prod['category'],
-                            detail['rating'], detail['reviewCount'],
-                            detail['productNo']
-                        ))
-                        total_updated += 1
-                    else:
-                        cur.execute('''
-                            INSERT INTO ikea_catalog
-                            (product_no, name, name_ko, price, image_url, product_url,
-                             category, rating, review_count, created_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                        ''', (
-                            detail['productNo'], detail['brandName'], detail['fullName'],
-                            detail['price'], detail['imageUrl'], detail['productUrl'],
-                            detail['category'] or prod['category'],
-                            detail['rating'], detail['reviewCount']
-                        ))
-                        total_added += 1
-
-                    if i % 50 == 0:
-                        conn.commit()
-
-            except Exception as e:
-                total_errors += 1
-
-            time.sleep(0.3)
-
-        conn.commit()
-        browser.close()
+        print(f"Falling back to browser for {len(failed_categories)} categories...")
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await _new_context(browser)
+            page = await context.new_page()
+
+            for i, cat in enumerate(failed_categories, 1):
+                try:
+                    print(f"[{i}/{len(failed_categories)}] {cat['name']}...", end=" ")
+
+                    await LISTING_LIMITER.wait_async()
+                    products = await collect_category_from_page(page, cat)
+
+                    conn.executemany(STAGE_URL_SQL, [
+                        (prod['productNo'], prod['productUrl'], cat['name'], 0) for prod in products
+                    ])
+                    conn.commit()
+
+                    print(f"found {len(products)} products")
+
+                except Exception as e:
+                    print(f"ERROR: {str(e)[:50]}")
+                    total_errors += 1
+
+            await context.close()
+
+            # 상세페이지는 워커 여러 개가 작업 테이블 커서에서 나눠 가져가서 수집
+            # (저장은 conn, 읽기는 별도 연결 - WAL이라 서로 막지 않음)
+            read_conn = _open_db()
+            total = read_conn.execute('SELECT COUNT(*) FROM ikea_catalog_urls WHERE saved = 0').fetchone()[0]
+            to_render = read_conn.execute(
+                'SELECT product_no, product_url, category FROM ikea_catalog_urls WHERE saved = 0'
+            )
+            processed = 0
+
+            async def detail_worker():
+                nonlocal total_errors, processed
+
+                worker_context = await _new_context(browser)
+                worker_page = await worker_context.new_page()
+                try:
+                    for product_no, product_url, category in to_render:
+                        processed += 1
+                        if processed % 10 == 0 or processed == 1:
+                            print(f"[{processed}/{total}] Processing...")
+
+                        try:
+                            await DETAIL_LIMITER.wait_async()
+                            detail = await fetch_product_json(worker_context, product_no)
+
+                            # JSON에 없는 상품만 상세페이지 렌더링
+                            if detail is None:
+                                await worker_page.goto(product_url, wait_until='domcontentloaded', timeout=30000)
+                                try:
+                                    await worker_page.wait_for_selector(DETAIL_READY_SELECTOR, timeout=DETAIL_READY_TIMEOUT)
+                                except PlaywrightTimeoutError:
+                                    pass  # 시간 초과 시 있는 데이터만 추출
+                                detail = await extract_product_detail(worker_page, product_no)
+                        except Exception:
+                            total_errors += 1
+                            continue
+
+                        if detail and detail['price'] > 0:
+                            record(detail, category)
+                finally:
+                    await worker_context.close()
+
+            await asyncio.gather(*(detail_worker() for _ in range(min(DETAIL_WORKERS, total))))
+            read_conn.close()
+            await browser.close()
+
+    if pending:
+        flush()
 
     # 최종 통계
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog')
-    after_count = cur.fetchone()[0]
-
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog WHERE rating IS NOT NULL')
-    with_rating = cur.fetchone()[0]
-
-    cur.execute('SELECT COUNT(DISTINCT category) FROM ikea_catalog')
-    cat_count = cur.fetchone()[0]
+    # 테이블을 한 번만 훑어서 한꺼번에 집계
+    cur.execute('SELECT COUNT(*), COUNT(rating), COUNT(DISTINCT category) FROM ikea_catalog')
+    after_count, with_rating, cat_count = cur.fetchone()
 
     print()
     print("=" * 60)
@@ -352,5 +522,10 @@ def crawl_ikea_full():
     }
 
 
+def crawl_ikea_full():
+    """IKEA 전체 카탈로그 크롤링 (동기 호출용)"""
+    return asyncio.run(crawl_ikea_full_async())
+
+
 if __name__ == '__main__':
     crawl_ikea_full()
@@ -5,13 +5,20 @@ IKEA Korea Playwright 크롤러
 - DB 저장 기능 포함
 """
 import re
+import json
 import asyncio
+import logging
+import logging.handlers
 import sqlite3
 import urllib.parse
 from datetime import datetime
+from queue import SimpleQueue
 from typing import List, Optional
 from dataclasses import dataclass
 
+import httpx
+from bs4 import BeautifulSoup
+
 try:
     from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
@@ -19,9 +26,132 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("[!] Playwright 설치 필요: pip install playwright && playwright install chromium")
 
+logger = logging.getLogger(__name__)
+
 # DB 경로 설정
 DB_PATH = '../data/products.db'
 
+# 동시에 검색할 카테고리 수 (미리 열어 둔 페이지 풀 크기와 같음)
+CATEGORY_CONCURRENCY = 5
+
+# 검색 결과 추출 시도 횟수 (시도 사이마다 스크롤해서 추가 로딩)와 스크롤 후 대기 한도 (ms)
+SCROLL_ATTEMPTS = 3
+SCROLL_IDLE_TIMEOUT = 3000
+
+# 검색 결과를 저장 쪽으로 넘기는 큐 크기 (카테고리 단위)
+WRITE_QUEUE_SIZE = 8
+
+# 이 시간 안에 수집한 카테고리는 다시 검색하지 않음 (force=True / --force로 무시)
+CATEGORY_TTL_HOURS = 24
+
+
+# 연결마다 적용할 SQLite 설정 (WAL + 완화된 fsync, 메모리 캐시)
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+"""
+
+
+def _open_db():
+    """SQLite 연결 (WAL 및 성능 PRAGMA 적용)"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
+
+# 서버 렌더링 HTML에서 이만큼 나오면 브라우저 없이 사용 (적으면 Playwright로 다시 수집)
+HTML_FAST_PATH_MIN_PRODUCTS = 5
+
+HTML_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+# 상품 카드 안 필드별 셀렉터 (브라우저 추출 스크립트와 HTML 파싱이 같은 표를 사용)
+CARD_FIELD_SELECTORS = {
+    # 상품 링크 (URL 패턴: /p/linnmon-adils-table-white-s09246408/)
+    'link': 'a[href*="/p/"]',
+    # 상품명 (브랜드 + 설명)
+    'brand': '[class*="pip-header-section__title"]',
+    'desc': '[class*="pip-header-section__description"], [class*="description-text"]',
+    # 현재 가격 / 원래 가격 (할인 상품)
+    'price': '[class*="pip-temp-price"], [class*="pip-price"]',
+    'wasPrice': '[class*="was-price"], [class*="정가"]',
+    # 이미지
+    'img': 'img',
+    # 평점 및 리뷰 수
+    'rating': 'button[class*="rating"], [class*="review"]',
+}
+
+# 상품 카드별 원본 텍스트/속성만 추출하는 스크립트 (정규식 파싱은 Python에서)
+# 필드마다 querySelector로 카드 하위 트리를 다시 훑지 않고, 하위 요소를 한 번만 돌면서
+# 필드별 셀렉터에 처음 맞는 요소를 고름 (querySelector와 같은 문서 순서 첫 요소)
+CARD_FIELDS_JS = '''productCards => {
+    // 필드별 셀렉터 (CARD_FIELD_SELECTORS, 초기화 스크립트에서 설정)
+    const FIELDS = Object.entries(window.__ikeaCardFields);
+    const results = [];
+
+    for (const card of productCards) {
+        try {
+            const found = {};
+            let remaining = FIELDS.length;
+            for (const el of card.getElementsByTagName('*')) {
+                for (const [key, selector] of FIELDS) {
+                    if (!found[key] && el.matches(selector)) {
+                        found[key] = el;
+                        remaining--;
+                    }
+                }
+                if (!remaining) break;
+            }
+
+            const link = found.link;
+            if (!link) continue;
+            const img = found.img;
+            const cardText = card.textContent;
+
+            results.push({
+                href: link.getAttribute('href') || '',
+                brand: found.brand ? found.brand.textContent.trim() : '',
+                desc: found.desc ? found.desc.textContent.trim() : '',
+                priceText: found.price ? found.price.textContent || '' : '',
+                wasPriceText: found.wasPrice ? found.wasPrice.textContent || '' : '',
+                imgSrc: img ? (img.getAttribute('src') || img.getAttribute('data-src') || '') : '',
+                ratingText: found.rating ? found.rating.textContent || '' : '',
+                isNew: cardText.includes('신제품')
+            });
+        } catch (e) {}
+    }
+
+    return results;
+}'''
+
+# 컨텍스트 생성 시 한 번 등록하면 새 문서마다 셀렉터와 추출 함수가 설치됨
+# (검색/스크롤마다 스크립트 전체를 보내고 다시 파싱하지 않고 함수 호출만 평가)
+CARD_FIELDS_INIT_JS = (
+    f'window.__ikeaCardFields = {json.dumps(CARD_FIELD_SELECTORS)};\n'
+    f'window.__extractIkea = {CARD_FIELDS_JS};'
+)
+CARD_FIELDS_CALL_JS = 'productCards => window.__extractIkea(productCards)'
+
+# 상품 목록 파싱에 필요 없는 요청 (img src 속성은 남으므로 이미지 URL 수집에는 영향 없음)
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+BLOCKED_URL_KEYWORDS = ("analytics",)
+
+# 검색 결과 상품 카드 셀렉터
+PRODUCT_CARD_SELECTOR = '[class*="pip-product-compact"], [data-testid="plp-product-card"]'
+
+# 상품 카드 텍스트 파싱용 정규식 (_parse_card)
+_ID_RE = re.compile(r'-s?(\d{8})/?$')
+_PRICE_RE = re.compile(r'가격[^\d]*(\d+)')
+_PRICE_ALT_RE = re.compile(r'₩?￦?([\d,]+)')
+_WAS_RE = re.compile(r'정가[^\d]*(\d+)')
+_RATING_RE = re.compile(r'검토:\s*(\d+(?:\.\d+)?)')
+_REVIEW_RE = re.compile(r'\((\d+)\)')
+
 # 검색 카테고리
 IKEA_CATEGORIES = [
     "책상", "의자", "수납장", "선반", "옷장",
@@ -33,9 +163,9 @@ IKEA_CATEGORIES = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class IkeaProduct:
-    """IKEA 상품 데이터"""
+    """IKEA 상품 데이터 (카테고리마다 수십 개씩 만들어지므로 __slots__ 사용)"""
     product_no: str
     name: str
     name_ko: str
@@ -56,45 +186,74 @@ class IkeaPlaywrightCrawler:
     BASE_URL = "https://www.ikea.com/kr/ko"
     SEARCH_URL = "https://www.ikea.com/kr/ko/search/"
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, pool_size: int = CATEGORY_CONCURRENCY):
         self.headless = headless
+        self.pool_size = pool_size
         self.browser = None
-        self.page = None
         self.context = None
         self.playwright = None
+        # HTML 빠른 경로용 HTTP/2 클라이언트 (처음 쓸 때 생성, 검색 전체 공유)
+        self._http: Optional[httpx.AsyncClient] = None
+        # 검색마다 빌려 쓰고 돌려놓는 페이지 풀 (_init_browser에서 한 번만 생성)
+        self._page_pool: Optional[asyncio.Queue] = None
+        # 동시에 호출된 search_products가 브라우저를 한 번만 띄우도록
+        self._init_lock = asyncio.Lock()
+        # 쿠키 동의는 컨텍스트 쿠키로 남으므로 세션에서 한 번만 처리
+        self._cookie_handled = asyncio.Event()
+        self._cookie_lock = asyncio.Lock()
 
     async def _init_browser(self):
-        """브라우저 초기화"""
+        """브라우저/컨텍스트/페이지 풀 초기화 (이미 떠 있으면 그대로 사용)"""
         if not PLAYWRIGHT_AVAILABLE:
             raise RuntimeError("Playwright가 설치되어 있지 않습니다")
 
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-            ]
-        )
+        async with self._init_lock:
+            if self.browser:
+                return
+
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                args=[
+                    '--no-sandbox',
+                    '--disable-dev-shm-usage',
+                    '--disable-blink-features=AutomationControlled',
+                ]
+            )
+
+            # 컨텍스트 하나에 페이지 여러 개 (쿠키/스텔스 스크립트는 한 번만 적용)
+            self.context = await self._new_context()
+            self._page_pool = asyncio.Queue()
+            for _ in range(self.pool_size):
+                self._page_pool.put_nowait(await self.context.new_page())
 
-        self.context = await self.browser.new_context(
+    async def _new_context(self):
+        """스텔스 스크립트가 적용된 BrowserContext 생성"""
+        context = await self.browser.new_context(
             viewport={"width": 1920, "height": 1080},
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             locale="ko-KR",
         )
 
-        await self.context.add_init_script("""
+        await context.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
         """)
-
-        self.page = await self.context.new_page()
+        await context.add_init_script(CARD_FIELDS_INIT_JS)
+        await context.route("**/*", self._block_heavy_resources)
+        return context
+
+    @staticmethod
+    async def _block_heavy_resources(route):
+        """이미지/폰트/미디어/CSS 및 분석 스크립트 요청 차단 (문서, 스크립트, XHR은 통과)"""
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(k in request.url for k in BLOCKED_URL_KEYWORDS):
+            await route.abort()
+        else:
+            await route.continue_()
 
     async def _close_browser(self):
         """브라우저 종료"""
         try:
-            if self.page:
-                await self.page.close()
             if self.context:
                 await self.context.close()
             if self.browser:
@@ -104,223 +263,253 @@ class IkeaPlaywrightCrawler:
         except Exception:
             pass
         finally:
-            self.page = None
             self.context = None
+            self._page_pool = None
+            self._cookie_handled.clear()
             self.browser = None
             self.playwright = None
 
     async def search_products(self, query: str, limit: int = 50) -> List[IkeaProduct]:
-        """상품 검색"""
-        if not self.page:
-            await self._init_browser()
+        """상품 검색 (HTML로 충분하면 브라우저 없이, 모자라면 Playwright 페이지 풀로 나머지를 채움)"""
+        encoded_query = urllib.parse.quote(query)
+        search_url = f"{self.SEARCH_URL}?q={encoded_query}"
+        logger.debug("[IKEA] '%s' 검색 중...", query)
+
+        products = await self._search_html(search_url, query, limit)
+        if len(products) >= HTML_FAST_PATH_MIN_PRODUCTS or not PLAYWRIGHT_AVAILABLE:
+            logger.info("[IKEA] '%s' 검색 완료 (HTML): %d개 상품", query, len(products))
+            return products
 
-        products = []
+        # HTML 결과가 적으면 브라우저 결과로 채움 (HTML에서 나온 상품은 유지, 같은 상품은 한 번만)
+        seen_ids = {product.product_no for product in products}
+        for product in await self._search_with_browser(search_url, query, limit):
+            if len(products) >= limit:
+                break
+            if product.product_no not in seen_ids:
+                seen_ids.add(product.product_no)
+                products.append(product)
+        return products
+
+    async def _fetch_html(self, url: str) -> str:
+        """검색 페이지 HTML 요청 (공유 HTTP/2 연결)"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                headers=HTML_HEADERS,
+                limits=httpx.Limits(max_connections=10),
+                timeout=15.0,
+                follow_redirects=True,
+            )
+        resp = await self._http.get(url)
+        resp.raise_for_status()
+        return resp.text
 
+    async def _search_html(self, search_url: str, query: str, limit: int) -> List[IkeaProduct]:
+        """브라우저 없이 HTML만으로 검색 결과 파싱 (실패하면 빈 목록)"""
         try:
-            encoded_query = urllib.parse.quote(query)
-            search_url = f"{self.SEARCH_URL}?q={encoded_query}"
+            html = await self._fetch_html(search_url)
+        except Exception:
+            return []
+        return self._products_from_cards(self._cards_from_html(html), query, limit)
+
+    @staticmethod
+    def _cards_from_html(html: str) -> List[dict]:
+        """HTML 상품 카드 -> 원본 텍스트/속성 (브라우저 추출 스크립트와 같은 형식)"""
+        def text(el):
+            return el.get_text() if el else ''
+
+        cards = []
+        for card in BeautifulSoup(html, "html.parser").select(PRODUCT_CARD_SELECTOR):
+            found = {key: card.select_one(selector) for key, selector in CARD_FIELD_SELECTORS.items()}
+            link = found['link']
+            if not link:
+                continue
+            img = found['img']
+            cards.append({
+                'href': link.get('href', ''),
+                'brand': text(found['brand']).strip(),
+                'desc': text(found['desc']).strip(),
+                'priceText': text(found['price']),
+                'wasPriceText': text(found['wasPrice']),
+                'imgSrc': (img.get('src') or img.get('data-src') or '') if img else '',
+                'ratingText': text(found['rating']),
+                'isNew': '신제품' in card.get_text(),
+            })
+        return cards
+
+    async def _search_with_browser(self, search_url: str, query: str, limit: int) -> List[IkeaProduct]:
+        """Playwright로 검색 (풀에서 페이지를 빌려 사용 - 풀 크기만큼 동시 호출 가능)"""
+        await self._init_browser()
 
-            print(f"[IKEA] '{query}' 검색 중...")
-            await self.page.goto(search_url, wait_until="domcontentloaded", timeout=60000)
-            await asyncio.sleep(5)  # IKEA 로딩 느림
+        products = []
+        page = await self._page_pool.get()
 
-            # 쿠키 동의 팝업 닫기
-            try:
-                cookie_btn = await self.page.query_selector('#onetrust-accept-btn-handler')
-                if cookie_btn:
-                    await cookie_btn.click()
-                    await asyncio.sleep(1)
-            except Exception:
-                pass
+        try:
+            await page.goto(search_url, wait_until="domcontentloaded", timeout=60000)
+            if not await self._wait_for_product_list(page):
+                logger.warning("[IKEA] '%s' 상품 목록 로딩 타임아웃", query)
+                return products
+
+            await self._dismiss_cookie_banner(page)
 
             # 상품 파싱
-            products = await self._parse_search_results(query, limit)
-            print(f"[IKEA] '{query}' 검색 완료: {len(products)}개 상품")
+            products = await self._parse_search_results(page, query, limit)
+            logger.info("[IKEA] '%s' 검색 완료: %d개 상품", query, len(products))
 
         except Exception as e:
-            print(f"[IKEA] 검색 실패 ({query}): {e}")
+            logger.warning("[IKEA] 검색 실패 (%s): %s", query, e)
+
+        finally:
+            self._page_pool.put_nowait(page)
 
         return products
 
-    async def _parse_search_results(self, category: str, limit: int) -> List[IkeaProduct]:
-        """검색 결과 파싱 - 정확한 셀렉터 사용"""
-        products = []
+    @staticmethod
+    async def _wait_for_product_list(page) -> bool:
+        """상품 목록이 붙을 때까지만 대기 (고정 대기 없음), 끝내 안 붙으면 False"""
+        try:
+            await page.wait_for_selector('[class*="plp-product-list"]', state="attached", timeout=15000)
+            return True
+        except Exception:
+            pass
 
+        # 목록 셀렉터가 안 나오면 네트워크가 잠잠해질 때까지 짧게 한 번 더 대기
         try:
-            # 상품 목록 로딩 대기
-            await self.page.wait_for_selector('[class*="plp-product-list"], [class*="search"]', timeout=15000)
+            await page.wait_for_load_state("networkidle", timeout=10000)
+            return True
         except Exception:
-            print("[IKEA] 상품 목록 로딩 타임아웃")
-            return products
+            return False
+
+    async def _dismiss_cookie_banner(self, page):
+        """쿠키 동의 팝업 닫기 (한 번 닫으면 이후 검색에서는 셀렉터 조회도 생략)"""
+        if self._cookie_handled.is_set():
+            return
+
+        # 동시에 검색 중인 다른 페이지가 중복 클릭하지 않도록
+        async with self._cookie_lock:
+            if self._cookie_handled.is_set():
+                return
+            try:
+                cookie_btn = await page.query_selector('#onetrust-accept-btn-handler')
+                if cookie_btn:
+                    await cookie_btn.click()
+                    self._cookie_handled.set()
+            except Exception:
+                pass
+
+    async def _parse_search_results(self, page, category: str, limit: int) -> List[IkeaProduct]:
+        """검색 결과 파싱 - 정확한 셀렉터 사용 (JS는 원본 텍스트만, 정규식 파싱은 Python에서)"""
+        products = []
 
         try:
-            # JavaScript로 상품 데이터 추출
-            product_data = await self.page.evaluate('''() => {
-                const results = [];
-
-                // 상품 카드 선택 (다양한 셀렉터 시도)
-                const productCards = document.querySelectorAll('[class*="pip-product-compact"], [data-testid="plp-product-card"]');
-
-                productCards.forEach(card => {
-                    try {
-                        // 상품 URL에서 ID 추출
-                        const link = card.querySelector('a[href*="/p/"]');
-                        if (!link) return;
-
-                        const href = link.getAttribute('href') || '';
-                        // URL 패턴: /p/linnmon-adils-table-white-s09246408/
-                        const idMatch = href.match(/-s?(\\d{8})\\/?$/);
-                        if (!idMatch) return;
-
-                        const productId = idMatch[1];
-
-                        // 상품명 추출 (브랜드 + 설명)
-                        const brandEl = card.querySelector('[class*="pip-header-section__title"]');
-                        const descEl = card.querySelector('[class*="pip-header-section__description"], [class*="description-text"]');
-
-                        const brand = brandEl ? brandEl.textContent.trim() : '';
-                        const description = descEl ? descEl.textContent.trim() : '';
-                        const fullName = `${brand} ${description}`.trim();
-
-                        // 가격 추출 - 숨겨진 "가격 ￦ 49900" 텍스트에서 추출
-                        let price = 0;
-                        let originalPrice = null;
-
-                        // 현재 가격
-                        const priceContainer = card.querySelector('[class*="pip-temp-price"], [class*="pip-price"]');
-                        if (priceContainer) {
-                            const priceText = priceContainer.textContent || '';
-                            // "가격 ￦ 49900" 패턴
-                            const priceMatch = priceText.match(/가격[^\\d]*(\\d+)/);
-                            if (priceMatch) {
-                                price = parseInt(priceMatch[1]);
-                            } else {
-                                // "￦49,900" 패턴
-                                const altMatch = priceText.match(/₩?￦?([\\d,]+)/);
-                                if (altMatch) {
-                                    price = parseInt(altMatch[1].replace(/,/g, ''));
-                                }
-                            }
-                        }
-
-                        // 원래 가격 (할인 상품)
-                        const wasPriceEl = card.querySelector('[class*="was-price"], [class*="정가"]');
-                        if (wasPriceEl) {
-                            const wasPriceText = wasPriceEl.textContent || '';
-                            const wasMatch = wasPriceText.match(/정가[^\\d]*(\\d+)/);
-                            if (wasMatch) {
-                                originalPrice = parseInt(wasMatch[1]);
-                            }
-                        }
-
-                        // 이미지 URL
-                        const img = card.querySelector('img');
-                        let imgSrc = img ? (img.getAttribute('src') || img.getAttribute('data-src') || '') : '';
-
-                        // 상품 URL
-                        let productUrl = href;
-                        if (productUrl.startsWith('/')) {
-                            productUrl = 'https://www.ikea.com' + productUrl;
-                        }
-
-                        // 평점 및 리뷰 수 - "검토: 4.4 밖으로 5 별. 총 리뷰 수: (1470)" 패턴
-                        let rating = null;
-                        let reviewCount = 0;
-
-                        const ratingBtn = card.querySelector('button[class*="rating"], [class*="review"]');
-                        if (ratingBtn) {
-                            const ratingText = ratingBtn.textContent || '';
-                            // "검토: 4.4 밖으로 5 별" 패턴
-                            const ratingMatch = ratingText.match(/검토:\\s*([\\d.]+)/);
-                            if (ratingMatch) {
-                                rating = parseFloat(ratingMatch[1]);
-                            }
-                            // "총 리뷰 수: (1470)" 패턴
-                            const reviewMatch = ratingText.match(/\\((\\d+)\\)/);
-                            if (reviewMatch) {
-                                reviewCount = parseInt(reviewMatch[1]);
-                            }
-                        }
-
-                        // 신상품/할인 플래그
-                        const isNew = card.textContent.includes('신제품');
-                        const isSale = originalPrice !== null && originalPrice > price;
-
-                        if (fullName && productId && price > 0) {
-                            results.push({
-                                productId,
-                                brand,
-                                fullName,
-                                price,
-                                originalPrice,
-                                imgSrc,
-                                productUrl,
-                                rating,
-                                reviewCount,
-                                isNew,
-                                isSale
-                            });
-                        }
-                    } catch (e) {}
-                });
-
-                return results;
-            }''')
+            # 상품 카드별 원본 텍스트/속성만 추출 (모든 카드를 한 번의 평가로)
+            # 부족하면 스크롤 후 네트워크가 잠잠해질 때까지만 기다렸다가 다시 추출 (최대 SCROLL_ATTEMPTS번)
+            product_data = []
+            for attempt in range(SCROLL_ATTEMPTS):
+                if attempt:
+                    await page.evaluate("window.scrollBy(0, window.innerHeight * 2)")
+                    try:
+                        await page.wait_for_load_state("networkidle", timeout=SCROLL_IDLE_TIMEOUT)
+                    except Exception:
+                        pass
+
+                loaded = await page.locator(PRODUCT_CARD_SELECTOR).evaluate_all(CARD_FIELDS_CALL_JS)
+                if product_data and len(loaded) <= len(product_data):
+                    break  # 스크롤해도 더 안 나오면 결과가 원래 적은 것
+                product_data = loaded
+                if len(product_data) >= limit:
+                    break
 
             if not product_data:
-                print("[IKEA] 상품을 찾지 못함, 스크롤 후 재시도...")
-                # 스크롤 후 재시도
-                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-                await asyncio.sleep(2)
-                return await self._parse_search_results(category, limit)
-
-            seen_ids = set()
-            for item in product_data:
-                try:
-                    product_id = item.get('productId', '')
-                    if not product_id or product_id in seen_ids:
-                        continue
-                    seen_ids.add(product_id)
-
-                    name = item.get('fullName', '')
-                    if not name:
-                        continue
-
-                    product = IkeaProduct(
-                        product_no=product_id,
-                        name=item.get('brand', ''),
-                        name_ko=name,
-                        price=item.get('price', 0),
-                        original_price=item.get('originalPrice'),
-                        image_url=item.get('imgSrc', ''),
-                        product_url=item.get('productUrl', ''),
-                        category=category,
-                        rating=item.get('rating'),
-                        review_count=item.get('reviewCount', 0),
-                        is_new=item.get('isNew', False),
-                        is_sale=item.get('isSale', False),
-                    )
-                    products.append(product)
-
-                    if len(products) >= limit:
-                        break
-
-                except Exception:
-                    continue
+                logger.warning("[IKEA] '%s' 상품을 찾지 못함", category)
+
+            products = self._products_from_cards(product_data, category, limit)
 
         except Exception as e:
-            print(f"[IKEA] 파싱 실패: {e}")
+            logger.warning("[IKEA] 파싱 실패: %s", e)
 
         return products
 
+    @classmethod
+    def _products_from_cards(cls, cards: List[dict], category: str, limit: int) -> List[IkeaProduct]:
+        """상품 카드 목록 -> 중복 없는 IkeaProduct 목록 (최대 limit개)"""
+        products = []
+        seen_ids = set()
+        for raw in cards:
+            try:
+                product = cls._parse_card(raw, category)
+            except Exception:
+                continue
+            if not product or product.product_no in seen_ids:
+                continue
+            seen_ids.add(product.product_no)
+            products.append(product)
+
+            if len(products) >= limit:
+                break
+        return products
+
+    @staticmethod
+    def _parse_card(raw: dict, category: str) -> Optional[IkeaProduct]:
+        """상품 카드 원본 텍스트 -> IkeaProduct (ID/가격이 없으면 None)"""
+        href = raw['href']
+        id_match = _ID_RE.search(href)
+        if not id_match:
+            return None
+
+        brand = raw['brand']
+        full_name = f"{brand} {raw['desc']}".strip()
+
+        # 가격 - 숨겨진 "가격 ￦ 49900" 텍스트, 없으면 "￦49,900" 형식
+        price = 0
+        price_match = _PRICE_RE.search(raw['priceText'])
+        if price_match:
+            price = int(price_match.group(1))
+        else:
+            alt_match = _PRICE_ALT_RE.search(raw['priceText'])
+            digits = alt_match.group(1).replace(',', '') if alt_match else ''
+            price = int(digits) if digits else 0
+
+        if not full_name or price <= 0:
+            return None
+
+        was_match = _WAS_RE.search(raw['wasPriceText'])
+        original_price = int(was_match.group(1)) if was_match else None
+
+        # 평점 및 리뷰 수 - "검토: 4.4 밖으로 5 별. 총 리뷰 수: (1470)" 형식
+        rating_match = _RATING_RE.search(raw['ratingText'])
+        review_match = _REVIEW_RE.search(raw['ratingText'])
+
+        product_url = href
+        if product_url.startswith('/'):
+            product_url = 'https://www.ikea.com' + product_url
+
+        return IkeaProduct(
+            product_no=id_match.group(1),
+            name=brand,
+            name_ko=full_name,
+            price=price,
+            original_price=original_price,
+            image_url=raw['imgSrc'],
+            product_url=product_url,
+            category=category,
+            rating=float(rating_match.group(1)) if rating_match else None,
+            review_count=int(review_match.group(1)) if review_match else 0,
+            is_new=raw['isNew'],
+            is_sale=original_price is not None and original_price > price,
+        )
+
     async def close(self):
         """리소스 정리"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
         await self._close_browser()
 
 
 def create_ikea_catalog_table():
     """IKEA 카탈로그 테이블 생성/업데이트"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
     # 테이블 존재 여부 확인
@@ -369,109 +558,177 @@ def create_ikea_catalog_table():
                 except sqlite3.OperationalError:
                     pass
 
+    # verify_ikea_data 조회용 부분 인덱스 (ikea_api_crawler와 같은 이름이라 중복 생성 없음)
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_ikea_price ON ikea_catalog(price) WHERE price > 0')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_ikea_rating ON ikea_catalog(rating) WHERE rating IS NOT NULL')
+
+    # 카테고리별 마지막 수집 시각 (변경 없는 상품은 다시 쓰지 않아 updated_at으로는 알 수 없음)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS ikea_category_crawls (
+            category TEXT PRIMARY KEY,
+            crawled_at DATETIME NOT NULL
+        ) WITHOUT ROWID
+    ''')
+
     conn.commit()
     conn.close()
 
 
-async def run_ikea_crawl(categories: List[str] = None, limit_per_category: int = 30):
-    """IKEA 크롤링 실행"""
+# 저장 전 기존 값 비교에 쓰는 컬럼 (UPSERT_SQL 값 순서와 같음)
+KNOWN_ROWS_SQL = '''
+    SELECT product_no, name, name_ko, price, original_price,
+           image_url, product_url, category, rating, review_count,
+           is_new, is_sale
+    FROM ikea_catalog
+'''
+
+RECENT_CATEGORIES_SQL = '''
+    SELECT category FROM ikea_category_crawls WHERE crawled_at > datetime('now', ?)
+'''
+
+MARK_CRAWLED_SQL = '''
+    INSERT INTO ikea_category_crawls (category, crawled_at) VALUES (?, datetime('now'))
+    ON CONFLICT(category) DO UPDATE SET crawled_at=excluded.crawled_at
+'''
+
+# product_no UNIQUE 제약을 이용한 UPSERT (행마다 SELECT 불필요)
+UPSERT_SQL = '''
+    INSERT INTO ikea_catalog
+    (product_no, name, name_ko, price, original_price,
+     image_url, product_url, category, rating, review_count,
+     is_new, is_sale, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(product_no) DO UPDATE SET
+        name=excluded.name, name_ko=excluded.name_ko, price=excluded.price,
+        original_price=excluded.original_price, image_url=excluded.image_url,
+        product_url=excluded.product_url, category=excluded.category,
+        rating=excluded.rating, review_count=excluded.review_count,
+        is_new=excluded.is_new, is_sale=excluded.is_sale,
+        updated_at=datetime('now')
+'''
+
+
+async def run_ikea_crawl(categories: List[str] = None, limit_per_category: int = 30, force: bool = False):
+    """IKEA 크롤링 실행 (force=False면 CATEGORY_TTL_HOURS 안에 수집한 카테고리는 건너뜀)"""
     print("=== IKEA Playwright 크롤링 시작 ===\n")
 
     create_ikea_catalog_table()
 
-    crawler = IkeaPlaywrightCrawler(headless=True)
+    crawler = IkeaPlaywrightCrawler(headless=True, pool_size=CATEGORY_CONCURRENCY)
 
     if categories is None:
         categories = IKEA_CATEGORIES
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
-    # 기존 수 확인
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog')
-    before_count = cur.fetchone()[0]
-    print(f"기존 카탈로그: {before_count}개\n")
+    # 기존 상품을 한 번만 읽어 두고 신규/변경/변경 없음을 메모리에서 판단
+    known = {row[0]: row[1:] for row in cur.execute(KNOWN_ROWS_SQL)}
+    print(f"기존 카탈로그: {len(known)}개\n")
+
+    skipped = 0
+    if not force:
+        recent = {row[0] for row in cur.execute(RECENT_CATEGORIES_SQL, (f'-{CATEGORY_TTL_HOURS} hours',))}
+        pending_categories = [category for category in categories if category not in recent]
+        skipped = len(categories) - len(pending_categories)
+        categories = pending_categories
+        if skipped:
+            print(f"최근 {CATEGORY_TTL_HOURS}시간 안에 수집한 카테고리 {skipped}개 건너뜀\n")
 
     total_added = 0
     total_updated = 0
     total_errors = 0
 
-    try:
-        for i, category in enumerate(categories, 1):
-            print(f"[{i}/{len(categories)}] '{category}' 검색 중...")
+    # 카테고리 검색은 CATEGORY_CONCURRENCY개씩 동시에 실행 (페이지 풀 크기와 같음)
+    semaphore = asyncio.BoundedSemaphore(CATEGORY_CONCURRENCY)
+    # 검색 결과는 큐로 넘기고 저장은 writer 하나가 담당 (SQLite는 쓰기 연결 하나)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
 
+    async def worker(i: int, category: str):
+        async with semaphore:
+            logger.info("[%d/%d] '%s' 검색 중...", i, len(categories), category)
             try:
                 products = await crawler.search_products(category, limit=limit_per_category)
-
-                for product in products:
-                    try:
-                        # 기존 상품 확인
-                        cur.execute('SELECT id, price FROM ikea_catalog WHERE product_no = ?',
-                                   (product.product_no,))
-                        existing = cur.fetchone()
-
-                        if existing:
-                            # 업데이트
-                            cur.execute('''
-                                UPDATE ikea_catalog
-                                SET name=?, name_ko=?, price=?, original_price=?,
-                                    image_url=?, product_url=?, category=?,
-                                    rating=?, review_count=?, is_new=?, is_sale=?,
-                                    updated_at=datetime('now')
-                                WHERE product_no=?
-                            ''', (
-                                product.name, product.name_ko, product.price,
-                                product.original_price, product.image_url,
-                                product.product_url, product.category,
-                                product.rating, product.review_count,
-                                1 if product.is_new else 0,
-                                1 if product.is_sale else 0,
-                                product.product_no
-                            ))
-                            total_updated += 1
-                        else:
-                            # 신규 추가
-                            cur.execute('''
-                                INSERT INTO ikea_catalog
-                                (product_no, name, name_ko, price, original_price,
-                                 image_url, product_url, category, rating, review_count,
-                                 is_new, is_sale, created_at)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                            ''', (
-                                product.product_no, product.name, product.name_ko,
-                                product.price, product.original_price,
-                                product.image_url, product.product_url, product.category,
-                                product.rating, product.review_count,
-                                1 if product.is_new else 0,
-                                1 if product.is_sale else 0,
-                            ))
-                            total_added += 1
-
-                    except Exception as e:
-                        total_errors += 1
-                        print(f"  [오류] {product.name_ko[:30] if product.name_ko else 'Unknown'}: {e}")
-
-                conn.commit()
-
             except Exception as e:
-                total_errors += 1
-                print(f"  [오류] 카테고리 '{category}' 크롤링 실패: {e}")
+                products = e
+        await queue.put((i, category, products))
 
-            # API 부하 방지
-            await asyncio.sleep(2)
+    async def producer():
+        try:
+            await asyncio.gather(*(worker(i, category) for i, category in enumerate(categories, 1)))
+        finally:
+            await crawler.close()
+            await queue.put(None)
+
+    def save_category(category: str, products):
+        """카테고리 하나를 한 트랜잭션으로 저장 (실패하면 그 카테고리만 롤백)"""
+        nonlocal total_added, total_updated, total_errors
+
+        if isinstance(products, BaseException):
+            total_errors += 1
+            logger.warning("[IKEA] 카테고리 '%s' 크롤링 실패: %s", category, products)
+            return
+
+        # 저장된 값과 완전히 같은 상품은 쓰지 않음 (카테고리가 바뀌면 나중 것으로 갱신)
+        changed = {}
+        for product in products:
+            values = (
+                product.name, product.name_ko,
+                product.price, product.original_price,
+                product.image_url, product.product_url, product.category,
+                product.rating, product.review_count,
+                1 if product.is_new else 0,
+                1 if product.is_sale else 0,
+            )
+            if known.get(product.product_no) != values:
+                changed[product.product_no] = values
 
-    finally:
-        await crawler.close()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cur.executemany(UPSERT_SQL, [(product_no, *values) for product_no, values in changed.items()])
+            # 결과가 비었으면 (차단/셀렉터 변경 등) 다음 실행에서 다시 크롤링하도록 표시하지 않음
+            if products:
+                cur.execute(MARK_CRAWLED_SQL, (category,))
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            total_errors += 1
+            logger.warning("[IKEA] 카테고리 '%s' 저장 실패: %s", category, e)
+            return
+
+        # 커밋된 카테고리만 메모에 반영
+        added = sum(1 for product_no in changed if product_no not in known)
+        total_added += added
+        total_updated += len(changed) - added
+        known.update(changed)
+
+    async def writer():
+        """검색이 끝나는 대로 저장하되 카테고리 순서를 지켜서 (같은 상품은 나중 카테고리가 이김)"""
+        ready = {}
+        next_index = 1
+        while (item := await queue.get()) is not None:
+            i, category, products = item
+            ready[i] = (category, products)
+            while next_index in ready:
+                save_category(*ready.pop(next_index))
+                next_index += 1
+
+    # 검색과 저장이 겹쳐서 진행됨 (쓰기 잠금은 카테고리를 저장하는 동안만 잡음,
+    # 중간에 중단돼도 이미 저장한 카테고리는 남음)
+    try:
+        await asyncio.gather(producer(), writer())
+    except BaseException:
+        conn.rollback()
+        conn.close()
+        raise
 
     # 최종 통계
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog')
-    after_count = cur.fetchone()[0]
-
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog WHERE price > 0')
-    valid_count = cur.fetchone()[0]
-
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog WHERE rating IS NOT NULL')
-    rated_count = cur.fetchone()[0]
+    # 테이블을 한 번만 훑어서 한꺼번에 집계
+    cur.execute('''
+        SELECT COUNT(*), COALESCE(SUM(price > 0), 0), COUNT(rating)
+        FROM ikea_catalog
+    ''')
+    after_count, valid_count, rated_count = cur.fetchone()
 
     print(f"\n=== IKEA 크롤링 완료 ===")
     print(f"신규 추가: {total_added}개")
@@ -487,38 +744,36 @@ async def run_ikea_crawl(categories: List[str] = None, limit_per_category: int =
         'added': total_added,
         'updated': total_updated,
         'errors': total_errors,
+        'skipped': skipped,
         'total': after_count,
     }
 
 
 def verify_ikea_data():
     """IKEA 데이터 검증"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open_db()
     cur = conn.cursor()
 
     print("\n=== IKEA 데이터 검증 ===")
 
-    # 가격 분포
-    cur.execute('SELECT MIN(price), MAX(price), AVG(price) FROM ikea_catalog WHERE price > 0')
-    price_stats = cur.fetchone()
-    if price_stats[0]:
-        print(f"가격 범위: {price_stats[0]:,}원 ~ {price_stats[1]:,}원 (평균: {price_stats[2]:,.0f}원)")
+    # 가격 분포 / 가격=0 개수 / 평점 / 리뷰 통계를 테이블 한 번 훑어서 집계
+    # (가격 통계는 가격 > 0 상품만: NULLIF로 0을 빼면 MIN/MAX/AVG가 무시함)
+    cur.execute('''
+        SELECT
+            MIN(NULLIF(price, 0)), MAX(NULLIF(price, 0)), AVG(NULLIF(price, 0)),
+            COUNT(CASE WHEN price = 0 THEN 1 END),
+            COUNT(rating), AVG(rating),
+            COALESCE(SUM(review_count), 0)
+        FROM ikea_catalog
+    ''')
+    (min_price, max_price, avg_price, zero_price,
+     rated_count, avg_rating, total_reviews) = cur.fetchone()
 
-    # 가격=0 개수
-    cur.execute('SELECT COUNT(*) FROM ikea_catalog WHERE price = 0')
-    zero_price = cur.fetchone()[0]
+    if min_price:
+        print(f"가격 범위: {min_price:,}원 ~ {max_price:,}원 (평균: {avg_price:,.0f}원)")
     print(f"가격=0 상품: {zero_price}개")
-
-    # 평점 통계
-    cur.execute('SELECT COUNT(*), AVG(rating) FROM ikea_catalog WHERE rating IS NOT NULL')
-    rating_stats = cur.fetchone()
-    if rating_stats[0]:
-        avg_rating = rating_stats[1] if rating_stats[1] else 0
-        print(f"평점 있는 상품: {rating_stats[0]}개 (평균: {avg_rating:.2f})")
-
-    # 리뷰 통계
-    cur.execute('SELECT SUM(review_count) FROM ikea_catalog')
-    total_reviews = cur.fetchone()[0] or 0
+    if rated_count:
+        print(f"평점 있는 상품: {rated_count}개 (평균: {avg_rating or 0:.2f})")
     print(f"총 리뷰 수: {total_reviews:,}개")
 
     # 샘플 출력
@@ -538,9 +793,33 @@ def verify_ikea_data():
     conn.close()
 
 
+def start_log_listener() -> logging.handlers.QueueListener:
+    """로그를 큐에 넣기만 하고 출력은 별도 스레드에서 (동시 검색 중 stdout 쓰기 대기 없음)"""
+    log_queue = SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
 if __name__ == '__main__':
-    # 크롤링 실행
-    asyncio.run(run_ikea_crawl(limit_per_category=20))
+    import argparse
+
+    parser = argparse.ArgumentParser(description='IKEA Playwright 카탈로그 크롤러')
+    parser.add_argument('--force', action='store_true', help=f'최근 {CATEGORY_TTL_HOURS}시간 안에 수집한 카테고리도 다시 수집')
+    args = parser.parse_args()
 
-    # 데이터 검증
-    verify_ikea_data()
+    listener = start_log_listener()
+    try:
+        # 크롤링 실행
+        asyncio.run(run_ikea_crawl(limit_per_category=20, force=args.force))
+
+        # 데이터 검증
+        verify_ikea_data()
+    finally:
+        listener.stop()
@@ -2,14 +2,20 @@
 """
 이케아 코리아 스크래퍼
 - 상품 검색 및 카탈로그 수집
-- Playwright 기반
+- 검색은 이케아 검색 API(JSON) 우선, 결과가 없으면 Playwright로 대체
 """
 import re
+import json
 import asyncio
+import functools
 import urllib.parse
 import random
 from typing import Optional, List, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+
+import httpx
+
+from ikea_crawler import SEARCH_HEADERS, IkeaCrawler
 
 try:
     from playwright.async_api import async_playwright
@@ -18,10 +24,115 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("[!] Playwright 설치 필요: pip install playwright && playwright install chromium")
 
-
-@dataclass
+# 상품 목록 파싱에 필요 없는 요청 (img src 속성은 남으므로 이미지 URL 수집에는 영향 없음)
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+BLOCKED_URL_KEYWORDS = ("google-analytics", "googletagmanager", "doubleclick", "hotjar", "criteo", "analytics")
+
+
+# 목록 로딩 확인 / 상품 카드 / 쿠키 동의 버튼 셀렉터 (호출마다 문자열을 새로 만들지 않음)
+LIST_READY_SELECTOR = '.plp-product-list, .search-results, .pip-product-compact, [data-testid="product-card"]'
+PRODUCT_CARD_SELECTOR = '.pip-product-compact, .plp-product-list__item, [data-testid="product-card"]'
+COOKIE_BUTTON_SELECTOR = '#onetrust-accept-btn-handler'
+
+# 카드 안 필드별 후보 셀렉터 (앞쪽일수록 우선, [class*=...] 부분 일치는 마지막 대안)
+# 목록마다 처음 맞은 셀렉터를 이후 카드에 먼저 사용하고, 없을 때만 나머지 후보로 대체
+# (쉼표로 묶은 선택자를 카드마다 평가하지 않음)
+CARD_FIELD_SELECTORS = {
+    "name": ('.pip-header-section__title--small', '.pip-header-section__title', '[class*="product-name"]'),
+    "type": ('.pip-header-section__description-text', '.pip-header-section__description',
+             '[class*="product-type"]'),
+    "price": ('.pip-temp-price__integer', '.pip-price__integer', '[class*="price"]'),
+    "rating": ('[class*="rating"]',),
+}
+
+# 검색/카테고리 목록의 상품 카드를 한 번의 evaluate로 추출
+# 카드별 객체 대신 필드별 배열로 반환 (행마다 키 문자열을 직렬화하지 않음, 같은 인덱스 = 같은 상품)
+PRODUCT_CARDS_JS = '''() => {
+    // 카드마다 새로 만들지 않도록 정규식은 한 번만 생성
+    const ID_RE = /-([0-9]{8})/;
+    const RATE_RE = /(\\d+\\.?\\d*)/;
+    const PRICE_RE = /[0-9]+/g;
+
+    const ids = [], names = [], types = [], prices = [], imgs = [], urls = [], ratings = [];
+
+    // 필드별 후보 셀렉터 (CARD_FIELD_SELECTORS, 초기화 스크립트에서 설정)
+    // 처음 요소를 찾은 셀렉터를 기억해 두고 이후 카드에는 그 셀렉터부터 시도
+    // (그 셀렉터가 없는 카드만 나머지 후보를 순서대로 확인)
+    const candidates = window.__ikeaFieldSelectors;
+    const chosen = {};
+    const pick = (item, field) => {
+        const sel = chosen[field];
+        if (sel) {
+            const el = item.querySelector(sel);
+            if (el) return el;
+        }
+        for (const s of candidates[field]) {
+            if (s === sel) continue;
+            const el = item.querySelector(s);
+            if (el) {
+                if (!sel) chosen[field] = s;
+                return el;
+            }
+        }
+        return null;
+    };
+
+    // 이케아 상품 카드 선택자 (PRODUCT_CARD_SELECTOR, 초기화 스크립트에서 설정)
+    for (const item of document.querySelectorAll(window.__ikeaCardSelector)) {
+        try {
+            // 상품 링크에서 ID 추출
+            const link = item.querySelector('a[href*="/p/"]');
+            if (!link) continue;
+
+            const href = link.getAttribute('href') || '';
+            const idMatch = ID_RE.exec(href);
+            if (!idMatch) continue;
+
+            // 상품명 (IKEA는 이름과 타입이 분리됨)
+            const nameEl = pick(item, 'name');
+            const name = nameEl ? nameEl.textContent.trim() : '';
+            if (!name) continue;
+
+            const typeEl = pick(item, 'type');
+
+            // 가격
+            const priceEl = pick(item, 'price');
+            const price = priceEl ? parseInt((priceEl.textContent.match(PRICE_RE) || []).join('')) || 0 : 0;
+
+            // 이미지
+            const img = item.querySelector('img');
+
+            // 평점
+            const ratingEl = pick(item, 'rating');
+            const ratingMatch = ratingEl ? RATE_RE.exec(ratingEl.textContent || '') : null;
+
+            // 모든 필드를 구한 뒤에 한꺼번에 추가 (배열 길이가 항상 같도록)
+            ids.push(idMatch[1]);
+            names.push(name);
+            types.push(typeEl ? typeEl.textContent.trim() : '');
+            prices.push(price);
+            imgs.push(img ? (img.getAttribute('src') || img.getAttribute('data-src') || '') : '');
+            urls.push(href.startsWith('/') ? 'https://www.ikea.com' + href : href);
+            ratings.push(ratingMatch ? parseFloat(ratingMatch[1]) : 0);
+        } catch (e) {}
+    }
+
+    return {ids, names, types, prices, imgs, urls, ratings};
+}'''
+
+# 컨텍스트 생성 시 한 번 등록하면 새 문서마다 셀렉터와 추출 함수가 설치됨
+# (목록마다 스크립트 전체를 보내고 다시 파싱하지 않고 함수 호출만 평가)
+PRODUCT_CARDS_INIT_JS = (
+    f'window.__ikeaCardSelector = {json.dumps(PRODUCT_CARD_SELECTOR)};\n'
+    f'window.__ikeaFieldSelectors = {json.dumps(CARD_FIELD_SELECTORS)};\n'
+    f'window.__extractIkeaCards = {PRODUCT_CARDS_JS};'
+)
+PRODUCT_CARDS_CALL_JS = '() => window.__extractIkeaCards()'
+
+
+@dataclass(slots=True)
 class IkeaProduct:
-    """이케아 상품 정보"""
+    """이케아 상품 정보 (검색마다 수십 개씩 만들어지므로 __slots__ 사용)"""
     product_id: str  # 상품 ID (예: 00468539)
     name: str
     type_name: str = ""  # 상품 타입 (예: "책상", "수납장")
@@ -35,68 +146,130 @@ class IkeaProduct:
     review_count: int = 0
 
     def to_dict(self) -> dict:
-        return {
-            "product_id": self.product_id,
-            "name": self.name,
-            "type_name": self.type_name,
-            "price": self.price,
-            "image_url": self.image_url,
-            "product_url": self.product_url,
-            "category": self.category,
-            "color": self.color,
-            "size": self.size,
-            "rating": self.rating,
-            "review_count": self.review_count,
-        }
+        # 필드 목록은 클래스 정의 후 한 번만 계산 (필드를 추가해도 여기는 수정할 필요 없음)
+        return {name: getattr(self, name) for name in _PRODUCT_FIELDS}
 
 
-class IkeaScraper:
-    """이케아 코리아 스크래퍼"""
+_PRODUCT_FIELDS = tuple(f.name for f in fields(IkeaProduct))
 
-    BASE_URL = "https://www.ikea.com/kr/ko"
-    SEARCH_URL = "https://www.ikea.com/kr/ko/search/"
+
+class IkeaBrowserPool:
+    """
+    여러 IkeaScraper가 공유하는 Chromium 프로세스 하나 + 재사용 컨텍스트
+    - 스크래퍼마다 브라우저를 띄우지 않고 컨텍스트만 빌려 씀
+    - 반납된 컨텍스트는 다음 스크래퍼가 재사용 (쿠키 동의 상태도 유지)
+    - 빌려 간 스크래퍼가 모두 반납하면 브라우저 종료
+    """
+
+    LAUNCH_ARGS = (
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-blink-features=AutomationControlled',
+    )
+
+    CONTEXT_OPTIONS = {
+        "viewport": {"width": 1920, "height": 1080},
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "locale": "ko-KR",
+    }
+
+    # 컨텍스트마다 등록하는 초기화 스크립트 (스텔스 + 상품 카드 추출 함수를 한 번에)
+    INIT_SCRIPT = (
+        "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });\n"
+        + PRODUCT_CARDS_INIT_JS
+    )
 
     def __init__(self, headless: bool = True):
         self.headless = headless
-        self.browser = None
-        self.page = None
-        self.context = None
         self.playwright = None
-
-    async def _init_browser(self):
-        """브라우저 초기화"""
+        self.browser = None
+        self._idle_contexts = []
+        self._users = 0
+        self._lock = asyncio.Lock()
+        # 쿠키 동의 후의 storage_state (이후 컨텍스트는 동의된 상태로 시작)
+        self._consent_state = None
+        self._consented_contexts = set()
+
+    async def _launch(self):
+        """Playwright 및 브라우저 시작"""
         if not PLAYWRIGHT_AVAILABLE:
             raise RuntimeError("Playwright가 설치되어 있지 않습니다")
 
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=self.headless,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-            ]
+            args=list(self.LAUNCH_ARGS),
         )
 
-        self.context = await self.browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            locale="ko-KR",
-        )
-
-        await self.context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-        """)
+    async def _new_context(self):
+        """스텔스 스크립트가 적용된 BrowserContext 생성"""
+        if self._consent_state is None:
+            context = await self.browser.new_context(**self.CONTEXT_OPTIONS)
+        else:
+            context = await self.browser.new_context(**self.CONTEXT_OPTIONS, storage_state=self._consent_state)
+            self._consented_contexts.add(context)
+        await context.add_init_script(self.INIT_SCRIPT)
+        await context.route("**/*", self._block_heavy_resources)
+        return context
+
+    @staticmethod
+    async def _block_heavy_resources(route):
+        """이미지/폰트/미디어/CSS 및 분석·광고 요청 차단 (문서, 스크립트, XHR은 통과)"""
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(k in request.url for k in BLOCKED_URL_KEYWORDS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def dismiss_cookie_banner(self, page):
+        """
+        쿠키 동의 팝업 닫기 (컨텍스트마다 한 번)
+        - 처음 동의한 컨텍스트의 storage_state를 저장해 두고 이후 컨텍스트에 넣어 줌
+        - 팝업은 파싱을 막지 않으므로 클릭 후 대기 없음
+        """
+        context = page.context
+        if context in self._consented_contexts:
+            return
 
-        self.page = await self.context.new_page()
+        try:
+            cookie_btn = await page.query_selector(COOKIE_BUTTON_SELECTOR)
+            if cookie_btn:
+                await cookie_btn.click()
+                self._consented_contexts.add(context)
+                if self._consent_state is None:
+                    self._consent_state = await context.storage_state()
+        except Exception:
+            pass
 
-    async def _close_browser(self):
-        """브라우저 종료"""
+    async def acquire(self):
+        """컨텍스트 대여 (브라우저는 처음 빌릴 때 시작)"""
+        async with self._lock:
+            self._users += 1
+            try:
+                if self.browser is None:
+                    await self._launch()
+                if self._idle_contexts:
+                    return self._idle_contexts.pop()
+                return await self._new_context()
+            except Exception:
+                self._users -= 1
+                if not self._users:
+                    await self._shutdown()
+                raise
+
+    async def release(self, context):
+        """컨텍스트 반납 (마지막 사용자가 반납하면 브라우저 종료)"""
+        async with self._lock:
+            self._idle_contexts.append(context)
+            self._users -= 1
+            if not self._users:
+                await self._shutdown()
+
+    async def _shutdown(self):
+        """컨텍스트/브라우저/Playwright 종료"""
         try:
-            if self.page:
-                await self.page.close()
-            if self.context:
-                await self.context.close()
+            for context in self._idle_contexts:
+                await context.close()
             if self.browser:
                 await self.browser.close()
             if self.playwright:
@@ -104,183 +277,176 @@ class IkeaScraper:
         except Exception:
             pass
         finally:
-            self.page = None
-            self.context = None
+            self._idle_contexts = []
+            self._consented_contexts = set()
             self.browser = None
             self.playwright = None
 
-    async def search_products(self, query: str, limit: int = 20) -> List[IkeaProduct]:
-        """상품 검색"""
+
+# headless 여부별로 프로세스 전체에서 하나씩
+_browser_pools: Dict[bool, IkeaBrowserPool] = {}
+
+
+def get_browser_pool(headless: bool = True) -> IkeaBrowserPool:
+    """공유 브라우저 풀 (없으면 생성)"""
+    if headless not in _browser_pools:
+        _browser_pools[headless] = IkeaBrowserPool(headless)
+    return _browser_pools[headless]
+
+
+class IkeaScraper:
+    """이케아 코리아 스크래퍼"""
+
+    BASE_URL = "https://www.ikea.com/kr/ko"
+    SEARCH_URL = "https://www.ikea.com/kr/ko/search/"
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self.page = None
+        self.context = None
+        self._extra_pages = []
+        self._pool = get_browser_pool(headless)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def _init_browser(self):
+        """공유 브라우저에서 컨텍스트를 빌려 페이지 생성"""
+        self.context = await self._pool.acquire()
+        try:
+            self.page = await self.context.new_page()
+        except Exception:
+            await self._close_browser()
+            raise
+
+    async def open_pages(self, count: int) -> list:
+        """같은 컨텍스트에서 동시에 쓸 페이지 count개 (첫 페이지는 self.page)"""
         if not self.page:
             await self._init_browser()
+        while len(self._extra_pages) < count - 1:
+            self._extra_pages.append(await self.context.new_page())
+        return [self.page, *self._extra_pages[:count - 1]]
+
+    async def _close_browser(self):
+        """페이지를 닫고 컨텍스트를 풀에 반납 (브라우저는 풀이 관리)"""
+        try:
+            for page in [self.page, *self._extra_pages]:
+                if page:
+                    await page.close()
+        except Exception:
+            pass
+        finally:
+            self.page = None
+            self._extra_pages = []
+            if self.context:
+                context, self.context = self.context, None
+                await self._pool.release(context)
+
+    async def search_products(self, query: str, limit: int = 20, page=None,
+                              fallback: bool = True) -> List[IkeaProduct]:
+        """
+        상품 검색 (검색 API 우선, 결과가 없고 fallback이면 브라우저로 검색)
+        - page를 넘기면 그 페이지에서, 아니면 self.page에서 브라우저 검색
+        """
+        products = await self._search_api(query, limit)
+        if products or not fallback:
+            return products
+        return await self._search_with_browser(query, limit, page)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """검색 API용 연결 (처음 쓸 때 생성, 스크래퍼 수명 동안 HTTP/2 연결 재사용)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(http2=True, headers=SEARCH_HEADERS, timeout=15.0)
+        return self._client
+
+    async def _search_api(self, query: str, limit: int) -> List[IkeaProduct]:
+        """검색 API(JSON) 조회 (브라우저 없이, 요청 속도는 ikea_crawler의 SEARCH_LIMITER로 제한)"""
+        products = []
+        seen_ids = set()
+        for found in await IkeaCrawler.search_async(self._get_client(), query, limit):
+            if found.product_code in seen_ids:
+                continue
+            seen_ids.add(found.product_code)
+            products.append(IkeaProduct(found.product_code, found.name, found.type_name, found.price,
+                                        found.image_url, found.product_url,
+                                        rating=found.rating, review_count=found.review_count))
+        return products
+
+    async def _search_with_browser(self, query: str, limit: int = 20, page=None) -> List[IkeaProduct]:
+        """브라우저로 검색 페이지를 열어 상품 카드 파싱 (검색 API 대체 경로)"""
+        if page is None:
+            if not self.page:
+                await self._init_browser()
+            page = self.page
 
         try:
             encoded_query = urllib.parse.quote(query)
             search_url = f"{self.SEARCH_URL}?q={encoded_query}"
 
             print(f"[이케아] 검색: '{query}'")
-            await self.page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(4)  # 이케아 로딩 느림
+            await self._open_listing(page, search_url)
 
-            # 쿠키 동의 팝업 닫기
-            try:
-                cookie_btn = await self.page.query_selector('#onetrust-accept-btn-handler')
-                if cookie_btn:
-                    await cookie_btn.click()
-                    await asyncio.sleep(1)
-            except Exception:
-                pass
-
-            products = await self._parse_search_results(limit)
+            products = await self._parse_search_results(page, limit)
             return products
 
         except Exception as e:
             print(f"[에러] 이케아 검색 실패 ({query}): {e}")
             return []
 
-    async def _parse_search_results(self, limit: int) -> List[IkeaProduct]:
-        """검색 결과 파싱"""
-        products = []
+    async def _open_listing(self, page, url: str):
+        """목록 페이지 이동 후 상품 카드가 붙을 때까지만 대기 (고정 대기 없음), 쿠키 팝업 닫기"""
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
 
         try:
-            await self.page.wait_for_selector('.plp-product-list, .search-results, .pip-product-compact', timeout=15000)
+            await page.wait_for_selector(LIST_READY_SELECTOR, timeout=15000)
         except Exception:
             print("[경고] 이케아 상품 목록 로딩 타임아웃")
 
+        await self._pool.dismiss_cookie_banner(page)
+
+    async def _parse_search_results(self, page, limit: int) -> List[IkeaProduct]:
+        """검색 결과 파싱"""
+        products = []
+
         try:
-            product_data = await self.page.evaluate('''() => {
-                const results = [];
-
-                // 이케아 상품 카드 선택자
-                const items = document.querySelectorAll('.pip-product-compact, .plp-product-list__item, [data-testid="product-card"]');
-
-                items.forEach(item => {
-                    try {
-                        // 상품 링크에서 ID 추출
-                        const link = item.querySelector('a[href*="/p/"]');
-                        if (!link) return;
-
-                        const href = link.getAttribute('href') || '';
-                        const idMatch = href.match(/-([0-9]{8})/);
-                        if (!idMatch) return;
-
-                        const productId = idMatch[1];
-
-                        // 상품명 (IKEA는 이름과 타입이 분리됨)
-                        const nameEl = item.querySelector('.pip-header-section__title--small, .pip-header-section__title, [class*="product-name"]');
-                        const name = nameEl ? nameEl.textContent.trim() : '';
-
-                        const typeEl = item.querySelector('.pip-header-section__description-text, .pip-header-section__description, [class*="product-type"]');
-                        const typeName = typeEl ? typeEl.textContent.trim() : '';
-
-                        // 가격
-                        let price = 0;
-                        const priceEl = item.querySelector('.pip-temp-price__integer, .pip-price__integer, [class*="price"]');
-                        if (priceEl) {
-                            const priceText = priceEl.textContent || '';
-                            price = parseInt(priceText.replace(/[^0-9]/g, '')) || 0;
-                        }
-
-                        // 이미지
-                        const img = item.querySelector('img');
-                        let imgSrc = img ? (img.getAttribute('src') || img.getAttribute('data-src') || '') : '';
-
-                        // 상품 URL
-                        let productUrl = href;
-                        if (productUrl.startsWith('/')) {
-                            productUrl = 'https://www.ikea.com' + productUrl;
-                        }
-
-                        // 평점
-                        let rating = 0;
-                        let reviewCount = 0;
-                        const ratingEl = item.querySelector('[class*="rating"]');
-                        if (ratingEl) {
-                            const ratingText = ratingEl.textContent || '';
-                            const ratingMatch = ratingText.match(/(\\d+\\.?\\d*)/);
-                            if (ratingMatch) rating = parseFloat(ratingMatch[1]);
-                        }
-
-                        if (name && productId) {
-                            results.push({
-                                productId,
-                                name,
-                                typeName,
-                                price,
-                                imgSrc,
-                                productUrl,
-                                rating,
-                                reviewCount
-                            });
-                        }
-                    } catch (e) {}
-                });
-
-                return results;
-            }''')
-
-            if not product_data:
+            columns = await page.evaluate(PRODUCT_CARDS_CALL_JS)
+            product_ids = columns['ids']
+
+            if not product_ids:
                 print("[경고] 이케아 상품을 찾지 못함")
                 return products
 
-            print(f"[정보] 이케아에서 {len(product_data)}개 상품 발견")
+            print(f"[정보] 이케아에서 {len(product_ids)}개 상품 발견")
 
             seen_ids = set()
-            for item in product_data:
-                try:
-                    product_id = item.get('productId', '')
-                    if not product_id or product_id in seen_ids:
-                        continue
-                    seen_ids.add(product_id)
-
-                    name = item.get('name', '')
-                    if not name:
-                        continue
-
-                    product = IkeaProduct(
-                        product_id=product_id,
-                        name=name,
-                        type_name=item.get('typeName', ''),
-                        price=item.get('price', 0),
-                        image_url=item.get('imgSrc', ''),
-                        product_url=item.get('productUrl', ''),
-                        rating=item.get('rating', 0),
-                        review_count=item.get('reviewCount', 0),
-                    )
-                    products.append(product)
-
-                    if len(products) >= limit:
-                        break
-
-                except Exception:
+            for product_id, name, type_name, price, image_url, product_url, rating in zip(
+                    product_ids, columns['names'], columns['types'], columns['prices'],
+                    columns['imgs'], columns['urls'], columns['ratings']):
+                if product_id in seen_ids:
                     continue
+                seen_ids.add(product_id)
+
+                products.append(IkeaProduct(product_id, name, type_name, price, image_url, product_url,
+                                            rating=rating))
+                if len(products) >= limit:
+                    break
 
         except Exception as e:
             print(f"[에러] 이케아 결과 파싱 실패: {e}")
 
         return products
 
-    async def get_category_products(self, category_path: str, limit: int = 50) -> List[IkeaProduct]:
-        """카테고리별 상품 수집"""
-        if not self.page:
-            await self._init_browser()
+    async def get_category_products(self, category_path: str, limit: int = 50, page=None) -> List[IkeaProduct]:
+        """카테고리별 상품 수집 (page를 넘기면 그 페이지에서, 아니면 self.page에서)"""
+        if page is None:
+            if not self.page:
+                await self._init_browser()
+            page = self.page
 
         try:
             category_url = f"{self.BASE_URL}/{category_path}"
             print(f"[이케아] 카테고리 접속: {category_path}")
-            await self.page.goto(category_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(4)
+            await self._open_listing(page, category_url)
 
-            # 쿠키 동의
-            try:
-                cookie_btn = await self.page.query_selector('#onetrust-accept-btn-handler')
-                if cookie_btn:
-                    await cookie_btn.click()
-                    await asyncio.sleep(1)
-            except Exception:
-                pass
-
-            products = await self._parse_search_results(limit)
+            products = await self._parse_search_results(page, limit)
             return products
 
         except Exception as e:
@@ -290,6 +456,9 @@ class IkeaScraper:
     async def close(self):
         """리소스 정리"""
         await self._close_browser()
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
 
 
 IKEA_SEARCH_KEYWORDS = [
@@ -308,6 +477,73 @@ IKEA_CATEGORIES = [
 ]
 
 
+async def _run_on_pages(scraper: IkeaScraper, jobs: list, concurrency: int) -> list:
+    """
+    (수집 함수, 인자) 작업들을 페이지 concurrency개로 동시에 실행
+    - 작업마다 큐에서 빈 페이지를 꺼내 쓰고 돌려놓음 (페이지 수 = 동시 실행 수)
+    """
+    pages: asyncio.Queue = asyncio.Queue()
+    for page in await scraper.open_pages(max(1, min(concurrency, len(jobs)))):
+        pages.put_nowait(page)
+
+    async def run(fetch, arg):
+        page = await pages.get()
+        try:
+            return await fetch(arg, page=page)
+        finally:
+            pages.put_nowait(page)
+
+    return await asyncio.gather(*(run(fetch, arg) for fetch, arg in jobs))
+
+
+async def _search_all(scraper: IkeaScraper, queries: List[str], limit: int,
+                      concurrency: int, extra_jobs: list = ()) -> Dict[str, List[IkeaProduct]]:
+    """
+    검색어들을 검색 API로 한꺼번에 조회하고, 결과가 없는 검색어만 extra_jobs와 함께 브라우저로 수집
+    - 브라우저 작업이 없으면 브라우저를 띄우지 않음
+    """
+    results = dict(zip(queries, await asyncio.gather(*(scraper._search_api(q, limit) for q in queries))))
+
+    search = functools.partial(scraper._search_with_browser, limit=limit)
+    jobs = [(search, query) for query in queries if not results[query]] + list(extra_jobs)
+    if jobs:
+        results.update(zip((arg for _, arg in jobs), await _run_on_pages(scraper, jobs, concurrency)))
+    return results
+
+
+async def run_queries(queries: List[str], limit: int = 20, concurrency: int = 8,
+                      headless: bool = True) -> Dict[str, List[IkeaProduct]]:
+    """
+    여러 키워드를 동시에 검색 (검색 API 우선, 결과가 없는 키워드만 브라우저 페이지 concurrency개로)
+
+    Returns:
+        {검색어: 상품 목록}
+    """
+    scraper = IkeaScraper(headless=headless)
+    try:
+        results = await _search_all(scraper, queries, limit, concurrency)
+    finally:
+        await scraper.close()
+
+    return {query: results[query] for query in queries}
+
+
+async def crawl_all(concurrency: int = 6, headless: bool = True) -> Dict[str, List[IkeaProduct]]:
+    """
+    IKEA_SEARCH_KEYWORDS 검색 + IKEA_CATEGORIES 수집을 한꺼번에 동시 실행
+    (카테고리 목록은 검색 API가 없으므로 브라우저로 수집)
+
+    Returns:
+        {검색어 또는 카테고리 경로: 상품 목록}
+    """
+    scraper = IkeaScraper(headless=headless)
+    category_jobs = [(scraper.get_category_products, path) for path in IKEA_CATEGORIES]
+    try:
+        return await _search_all(scraper, IKEA_SEARCH_KEYWORDS, 20, concurrency, category_jobs)
+    finally:
+        await scraper.close()
+
+
 async def main():
     """테스트"""
     print("=== 이케아 스크래퍼 테스트 ===\n")
@@ -3,435 +3,477 @@
 - 가격 미정 상품에 가격 추가
 - 새로운 인기 상품 추가
 """
+import gzip
 import json
 import urllib.request
+from collections import Counter
 from datetime import datetime
 
+# 응답을 받는 대로 상품 단위로 파싱 (없으면 json 모듈로 전체 로드)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+PRODUCTS_URL = 'https://notam-korea-data.s3.ap-southeast-2.amazonaws.com/shopping-helper/json/products_latest.json'
+
+
+def load_products(url: str = PRODUCTS_URL) -> list:
+    """S3 상품 JSON의 products 배열 (원본 바이트/최상위 dict 전체를 메모리에 올리지 않음)"""
+    request = urllib.request.Request(url, headers={'Accept-Encoding': 'gzip'})
+    with urllib.request.urlopen(request) as response:
+        # 서버가 gzip으로 보내면 받는 대로 풀어서 읽음 (스트리밍 파싱 유지)
+        body = gzip.GzipFile(fileobj=response) if response.headers.get('Content-Encoding') == 'gzip' else response
+        if IJSON_AVAILABLE:
+            return list(ijson.items(body, 'products.item', use_float=True))
+        return _json_loads(body.read()).get('products', [])
+
+
+def save_json(obj, path: str):
+    """JSON 파일 저장 (orjson이 있으면 C 구현으로 직렬화, 한글은 그대로)"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+# 가격 미정인 상품에 넣을 가격 (상품명 -> 가격)
+PRICE_UPDATES = {
+    '미니 세탁기 장난감': 5000,
+    '미니 정수기 장난감': 5000,
+    '미니 청소기 장난감': 5000,
+    '미니 믹서기 장난감': 5000,
+    '미니 다리미 장난감': 5000,
+    '미니 핸드믹서 장난감': 5000,
+    '수저받침': 1000,
+    '나무쟁반': 3000,
+    '소스볼': 1000,
+    '수저세트': 2000,
+    '포파칩 솔트맛': 2500,
+    '포파칩 토마토&후추맛': 2500,
+    '개인 정보 지우개': 1500,
+    '공중부양 양념통 정리대': 29900,
+}
+
+# 추가 인기 상품 데이터 (모듈 로드 시 한 번만 생성, 추가할 때는 복사본 사용)
+NEW_PRODUCTS = (
+    # 다이소 인기 상품 추가
+    {
+        "id": 1001,
+        "name": "스테인리스 배수구망",
+        "official_name": "스테인리스 싱크대 배수구망",
+        "official_code": "1028456",
+        "official_price": 2000,
+        "price": 2000,
+        "category": "주방",
+        "store_key": "daiso",
+        "store_name": "다이소",
+        "reason": "물때가 안 끼고 위생적이라 인기 폭발. 스텐 재질이라 반영구적으로 사용 가능.",
+        "source_view_count": 85000,
+        "channel_title": "살림설렘",
+        "video_id": "dAiso_001",
+        "timestamp": 120,
+        "is_approved": True,
+        "keywords": ["배수구", "스텐", "주방"]
+    },
+    {
+        "id": 1002,
+        "name": "냉장고 정리 트레이",
+        "official_name": "클리어 냉장고 정리 트레이 대형",
+        "official_code": "1045678",
+        "official_price": 3000,
+        "price": 3000,
+        "category": "주방",
+        "store_key": "daiso",
+        "store_name": "다이소",
+        "reason": "냉장고 수납 공간을 두 배로 활용할 수 있어서 정리왕들의 필수템.",
+        "source_view_count": 72000,
+        "channel_title": "정리정돈",
+        "video_id": "dAiso_002",
+        "timestamp": 85,
+        "is_approved": True,
+        "keywords": ["냉장고", "정리", "수납"]
+    },
+    {
+        "id": 1003,
+        "name": "실리콘 조리도구 세트",
+        "official_name": "실리콘 조리도구 4종 세트",
+        "official_code": "1056789",
+        "official_price": 5000,
+        "price": 5000,
+        "category": "주방",
+        "store_key": "daiso",
+        "store_name": "다이소",
+        "reason": "코팅팬을 긁지 않고 열에 강해서 안전. 디자인도 예쁨.",
+        "source_view_count": 68000,
+        "channel_title": "오늘홈템",
+        "video_id": "dAiso_003",
+        "timestamp": 200,
+        "is_approved": True,
+        "keywords": ["실리콘", "조리도구", "주방"]
+    },
+    {
+        "id": 1004,
+        "name": "마그네틱 칼꽂이",
+        "official_name": "자석 부착식 칼꽂이 30cm",
+        "official_code": "1034567",
+        "official_price": 5000,
+        "price": 5000,
+        "category": "주방",
+        "store_key": "daiso",
+        "store_name": "다이소",
+        "reason": "벽에 붙여서 칼을 수납할 수 있어 공간 절약. 위생적인 칼 보관 가능.",
+        "source_view_count": 55000,
+        "channel_title": "살림코코",
+        "video_id": "dAiso_004",
+        "timestamp": 150,
+        "is_approved": True,
+        "keywords": ["칼꽂이", "자석", "주방"]
+    },
+    {
+        "id": 1005,
+        "name": "접이식 빨래건조대",
+        "official_name": "미니 접이식 빨래건조대",
+        "official_code": "1067890",
+        "official_price": 5000,
+        "price": 5000,
+        "category": "생활",
+        "store_key": "daiso",
+        "store_name": "다이소",
+        "reason": "1인 가구에 딱 맞는 사이즈. 접으면 틈새에 수납 가능.",
+        "source_view_count": 48000,
+        "channel_title": "1인가구",
+        "video_id": "dAiso_005",
+        "timestamp": 180,
+        "is_approved": True,
+        "keywords": ["빨래건조대", "접이식", "1인가구"]
+    },
+    {
+        "id": 1006,
+        "name": "욕실 흡착 선반",
+        "official_name": "욕실 흡착 코너 선반",
+        "official_code": "1078901",
+        "official_price": 3000,
+        "price": 3000,
+        "category": "욕실",
+        "store_key": "daiso",
+        "store_name": "다이소",
+        "reason": "뚫지 않고 강력 흡착으로 고정. 샴푸, 비누 정리에 딱.",
+        "source_view_count": 52000,
+        "channel_title": "욕실정리",
+        "video_id": "dAiso_006",
+        "is_approved": True,
+        "keywords": ["욕실", "흡착", "선반"]
+    },
+    {
+        "id": 1007,
+        "name": "멀티 케이블 정리함",
+        "official_name": "멀티탭 케이블 정리함",
+        "official_code": "1089012",
+        "official_price": 3000,
+        "price": 3000,
+        "category": "생활",
+        "store_key": "daiso",
+        "store_name": "다이소",
+        "reason": "지저분한 멀티탭과 케이블을 깔끔하게 숨겨줌. 화재 예방에도 좋음.",
+        "source_view_count": 47000,
+        "channel_title": "정리의달인",
+        "video_id": "dAiso_007",
+        "is_approved": True,
+        "keywords": ["케이블", "정리", "멀티탭"]
+    },
+    {
+        "id": 1008,
+        "name": "휴대용 미니 선풍기",
+        "official_name": "USB 충전식 미니 선풍기",
+        "official_code": "1090123",
+        "official_price": 5000,
+        "price": 5000,
+        "category": "생활",
+        "store_key": "daiso",
+        "store_name": "다이소",
+        "reason": "가볍고 바람 세기 좋음. 충전식이라 어디서든 사용 가능.",
+        "source_view_count": 61000,
+        "channel_title": "여름필수템",
+        "video_id": "dAiso_008",
+        "is_approved": True,
+        "keywords": ["선풍기", "휴대용", "USB"]
+    },
+
+    # 코스트코 인기 상품 추가
+    {
+        "id": 2001,
+        "name": "커클랜드 마카다미아",
+        "official_name": "커클랜드 유기농 마카다미아 680g",
+        "official_price": 24990,
+        "price": 24990,
+        "category": "식품",
+        "store_key": "costco",
+        "store_name": "코스트코",
+        "reason": "고소하고 크런치한 식감이 일품. 간식으로 최고.",
+        "source_view_count": 45000,
+        "channel_title": "코스트코매니아",
+        "video_id": "costco_001",
+        "is_approved": True,
+        "keywords": ["마카다미아", "견과류", "간식"]
+    },
+    {
+        "id": 2002,
+        "name": "에그타르트",
+        "official_name": "코스트코 에그타르트 12개입",
+        "official_price": 12990,
+        "price": 12990,
+        "category": "식품",
+        "store_key": "costco",
+        "store_name": "코스트코",
+        "reason": "바삭한 페이스트리와 부드러운 커스터드의 조화. 에어프라이어에 데우면 더 맛있음.",
+        "source_view_count": 62000,
+        "channel_title": "코스트코꿀템",
+        "video_id": "costco_002",
+        "is_approved": True,
+        "keywords": ["에그타르트", "베이커리", "디저트"]
+    },
+    {
+        "id": 2003,
+        "name": "프라임 등심 스테이크",
+        "official_name": "코스트코 프라임 등심 스테이크 1kg",
+        "official_price": 49900,
+        "price": 49900,
+        "category": "식품",
+        "store_key": "costco",
+        "store_name": "코스트코",
+        "reason": "마블링이 좋아서 집에서도 레스토랑급 스테이크를 즐길 수 있음.",
+        "source_view_count": 58000,
+        "channel_title": "고기러버",
+        "video_id": "costco_003",
+        "is_approved": True,
+        "keywords": ["스테이크", "등심", "프라임"]
+    },
+    {
+        "id": 2004,
+        "name": "커클랜드 피넛버터",
+        "official_name": "커클랜드 유기농 피넛버터 794g x 2",
+        "official_price": 17990,
+        "price": 17990,
+        "category": "식품",
+        "store_key": "costco",
+        "store_name": "코스트코",
+        "reason": "첨가물 없이 땅콩만으로 만들어서 건강함. 샌드위치, 스무디에 활용도 높음.",
+        "source_view_count": 41000,
+        "channel_title": "건강한식탁",
+        "video_id": "costco_004",
+        "is_approved": True,
+        "keywords": ["피넛버터", "땅콩버터", "유기농"]
+    },
+    {
+        "id": 2005,
+        "name": "르크루제 법랑냄비",
+        "official_name": "르크루제 법랑 무쇠냄비 24cm",
+        "official_price": 299900,
+        "price": 299900,
+        "category": "주방",
+        "store_key": "costco",
+        "store_name": "코스트코",
+        "reason": "백화점보다 10만원 이상 저렴. 평생 쓸 수 있는 고급 냄비.",
+        "source_view_count": 53000,
+        "channel_title": "주방용품추천",
+        "video_id": "costco_005",
+        "is_approved": True,
+        "keywords": ["르크루제", "냄비", "법랑"]
+    },
+    {
+        "id": 2006,
+        "name": "다우니 섬유유연제",
+        "official_name": "다우니 프리미엄 섬유유연제 5L x 2",
+        "official_price": 29990,
+        "price": 29990,
+        "category": "생활",
+        "store_key": "costco",
+        "store_name": "코스트코",
+        "reason": "대용량이라 1년은 쓸 수 있음. 향이 오래 지속됨.",
+        "source_view_count": 44000,
+        "channel_title": "생활용품추천",
+        "video_id": "costco_006",
+        "is_approved": True,
+        "keywords": ["섬유유연제", "다우니", "대용량"]
+    },
+
+    # 이케아 인기 상품 추가
+    {
+        "id": 3001,
+        "name": "KUNGSFORS 쿵스포르스 레일",
+        "official_name": "KUNGSFORS 쿵스포르스 레일 56cm",
+        "official_price": 15900,
+        "price": 15900,
+        "category": "주방",
+        "store_key": "ikea",
+        "store_name": "이케아",
+        "reason": "주방 벽면을 활용해서 조리도구를 걸 수 있음. 공간 효율 극대화.",
+        "source_view_count": 38000,
+        "channel_title": "이케아투어",
+        "video_id": "ikea_001",
+        "is_approved": True,
+        "keywords": ["레일", "주방수납", "벽걸이"]
+    },
+    {
+        "id": 3002,
+        "name": "LERHAMN 레르함 테이블",
+        "official_name": "LERHAMN 레르함 테이블 74x74cm",
+        "official_price": 79900,
+        "price": 79900,
+        "category": "가구",
+        "store_key": "ikea",
+        "store_name": "이케아",
+        "reason": "원목 느낌이 나면서 가격대비 품질 좋음. 2인 가정에 적합한 사이즈.",
+        "source_view_count": 35000,
+        "channel_title": "인테리어꿀팁",
+        "video_id": "ikea_002",
+        "is_approved": True,
+        "keywords": ["테이블", "식탁", "원목"]
+    },
+    {
+        "id": 3003,
+        "name": "BESTA 베스토 TV장식장",
+        "official_name": "BESTA 베스토 TV장식장 콤비네이션",
+        "official_price": 149900,
+        "price": 149900,
+        "category": "가구",
+        "store_key": "ikea",
+        "store_name": "이케아",
+        "reason": "깔끔한 디자인에 수납공간도 넉넉함. 거실 분위기 업그레이드에 딱.",
+        "source_view_count": 42000,
+        "channel_title": "홈인테리어",
+        "video_id": "ikea_003",
+        "is_approved": True,
+        "keywords": ["TV장식장", "거실", "수납"]
+    },
+    {
+        "id": 3004,
+        "name": "HEMNES 헴네스 서랍장",
+        "official_name": "HEMNES 헴네스 서랍장 6칸",
+        "official_price": 249900,
+        "price": 249900,
+        "category": "가구",
+        "store_key": "ikea",
+        "store_name": "이케아",
+        "reason": "클래식한 디자인으로 침실에 어울림. 수납력 최고.",
+        "source_view_count": 39000,
+        "channel_title": "침실인테리어",
+        "video_id": "ikea_004",
+        "is_approved": True,
+        "keywords": ["서랍장", "침실", "수납"]
+    },
+    {
+        "id": 3005,
+        "name": "DROMMAR 드뢰마르 냄비세트",
+        "official_name": "DROMMAR 드뢰마르 냄비세트 5종",
+        "official_price": 89900,
+        "price": 89900,
+        "category": "주방",
+        "store_key": "ikea",
+        "store_name": "이케아",
+        "reason": "인덕션 호환되고 열전도 좋음. 세트 구성이 실용적.",
+        "source_view_count": 33000,
+        "channel_title": "주방용품리뷰",
+        "video_id": "ikea_005",
+        "is_approved": True,
+        "keywords": ["냄비세트", "인덕션", "주방"]
+    },
+    {
+        "id": 3006,
+        "name": "GODMORGON 고드모르곤 세면대",
+        "official_name": "GODMORGON 고드모르곤 세면대장 80cm",
+        "official_price": 179900,
+        "price": 179900,
+        "category": "욕실",
+        "store_key": "ikea",
+        "store_name": "이케아",
+        "reason": "깔끔한 디자인에 수납공간 충분. 욕실 리모델링 필수템.",
+        "source_view_count": 31000,
+        "channel_title": "욕실리모델링",
+        "video_id": "ikea_006",
+        "is_approved": True,
+        "keywords": ["세면대", "욕실", "수납"]
+    },
+    {
+        "id": 3007,
+        "name": "MALM 말름 침대프레임",
+        "official_name": "MALM 말름 침대프레임 퀸사이즈",
+        "official_price": 199900,
+        "price": 199900,
+        "category": "가구",
+        "store_key": "ikea",
+        "store_name": "이케아",
+        "reason": "심플하고 모던한 디자인. 수납서랍 추가 가능해서 공간 활용도 높음.",
+        "source_view_count": 48000,
+        "channel_title": "침실꾸미기",
+        "video_id": "ikea_007",
+        "is_approved": True,
+        "keywords": ["침대", "말름", "퀸사이즈"]
+    },
+)
+
+
 def main():
     # S3에서 현재 데이터 가져오기
-    url = 'https://notam-korea-data.s3.ap-southeast-2.amazonaws.com/shopping-helper/json/products_latest.json'
-    with urllib.request.urlopen(url) as response:
-        data = json.load(response)
-        products = data.get('products', [])
+    products = load_products()
 
     print(f"현재 상품: {len(products)}개")
 
-    # 가격 미정인 상품에 가격 추가
-    price_updates = {
-        '미니 세탁기 장난감': 5000,
-        '미니 정수기 장난감': 5000,
-        '미니 청소기 장난감': 5000,
-        '미니 믹서기 장난감': 5000,
-        '미니 다리미 장난감': 5000,
-        '미니 핸드믹서 장난감': 5000,
-        '수저받침': 1000,
-        '나무쟁반': 3000,
-        '소스볼': 1000,
-        '수저세트': 2000,
-        '포파칩 솔트맛': 2500,
-        '포파칩 토마토&후추맛': 2500,
-        '개인 정보 지우개': 1500,
-        '공중부양 양념통 정리대': 29900,
-    }
-
+    # 가격 추가와 매장별 집계를 한 번의 순회로
     updated = 0
+    store_counts = Counter()
     for p in products:
-        name = p.get('name', '')
-        if name in price_updates and not p.get('official_price') and not p.get('price'):
-            p['official_price'] = price_updates[name]
-            p['price'] = price_updates[name]
+        store_counts[p.get('store_key')] += 1
+        new_price = PRICE_UPDATES.get(p.get('name', ''))
+        if new_price and not p.get('official_price') and not p.get('price'):
+            p['official_price'] = new_price
+            p['price'] = new_price
             updated += 1
-            print(f"  가격 추가: {name} -> {price_updates[name]}원")
+            print(f"  가격 추가: {p['name']} -> {new_price}원")
 
     print(f"\n{updated}개 상품 가격 업데이트")
 
-    # 추가 인기 상품 데이터
-    new_products = [
-        # 다이소 인기 상품 추가
-        {
-            "id": 1001,
-            "name": "스테인리스 배수구망",
-            "official_name": "스테인리스 싱크대 배수구망",
-            "official_code": "1028456",
-            "official_price": 2000,
-            "price": 2000,
-            "category": "주방",
-            "store_key": "daiso",
-            "store_name": "다이소",
-            "reason": "물때가 안 끼고 위생적이라 인기 폭발. 스텐 재질이라 반영구적으로 사용 가능.",
-            "source_view_count": 85000,
-            "channel_title": "살림설렘",
-            "video_id": "dAiso_001",
-            "timestamp": 120,
-            "is_approved": True,
-            "keywords": ["배수구", "스텐", "주방"]
-        },
-        {
-            "id": 1002,
-            "name": "냉장고 정리 트레이",
-            "official_name": "클리어 냉장고 정리 트레이 대형",
-            "official_code": "1045678",
-            "official_price": 3000,
-            "price": 3000,
-            "category": "주방",
-            "store_key": "daiso",
-            "store_name": "다이소",
-            "reason": "냉장고 수납 공간을 두 배로 활용할 수 있어서 정리왕들의 필수템.",
-            "source_view_count": 72000,
-            "channel_title": "정리정돈",
-            "video_id": "dAiso_002",
-            "timestamp": 85,
-            "is_approved": True,
-            "keywords": ["냉장고", "정리", "수납"]
-        },
-        {
-            "id": 1003,
-            "name": "실리콘 조리도구 세트",
-            "official_name": "실리콘 조리도구 4종 세트",
-            "official_code": "1056789",
-            "official_price": 5000,
-            "price": 5000,
-            "category": "주방",
-            "store_key": "daiso",
-            "store_name": "다이소",
-            "reason": "코팅팬을 긁지 않고 열에 강해서 안전. 디자인도 예쁨.",
-            "source_view_count": 68000,
-            "channel_title": "오늘홈템",
-            "video_id": "dAiso_003",
-            "timestamp": 200,
-            "is_approved": True,
-            "keywords": ["실리콘", "조리도구", "주방"]
-        },
-        {
-            "id": 1004,
-            "name": "마그네틱 칼꽂이",
-            "official_name": "자석 부착식 칼꽂이 30cm",
-            "official_code": "1034567",
-            "official_price": 5000,
-            "price": 5000,
-            "category": "주방",
-            "store_key": "daiso",
-            "store_name": "다이소",
-            "reason": "벽에 붙여서 칼을 수납할 수 있어 공간 절약. 위생적인 칼 보관 가능.",
-            "source_view_count": 55000,
-            "channel_title": "살림코코",
-            "video_id": "dAiso_004",
-            "timestamp": 150,
-            "is_approved": True,
-            "keywords": ["칼꽂이", "자석", "주방"]
-        },
-        {
-            "id": 1005,
-            "name": "접이식 빨래건조대",
-            "official_name": "미니 접이식 빨래건조대",
-            "official_code": "1067890",
-            "official_price": 5000,
-            "price": 5000,
-            "category": "생활",
-            "store_key": "daiso",
-            "store_name": "다이소",
-            "reason": "1인 가구에 딱 맞는 사이즈. 접으면 틈새에 수납 가능.",
-            "source_view_count": 48000,
-            "channel_title": "1인가구",
-            "video_id": "dAiso_005",
-            "timestamp": 180,
-            "is_approved": True,
-            "keywords": ["빨래건조대", "접이식", "1인가구"]
-        },
-        {
-            "id": 1006,
-            "name": "욕실 흡착 선반",
-            "official_name": "욕실 흡착 코너 선반",
-            "official_code": "1078901",
-            "official_price": 3000,
-            "price": 3000,
-            "category": "욕실",
-            "store_key": "daiso",
-            "store_name": "다이소",
-            "reason": "뚫지 않고 강력 흡착으로 고정. 샴푸, 비누 정리에 딱.",
-            "source_view_count": 52000,
-            "channel_title": "욕실정리",
-            "video_id": "dAiso_006",
-            "is_approved": True,
-            "keywords": ["욕실", "흡착", "선반"]
-        },
-        {
-            "id": 1007,
-            "name": "멀티 케이블 정리함",
-            "official_name": "멀티탭 케이블 정리함",
-            "official_code": "1089012",
-            "official_price": 3000,
-            "price": 3000,
-            "category": "생활",
-            "store_key": "daiso",
-            "store_name": "다이소",
-            "reason": "지저분한 멀티탭과 케이블을 깔끔하게 숨겨줌. 화재 예방에도 좋음.",
-            "source_view_count": 47000,
-            "channel_title": "정리의달인",
-            "video_id": "dAiso_007",
-            "is_approved": True,
-            "keywords": ["케이블", "정리", "멀티탭"]
-        },
-        {
-            "id": 1008,
-            "name": "휴대용 미니 선풍기",
-            "official_name": "USB 충전식 미니 선풍기",
-            "official_code": "1090123",
-            "official_price": 5000,
-            "price": 5000,
-            "category": "생활",
-            "store_key": "daiso",
-            "store_name": "다이소",
-            "reason": "가볍고 바람 세기 좋음. 충전식이라 어디서든 사용 가능.",
-            "source_view_count": 61000,
-            "channel_title": "여름필수템",
-            "video_id": "dAiso_008",
-            "is_approved": True,
-            "keywords": ["선풍기", "휴대용", "USB"]
-        },
-
-        # 코스트코 인기 상품 추가
-        {
-            "id": 2001,
-            "name": "커클랜드 마카다미아",
-            "official_name": "커클랜드 유기농 마카다미아 680g",
-            "official_price": 24990,
-            "price": 24990,
-            "category": "식품",
-            "store_key": "costco",
-            "store_name": "코스트코",
-            "reason": "고소하고 크런치한 식감이 일품. 간식으로 최고.",
-            "source_view_count": 45000,
-            "channel_title": "코스트코매니아",
-            "video_id": "costco_001",
-            "is_approved": True,
-            "keywords": ["마카다미아", "견과류", "간식"]
-        },
-        {
-            "id": 2002,
-            "name": "에그타르트",
-            "official_name": "코스트코 에그타르트 12개입",
-            "official_price": 12990,
-            "price": 12990,
-            "category": "식품",
-            "store_key": "costco",
-            "store_name": "코스트코",
-            "reason": "바삭한 페이스트리와 부드러운 커스터드의 조화. 에어프라이어에 데우면 더 맛있음.",
-            "source_view_count": 62000,
-            "channel_title": "코스트코꿀템",
-            "video_id": "costco_002",
-            "is_approved": True,
-            "keywords": ["에그타르트", "베이커리", "디저트"]
-        },
-        {
-            "id": 2003,
-            "name": "프라임 등심 스테이크",
-            "official_name": "코스트코 프라임 등심 스테이크 1kg",
-            "official_price": 49900,
-            "price": 49900,
-            "category": "식품",
-            "store_key": "costco",
-            "store_name": "코스트코",
-            "reason": "마블링이 좋아서 집에서도 레스토랑급 스테이크를 즐길 수 있음.",
-            "source_view_count": 58000,
-            "channel_title": "고기러버",
-            "video_id": "costco_003",
-            "is_approved": True,
-            "keywords": ["스테이크", "등심", "프라임"]
-        },
-        {
-            "id": 2004,
-            "name": "커클랜드 피넛버터",
-            "official_name": "커클랜드 유기농 피넛버터 794g x 2",
-            "official_price": 17990,
-            "price": 17990,
-            "category": "식품",
-            "store_key": "costco",
-            "store_name": "코스트코",
-            "reason": "첨가물 없이 땅콩만으로 만들어서 건강함. 샌드위치, 스무디에 활용도 높음.",
-            "source_view_count": 41000,
-            "channel_title": "건강한식탁",
-            "video_id": "costco_004",
-            "is_approved": True,
-            "keywords": ["피넛버터", "땅콩버터", "유기농"]
-        },
-        {
-            "id": 2005,
-            "name": "르크루제 법랑냄비",
-            "official_name": "르크루제 법랑 무쇠냄비 24cm",
-            "official_price": 299900,
-            "price": 299900,
-            "category": "주방",
-            "store_key": "costco",
-            "store_name": "코스트코",
-            "reason": "백화점보다 10만원 이상 저렴. 평생 쓸 수 있는 고급 냄비.",
-            "source_view_count": 53000,
-            "channel_title": "주방용품추천",
-            "video_id": "costco_005",
-            "is_approved": True,
-            "keywords": ["르크루제", "냄비", "법랑"]
-        },
-        {
-            "id": 2006,
-            "name": "다우니 섬유유연제",
-            "official_name": "다우니 프리미엄 섬유유연제 5L x 2",
-            "official_price": 29990,
-            "price": 29990,
-            "category": "생활",
-            "store_key": "costco",
-            "store_name": "코스트코",
-            "reason": "대용량이라 1년은 쓸 수 있음. 향이 오래 지속됨.",
-            "source_view_count": 44000,
-            "channel_title": "생활용품추천",
-            "video_id": "costco_006",
-            "is_approved": True,
-            "keywords": ["섬유유연제", "다우니", "대용량"]
-        },
-
-        # 이케아 인기 상품 추가
-        {
-            "id": 3001,
-            "name": "KUNGSFORS 쿵스포르스 레일",
-            "official_name": "KUNGSFORS 쿵스포르스 레일 56cm",
-            "official_price": 15900,
-            "price": 15900,
-            "category": "주방",
-            "store_key": "ikea",
-            "store_name": "이케아",
-            "reason": "주방 벽면을 활용해서 조리도구를 걸 수 있음. 공간 효율 극대화.",
-            "source_view_count": 38000,
-            "channel_title": "이케아투어",
-            "video_id": "ikea_001",
-            "is_approved": True,
-            "keywords": ["레일", "주방수납", "벽걸이"]
-        },
-        {
-            "id": 3002,
-            "name": "LERHAMN 레르함 테이블",
-            "official_name": "LERHAMN 레르함 테이블 74x74cm",
-            "official_price": 79900,
-            "price": 79900,
-            "category": "가구",
-            "store_key": "ikea",
-            "store_name": "이케아",
-            "reason": "원목 느낌이 나면서 가격대비 품질 좋음. 2인 가정에 적합한 사이즈.",
-            "source_view_count": 35000,
-            "channel_title": "인테리어꿀팁",
-            "video_id": "ikea_002",
-            "is_approved": True,
-            "keywords": ["테이블", "식탁", "원목"]
-        },
-        {
-            "id": 3003,
-            "name": "BESTA 베스토 TV장식장",
-            "official_name": "BESTA 베스토 TV장식장 콤비네이션",
-            "official_price": 149900,
-            "price": 149900,
-            "category": "가구",
-            "store_key": "ikea",
-            "store_name": "이케아",
-            "reason": "깔끔한 디자인에 수납공간도 넉넉함. 거실 분위기 업그레이드에 딱.",
-            "source_view_count": 42000,
-            "channel_title": "홈인테리어",
-            "video_id": "ikea_003",
-            "is_approved": True,
-            "keywords": ["TV장식장", "거실", "수납"]
-        },
-        {
-            "id": 3004,
-            "name": "HEMNES 헴네스 서랍장",
-            "official_name": "HEMNES 헴네스 서랍장 6칸",
-            "official_price": 249900,
-            "price": 249900,
-            "category": "가구",
-            "store_key": "ikea",
-            "store_name": "이케아",
-            "reason": "클래식한 디자인으로 침실에 어울림. 수납력 최고.",
-            "source_view_count": 39000,
-            "channel_title": "침실인테리어",
-            "video_id": "ikea_004",
-            "is_approved": True,
-            "keywords": ["서랍장", "침실", "수납"]
-        },
-        {
-            "id": 3005,
-            "name": "DROMMAR 드뢰마르 냄비세트",
-            "official_name": "DROMMAR 드뢰마르 냄비세트 5종",
-            "official_price": 89900,
-            "price": 89900,
-            "category": "주방",
-            "store_key": "ikea",
-            "store_name": "이케아",
-            "reason": "인덕션 호환되고 열전도 좋음. 세트 구성이 실용적.",
-            "source_view_count": 33000,
-            "channel_title": "주방용품리뷰",
-            "video_id": "ikea_005",
-            "is_approved": True,
-            "keywords": ["냄비세트", "인덕션", "주방"]
-        },
-        {
-            "id": 3006,
-            "name": "GODMORGON 고드모르곤 세면대",
-            "official_name": "GODMORGON 고드모르곤 세면대장 80cm",
-            "official_price": 179900,
-            "price": 179900,
-            "category": "욕실",
-            "store_key": "ikea",
-            "store_name": "이케아",
-            "reason": "깔끔한 디자인에 수납공간 충분. 욕실 리모델링 필수템.",
-            "source_view_count": 31000,
-            "channel_title": "욕실리모델링",
-            "video_id": "ikea_006",
-            "is_approved": True,
-            "keywords": ["세면대", "욕실", "수납"]
-        },
-        {
-            "id": 3007,
-            "name": "MALM 말름 침대프레임",
-            "official_name": "MALM 말름 침대프레임 퀸사이즈",
-            "official_price": 199900,
-            "price": 199900,
-            "category": "가구",
-            "store_key": "ikea",
-            "store_name": "이케아",
-            "reason": "심플하고 모던한 디자인. 수납서랍 추가 가능해서 공간 활용도 높음.",
-            "source_view_count": 48000,
-            "channel_title": "침실꾸미기",
-            "video_id": "ikea_007",
-            "is_approved": True,
-            "keywords": ["침대", "말름", "퀸사이즈"]
-        },
-    ]
-
     # 기존 ID와 중복 체크
     existing_ids = {p.get('id') for p in products}
-    added = 0
-    for np in new_products:
-        if np['id'] not in existing_ids:
-            products.append(np)
-            added += 1
-            print(f"  추가: {np['name']} ({np['store_key']})")
+    to_add = [dict(np) for np in NEW_PRODUCTS if np['id'] not in existing_ids]
+    products.extend(to_add)
+    store_counts.update(np['store_key'] for np in to_add)
+    for np in to_add:
+        print(f"  추가: {np['name']} ({np['store_key']})")
 
+    added = len(to_add)
     print(f"\n{added}개 상품 추가")
     print(f"최종 상품: {len(products)}개")
 
-    # 파일 저장
+    # 파일 저장 (통계는 위에서 모은 store_counts 사용, 상품 목록을 다시 훑지 않음)
+    stats = {
+        "total": len(products),
+        "daiso": store_counts['daiso'],
+        "costco": store_counts['costco'],
+        "ikea": store_counts['ikea']
+    }
     output = {
         "products": products,
         "updated_at": datetime.now().isoformat(),
-        "stats": {
-            "total": len(products),
-            "daiso": len([p for p in products if p.get('store_key') == 'daiso']),
-            "costco": len([p for p in products if p.get('store_key') == 'costco']),
-            "ikea": len([p for p in products if p.get('store_key') == 'ikea'])
-        }
+        "stats": stats
     }
 
-    with open('improved_products.json', 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    save_json(output, 'improved_products.json')
 
     print(f"\nimproved_products.json 저장 완료")
-    print(f"통계: 다이소 {output['stats']['daiso']}, 코스트코 {output['stats']['costco']}, 이케아 {output['stats']['ikea']}")
+    print(f"통계: 다이소 {stats['daiso']}, 코스트코 {stats['costco']}, 이케아 {stats['ikea']}")
 
     return output
 
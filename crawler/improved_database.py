@@ -8,6 +8,7 @@
 """
 import sqlite3
 import json
+from itertools import chain
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -19,6 +20,17 @@ except ImportError:
     DB_PATH = DATA_DIR / "products.db"
 
 
+# 연결마다 적용할 SQLite 설정 (완화된 fsync, 메모리 캐시, 잠금 대기)
+# WAL은 파일 DB에만 적용 (:memory:는 저널 모드 변경 불가)
+SQLITE_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=5000;
+    PRAGMA mmap_size=268435456;
+"""
+
+
 # 카탈로그 테이블 설정 (제너릭 insert를 위한 매핑)
 CATALOG_CONFIG: Dict[str, Dict[str, Any]] = {
     "daiso": {
@@ -85,6 +97,12 @@ CATALOG_CONFIG: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# 값이 없을 때 빈 문자열 대신 NULL로 저장하는 숫자 컬럼
+NULLABLE_CATALOG_COLUMNS = frozenset({"price", "original_price", "rating", "review_count"})
+
+# 한 문장에 바인딩할 파라미터 수 상한 (구버전 SQLite 기본값 999 기준, 다중 행 INSERT 청크 크기 계산용)
+SQLITE_MAX_VARIABLES = 999
+
 # 허용된 테이블 이름 목록 (SQL Injection 방지)
 ALLOWED_TABLES = frozenset(config['table'] for config in CATALOG_CONFIG.values())
 
@@ -104,15 +122,19 @@ class ImprovedDatabase:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.conn = None
+        self._catalog_upserts: Dict[str, tuple] = {}
         self._connect()
         self._create_tables()
         self._migrate_existing_tables()
         self._add_unique_constraints()
 
     def _connect(self):
-        """데이터베이스 연결"""
+        """데이터베이스 연결 (WAL 및 성능 PRAGMA 적용)"""
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        if str(self.db_path) != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SQLITE_PRAGMAS)
 
     def _create_tables(self):
         """테이블 생성"""
@@ -625,37 +647,21 @@ class ImprovedDatabase:
 
     # ========== 제너릭 카탈로그 메서드 ==========
 
-    def insert_catalog_product(self, store_key: str, product: dict) -> bool:
+    def _build_catalog_upsert(self, store_key: str, rows: int = 1) -> tuple:
         """
-        제너릭 카탈로그 상품 저장 (upsert)
-
-        Args:
-            store_key: 매장 키 (daiso, costco, oliveyoung, coupang, traders, ikea, convenience)
-            product: 상품 데이터 딕셔너리
+        매장별 upsert SQL 생성 (매장/행 수 조합마다 한 번만 만들고 인스턴스에 캐시)
+        - rows > 1이면 VALUES (...), (...) 다중 행 INSERT 하나로 rows개를 저장
 
         Returns:
-            성공 여부
+            (sql, 컬럼 목록, bool 컬럼 집합)
         """
-        config = CATALOG_CONFIG.get(store_key)
-        if not config:
-            print(f"알 수 없는 매장: {store_key}")
-            return False
+        cached = self._catalog_upserts.get((store_key, rows))
+        if cached:
+            return cached
 
-        cursor = self.conn.cursor()
+        config = CATALOG_CONFIG[store_key]
         table = config["table"]
         columns = config["columns"]
-        update_columns = config["update_columns"]
-        bool_columns = config.get("bool_columns", [])
-
-        # 값 추출 및 bool 변환
-        values = []
-        for col in columns:
-            val = product.get(col, "" if col == "keywords" else None)
-            if col in bool_columns:
-                val = 1 if val else 0
-            elif val is None and col not in ["price", "original_price", "rating", "review_count"]:
-                val = ""
-            values.append(val)
 
         # ON CONFLICT 절 생성
         if config.get("composite_key"):
@@ -663,44 +669,103 @@ class ImprovedDatabase:
         else:
             conflict_cols = config["id_column"]
 
-        update_set = ", ".join([f"{col} = excluded.{col}" for col in update_columns])
+        update_set = ", ".join([f"{col} = excluded.{col}" for col in config["update_columns"]])
         update_set += ", updated_at = CURRENT_TIMESTAMP"
 
-        placeholders = ", ".join(["?"] * len(columns))
+        row_placeholders = "(" + ", ".join(["?"] * len(columns)) + ", CURRENT_TIMESTAMP)"
         columns_str = ", ".join(columns)
 
         query = f"""
             INSERT INTO {table}
             ({columns_str}, updated_at)
-            VALUES ({placeholders}, CURRENT_TIMESTAMP)
+            VALUES {", ".join([row_placeholders] * rows)}
             ON CONFLICT({conflict_cols}) DO UPDATE SET
                 {update_set}
         """
 
+        cached = (query, columns, frozenset(config.get("bool_columns", ())))
+        self._catalog_upserts[(store_key, rows)] = cached
+        return cached
+
+    @staticmethod
+    def _catalog_values(product: dict, columns: list, bool_columns: frozenset) -> tuple:
+        """상품 딕셔너리 -> upsert 값 튜플 (bool은 0/1, 숫자 외 빈 값은 빈 문자열)"""
+        values = []
+        for col in columns:
+            val = product.get(col, "" if col == "keywords" else None)
+            if col in bool_columns:
+                val = 1 if val else 0
+            elif val is None and col not in NULLABLE_CATALOG_COLUMNS:
+                val = ""
+            values.append(val)
+        return tuple(values)
+
+    def insert_catalog_product(self, store_key: str, product: dict) -> bool:
+        """
+        제너릭 카탈로그 상품 저장 (upsert)
+
+        Args:
+            store_key: 매장 키 (daiso, costco, oliveyoung, coupang, traders, ikea, convenience)
+            product: 상품 데이터 딕셔너리
+
+        Returns:
+            성공 여부
+        """
+        if store_key not in CATALOG_CONFIG:
+            print(f"알 수 없는 매장: {store_key}")
+            return False
+
+        query, columns, bool_columns = self._build_catalog_upsert(store_key)
+
         try:
-            cursor.execute(query, values)
+            self.conn.execute(query, self._catalog_values(product, columns, bool_columns))
             self.conn.commit()
             return True
         except Exception as e:
+            # 실패한 문장이 연 암묵적 트랜잭션을 닫아야 다음 배치의 BEGIN이 실패하지 않음
+            self.conn.rollback()
             print(f"{store_key} 상품 저장 오류: {e}")
             return False
 
     def insert_catalog_products_batch(self, store_key: str, products: List[dict]) -> int:
         """
-        카탈로그 상품 배치 저장
+        카탈로그 상품 배치 저장 (한 트랜잭션, 커밋은 한 번)
+        - 파라미터 상한(SQLITE_MAX_VARIABLES) 안에서 여러 행을 다중 행 INSERT 한 문장으로 저장
 
         Args:
             store_key: 매장 키
             products: 상품 리스트
 
         Returns:
-            저장된 상품 수
+            저장된 상품 수 (실패하면 전체 롤백 후 0)
         """
-        count = 0
-        for product in products:
-            if self.insert_catalog_product(store_key, product):
-                count += 1
-        return count
+        if store_key not in CATALOG_CONFIG:
+            print(f"알 수 없는 매장: {store_key}")
+            return 0
+        if not products:
+            return 0
+
+        _, columns, bool_columns = self._build_catalog_upsert(store_key)
+        rows = [self._catalog_values(product, columns, bool_columns) for product in products]
+        chunk_size = max(1, SQLITE_MAX_VARIABLES // len(columns))
+
+        # 커밋되지 않은 트랜잭션이 열려 있으면 BEGIN이 실패하므로 먼저 커밋
+        # (이 클래스의 쓰기 메서드는 각자 커밋하므로 남은 변경도 저장할 대상)
+        if self.conn.in_transaction:
+            self.conn.commit()
+
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                query = self._build_catalog_upsert(store_key, len(chunk))[0]
+                self.conn.execute(query, list(chain.from_iterable(chunk)))
+            self.conn.commit()
+            return len(rows)
+        except Exception as e:
+            self.conn.rollback()
+            print(f"{store_key} 상품 배치 저장 오류: {e}")
+            return 0
 
     def search_catalog(self, store_key: str, keyword: str, limit: int = 20) -> list:
         """
@@ -1060,8 +1125,12 @@ class ImprovedDatabase:
         }
 
     def close(self):
-        """연결 종료"""
+        """연결 종료 (닫기 전에 쿼리 플래너 통계 갱신)"""
         if self.conn:
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
             self.conn.close()
 
 
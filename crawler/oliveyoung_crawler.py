@@ -210,16 +210,14 @@ class OliveyoungCrawler:
         if not products:
             return None
 
+        # 검색어 단어 집합은 상품마다 같으므로 루프 밖에서 한 번만 계산
         query_lower = query.lower()
+        query_words = set(query_lower.split())
         best_match = None
         best_score = 0
 
         for product in products:
-            name_lower = product.name.lower()
-            brand_lower = product.brand.lower()
-            full_name = f"{brand_lower} {name_lower}"
-
-            query_words = set(query_lower.split())
+            full_name = f"{product.brand} {product.name}".lower()
             name_words = set(full_name.split())
 
             if query_words and name_words:
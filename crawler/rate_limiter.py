@@ -64,32 +64,34 @@ class RateLimiter:
         self.tokens = min(self.burst_size, self.tokens + elapsed * self.rate)
         self.last_update = now
 
-    def wait(self) -> float:
+    def _reserve(self) -> float:
         """
-        토큰 소비 대기 (동기)
+        토큰 하나 예약 (음수 허용) 후 대기해야 할 시간 반환
 
-        Returns:
-            대기 시간 (초)
+        동시에 대기하는 호출들이 같은 시점에 깨어나지 않고 rate 간격으로 순서대로 실행됨
+        (wait/wait_async 모두 같은 예약 방식이라 한 limiter를 섞어 써도 속도 유지)
         """
         with self._lock:
             self._update_tokens()
+            self.tokens -= 1
+            self.total_requests += 1
 
-            if self.tokens >= 1:
-                self.tokens -= 1
-                self.total_requests += 1
+            if self.tokens >= 0:
                 return 0.0
 
-            # 토큰 부족 - 대기 필요
-            wait_time = (1 - self.tokens) / self.rate
             self.total_waits += 1
+            return -self.tokens / self.rate
 
-        time.sleep(wait_time)
-
-        with self._lock:
-            self.tokens = 0
-            self.last_update = time.monotonic()
-            self.total_requests += 1
+    def wait(self) -> float:
+        """
+        토큰 소비 대기 (동기)
 
+        Returns:
+            대기 시간 (초)
+        """
+        wait_time = self._reserve()
+        if wait_time:
+            time.sleep(wait_time)
         return wait_time
 
     async def wait_async(self) -> float:
@@ -99,24 +101,9 @@ class RateLimiter:
         Returns:
             대기 시간 (초)
         """
-        with self._lock:
-            self._update_tokens()
-
-            if self.tokens >= 1:
-                self.tokens -= 1
-                self.total_requests += 1
-                return 0.0
-
-            wait_time = (1 - self.tokens) / self.rate
-            self.total_waits += 1
-
-        await asyncio.sleep(wait_time)
-
-        with self._lock:
-            self.tokens = 0
-            self.last_update = time.monotonic()
-            self.total_requests += 1
-
+        wait_time = self._reserve()
+        if wait_time:
+            await asyncio.sleep(wait_time)
         return wait_time
 
     def limit(self, func):
@@ -36,6 +36,9 @@ class StoreSelectors:
     # 팝업/쿠키 동의 셀렉터
     cookie_popup: str = ""
 
+    # 이벤트 타입별 탭 셀렉터 (예: {"2+1": "#tab2"})
+    event_tab: Dict[str, str] = field(default_factory=dict)
+
 
 @dataclass
 class StoreConfig:
@@ -62,6 +65,10 @@ class StoreConfig:
     # 특수 처리 플래그
     needs_main_page_first: bool = False  # 메인 페이지 먼저 방문 필요
     is_event_store: bool = False  # 편의점 등 이벤트 상품 위주
+    check_bot_block: bool = True  # 결과가 없을 때 봇 차단/캡챠 여부 확인
+
+    # 이벤트 타입별 URL 쿼리스트링 (예: {"1+1": "eventTypeCode=ONE_TO_ONE"})
+    event_url_params: Dict[str, str] = field(default_factory=dict)
 
 
 # ============================================================
@@ -228,6 +235,9 @@ DAISO_CONFIG = StoreConfig(
 
 
 # 편의점 설정 (이벤트 상품 위주)
+# 2+1 탭 셀렉터 (탭으로 이벤트를 구분하는 편의점 공통)
+EVENT_TAB_2PLUS1 = 'a[data-tab="2"], .tab_2plus1, #tab2'
+
 CU_CONFIG = StoreConfig(
     name="CU",
     code="cu",
@@ -238,6 +248,7 @@ CU_CONFIG = StoreConfig(
         name=['.name', '.prod_name', '.tit'],
         price=['.price', '.cost', '.won'],
         image=['img'],
+        event_tab={"2+1": EVENT_TAB_2PLUS1},
     ),
     page_load_delay=3.0,
     is_event_store=True,
@@ -254,6 +265,7 @@ GS25_CONFIG = StoreConfig(
         price=['.price', '.cost'],
         image=['img'],
         event_type=['.flag', '.badge', '.event_type'],
+        event_tab={"2+1": EVENT_TAB_2PLUS1},
     ),
     page_load_delay=3.0,
     is_event_store=True,
@@ -269,6 +281,7 @@ SEVENELEVEN_CONFIG = StoreConfig(
         name=['.name', '.tit_product', '.txt_product'],
         price=['.price', '.price_product'],
         image=['img'],
+        event_tab={"2+1": EVENT_TAB_2PLUS1},
     ),
     page_load_delay=3.0,
     is_event_store=True,
@@ -287,6 +300,10 @@ EMART24_CONFIG = StoreConfig(
     ),
     page_load_delay=3.0,
     is_event_store=True,
+    event_url_params={
+        "1+1": "eventTypeCode=ONE_TO_ONE",
+        "2+1": "eventTypeCode=TWO_TO_ONE",
+    },
 )
 
 
@@ -30,6 +30,25 @@ def temp_db():
         pass
 
 
+class TestConnection:
+    """연결 설정 테스트"""
+
+    def test_pragmas(self, temp_db):
+        """파일 DB는 WAL + synchronous=NORMAL + busy_timeout"""
+        conn = temp_db.conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_memory_db(self):
+        """:memory: DB도 열리고 테이블이 생성됨"""
+        db = ImprovedDatabase(":memory:")
+        try:
+            assert db.get_catalog_count("ikea") == 0
+        finally:
+            db.close()
+
+
 class TestCatalogConfig:
     """카탈로그 설정 테스트"""
 
@@ -183,6 +202,77 @@ class TestGenericCatalogMethods:
         assert count == 3
         assert temp_db.get_catalog_count("daiso") == 3
 
+    def test_batch_upsert_single_commit(self, temp_db):
+        """배치는 한 번만 커밋하고, 같은 ID는 upsert로 갱신"""
+        temp_db.insert_catalog_product("daiso", {"product_no": "001", "name": "상품1", "price": 1000})
+        statements = []
+        temp_db.conn.set_trace_callback(statements.append)
+
+        count = temp_db.insert_catalog_products_batch("daiso", [
+            {"product_no": str(i).zfill(3), "name": f"상품{i}", "price": i * 1000, "is_new": i % 2}
+            for i in range(1, 51)
+        ])
+        temp_db.conn.set_trace_callback(None)
+
+        assert count == 50
+        assert [sql for sql in statements if sql.strip().upper() == "COMMIT"] == ["COMMIT"]
+        assert temp_db.get_catalog_count("daiso") == 50
+        row = temp_db.conn.execute("SELECT price, is_new, image_url FROM daiso_catalog WHERE product_no = '001'").fetchone()
+        assert tuple(row) == (1000, 1, "")
+
+    def test_batch_multi_row_chunks(self, temp_db):
+        """파라미터 상한을 넘는 배치는 다중 행 INSERT 여러 문장으로 나눠 저장"""
+        statements = []
+        temp_db.conn.set_trace_callback(statements.append)
+
+        count = temp_db.insert_catalog_products_batch("daiso", [
+            {"product_no": str(i).zfill(4), "name": f"상품{i}", "price": i} for i in range(150)
+        ])
+        temp_db.conn.set_trace_callback(None)
+
+        # daiso 컬럼 16개 -> 문장당 62행 -> 62 + 62 + 26
+        inserts = [sql for sql in statements if "INSERT INTO daiso_catalog" in sql]
+        assert count == 150
+        assert len(inserts) == 3
+        assert temp_db.get_catalog_count("daiso") == 150
+
+    def test_batch_duplicate_ids_in_one_statement(self, temp_db):
+        """같은 문장 안의 중복 ID는 뒤쪽 값으로 갱신"""
+        temp_db.insert_catalog_products_batch("daiso", [
+            {"product_no": "001", "name": "상품1", "price": 1000},
+            {"product_no": "001", "name": "상품1", "price": 1500},
+        ])
+
+        assert temp_db.get_catalog_count("daiso") == 1
+        assert temp_db.conn.execute("SELECT price FROM daiso_catalog").fetchone()[0] == 1500
+
+    def test_batch_rolls_back_on_error(self, temp_db):
+        """배치 중 오류가 나면 전체 롤백"""
+        products = [{"product_no": "001", "name": "상품1", "price": 1000},
+                    {"product_no": "002", "name": "상품2", "price": object()}]
+
+        assert temp_db.insert_catalog_products_batch("daiso", products) == 0
+        assert temp_db.get_catalog_count("daiso") == 0
+        assert temp_db.insert_catalog_products_batch("invalid_store", products) == 0
+
+    def test_batch_after_failed_insert(self, temp_db):
+        """단건 저장이 실패해도 트랜잭션이 남지 않아 다음 배치가 저장됨"""
+        assert temp_db.insert_catalog_product("daiso", {"product_no": "001", "name": "상품1", "price": object()}) is False
+        assert not temp_db.conn.in_transaction
+
+        count = temp_db.insert_catalog_products_batch("daiso", [{"product_no": "002", "name": "상품2", "price": 2000}])
+        assert count == 1
+        assert temp_db.get_catalog_count("daiso") == 1
+
+    def test_batch_with_open_transaction(self, temp_db):
+        """커밋되지 않은 변경이 있으면 먼저 커밋하고 배치를 저장"""
+        temp_db.conn.execute("INSERT INTO daiso_catalog (product_no, name) VALUES ('001', '상품1')")
+        assert temp_db.conn.in_transaction
+
+        count = temp_db.insert_catalog_products_batch("daiso", [{"product_no": "002", "name": "상품2", "price": 2000}])
+        assert count == 1
+        assert temp_db.get_catalog_count("daiso") == 2
+
     def test_search_catalog(self, temp_db):
         """카탈로그 검색"""
         products = [
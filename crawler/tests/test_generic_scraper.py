@@ -4,6 +4,7 @@ GenericScraper 테스트
 """
 import pytest
 import asyncio
+from contextlib import asynccontextmanager
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 
 import sys
@@ -14,7 +15,8 @@ from scraper_configs import (
     StoreConfig, StoreSelectors, get_store_config,
     COSTCO_CONFIG, IKEA_CONFIG, STORE_CONFIGS
 )
-from generic_scraper import Product, GenericScraper
+from generic_scraper import Product, GenericScraper, _search_url, search_all_stores
+from base_scraper import ScraperConfig
 
 
 class TestProduct:
@@ -109,6 +111,17 @@ class TestStoreConfigs:
             assert not config.is_event_store, f"{code}은 일반 스토어여야 함"
 
 
+    def test_event_url_params_and_tabs(self):
+        """이벤트 URL 파라미터/탭 셀렉터는 설정 테이블에서 조회"""
+        emart24 = get_store_config("emart24")
+        assert emart24.event_url_params["2+1"] == "eventTypeCode=TWO_TO_ONE"
+        assert "2+1" not in emart24.selectors.event_tab
+
+        cu = get_store_config("cu")
+        assert cu.event_url_params == {}
+        assert cu.selectors.event_tab["2+1"]
+
+
 class TestGenericScraper:
     """GenericScraper 테스트"""
 
@@ -136,6 +149,116 @@ class TestGenericScraper:
                 GenericScraper.from_config(COSTCO_CONFIG)
 
 
+class TestSharedBrowser:
+    """공유 브라우저 사용 테스트"""
+
+    def _make_scraper(self, browser):
+        with patch('base_scraper.PLAYWRIGHT_AVAILABLE', True):
+            return GenericScraper("costco", scraper_config=ScraperConfig(shared_browser=browser))
+
+    async def test_init_uses_shared_browser_context(self):
+        """공유 브라우저가 있으면 새 컨텍스트만 생성"""
+        browser = MagicMock()
+        context = MagicMock()
+        context.add_init_script = AsyncMock()
+        context.new_page = AsyncMock(return_value=MagicMock())
+        browser.new_context = AsyncMock(return_value=context)
+
+        scraper = self._make_scraper(browser)
+        await scraper._init_browser()
+
+        browser.new_context.assert_awaited_once()
+        assert scraper.browser is browser
+        assert scraper.playwright is None
+
+    async def test_close_keeps_shared_browser_open(self):
+        """종료 시 컨텍스트만 닫고 공유 브라우저는 유지"""
+        browser = MagicMock()
+        browser.close = AsyncMock()
+        context = MagicMock()
+        context.add_init_script = AsyncMock()
+        context.close = AsyncMock()
+        page = MagicMock()
+        page.close = AsyncMock()
+        context.new_page = AsyncMock(return_value=page)
+        browser.new_context = AsyncMock(return_value=context)
+
+        scraper = self._make_scraper(browser)
+        await scraper._init_browser()
+        await scraper.close()
+
+        context.close.assert_awaited_once()
+        browser.close.assert_not_awaited()
+
+
+class TestWaitForAnySelector:
+    """후보 셀렉터 동시 대기 테스트"""
+
+    async def test_returns_when_any_selector_matches(self):
+        """느린 셀렉터를 기다리지 않고 먼저 찾은 셀렉터에서 반환"""
+        async def wait_for_selector(selector, timeout):
+            if selector == ".found":
+                return MagicMock()
+            await asyncio.sleep(10)
+
+        scraper = object.__new__(GenericScraper)
+        scraper.config = ScraperConfig()
+        scraper.page = MagicMock()
+        scraper.page.wait_for_selector = wait_for_selector
+
+        found = await asyncio.wait_for(
+            scraper._wait_for_any_selector([".slow", ".found"], timeout=10000),
+            timeout=1
+        )
+        assert found is True
+
+    async def test_returns_false_when_nothing_matches(self):
+        """모든 셀렉터가 실패하면 False"""
+        scraper = object.__new__(GenericScraper)
+        scraper.config = ScraperConfig()
+        scraper.page = MagicMock()
+        scraper.page.wait_for_selector = AsyncMock(side_effect=Exception("timeout"))
+
+        assert await scraper._wait_for_any_selector([".a", ".b"], timeout=10) is False
+
+
+class TestBotBlockCheck:
+    """봇 차단 확인 테스트"""
+
+    def _make_scraper(self, config=COSTCO_CONFIG):
+        scraper = object.__new__(GenericScraper)
+        scraper.store_config = config
+        scraper._bot_checked_url = None
+        scraper.page = MagicMock()
+        scraper.page.url = "https://www.costco.co.kr/search?text=x"
+        scraper.page.evaluate = AsyncMock(return_value="Access BLOCKED")
+        scraper.logger = MagicMock()
+        return scraper
+
+    async def test_detects_block_once_per_page(self):
+        """같은 페이지는 한 번만 확인"""
+        scraper = self._make_scraper()
+
+        assert await scraper._detect_bot_block() is True
+        assert await scraper._detect_bot_block() is False
+        scraper.page.evaluate.assert_awaited_once()
+
+    async def test_disabled_by_config(self):
+        """check_bot_block=False면 확인하지 않음"""
+        config = StoreConfig(
+            name="테스트",
+            code="test",
+            base_url="https://example.com",
+            search_url="https://example.com/search",
+            selectors=StoreSelectors(product_list=['.item']),
+            check_bot_block=False,
+        )
+        scraper = self._make_scraper(config)
+
+        assert await scraper._detect_bot_block() is False
+        scraper.page.evaluate.assert_not_awaited()
+
+
 class TestParseScript:
     """JavaScript 파싱 스크립트 생성 테스트"""
 
@@ -162,6 +285,53 @@ class TestParseScript:
             assert "pip-product-compact" in script
             assert "pip-header-section__title" in script
 
+    def test_build_parse_script_bakes_limit_and_dedup(self):
+        """limit과 중복 제거가 JS에 포함됨"""
+        scraper = object.__new__(GenericScraper)
+        scraper.store_config = COSTCO_CONFIG
+
+        script = scraper._build_parse_script(20)
+
+        assert "const LIMIT = 20;" in script
+        assert "seen.has(productId)" in script
+
+
+class TestSearchUrl:
+    """검색 URL 생성 테스트"""
+
+    def test_search_url_encodes_query(self):
+        """검색어가 인코딩되어 파라미터로 붙음"""
+        url = _search_url(COSTCO_CONFIG.search_url, COSTCO_CONFIG.search_query_param, "노트북 가방")
+        assert url.startswith("https://www.costco.co.kr/search?text=")
+        assert " " not in url
+        assert "%EB%85%B8%ED%8A%B8%EB%B6%81" in url
+
+
+class TestSearchAllStores:
+    """전체 스토어 검색 테스트"""
+
+    async def test_collects_streamed_products_per_store(self):
+        """스토어별로 모으고, 실패한 스토어는 빈 목록"""
+        @asynccontextmanager
+        async def fake_pool():
+            yield MagicMock()
+
+        async def fake_iter(self, query, limit):
+            if self.store_name == "ikea":
+                raise RuntimeError("boom")
+            yield Product(product_id="1", name=query, store=self.store_name)
+
+        with patch('base_scraper.PLAYWRIGHT_AVAILABLE', True), \
+                patch('generic_scraper.playwright_browser_pool', fake_pool), \
+                patch.object(GenericScraper, '_init_browser', AsyncMock()), \
+                patch.object(GenericScraper, 'search_products_iter', fake_iter):
+            results = await search_all_stores("선크림", limit_per_store=5)
+
+        expected = [code for code, cfg in STORE_CONFIGS.items() if not cfg.is_event_store]
+        assert list(results.keys()) == expected
+        assert results["ikea"] == []
+        assert [p.name for p in results["costco"]] == ["선크림"]
+
 
 class TestProductEquality:
     """상품 비교 테스트"""
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+IKEA API 크롤러 테스트
+"""
+import pytest
+import asyncio
+import json
+import sqlite3
+from unittest.mock import patch
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ikea_api_crawler
+from ikea_api_crawler import (IkeaAPICrawler, IkeaProduct, category_id_from_url, fetch_categories,
+                              run_ikea_catalog_crawl)
+
+
+def make_item(item_no="00123456", name="KALLAX", price=69900, was_price=None, rating=None):
+    """검색 API 응답 아이템 생성"""
+    product = {
+        'itemNo': item_no,
+        'name': name,
+        'typeName': '선반유닛',
+        'salesPrice': {'numeral': price},
+        'mainImageUrl': '/images/kallax.jpg',
+        'pipUrl': 'https://www.ikea.com/kr/ko/p/kallax-00123456/',
+    }
+    if was_price:
+        product['wasPrice'] = {'numeral': was_price}
+    if rating:
+        product['rating'] = {'average': rating, 'count': 10}
+    return {'product': product}
+
+
+def make_response(items):
+    return {'searchResultPage': {'products': {'main': {'items': items}}}}
+
+
+class TestParseSearchResults:
+    """검색 응답 파싱 테스트"""
+
+    def test_parse_product_fields(self):
+        """가격/이미지/평점 파싱"""
+        crawler = IkeaAPICrawler()
+        data = make_response([make_item(price=59900, was_price=69900, rating=4.56)])
+
+        products = crawler._parse_search_results(data, "선반")
+
+        assert len(products) == 1
+        p = products[0]
+        assert p.product_no == "00123456"
+        assert p.name_ko == "KALLAX 선반유닛"
+        assert p.price == 59900
+        assert p.original_price == 69900
+        assert p.is_sale is True
+        assert p.image_url == "https://www.ikea.com/images/kallax.jpg"
+        assert p.rating == 4.6
+        assert p.category == "선반"
+
+    def test_skips_items_without_price_or_id(self):
+        """가격 0 또는 itemNo 없는 상품 제외"""
+        crawler = IkeaAPICrawler()
+        data = make_response([make_item(price=0), make_item(item_no="")])
+
+        assert crawler._parse_search_results(data, "선반") == []
+
+    def test_malformed_item_skipped(self):
+        """파싱할 수 없는 아이템은 건너뛰고 나머지는 유지"""
+        crawler = IkeaAPICrawler()
+        bad = make_item(item_no="00000001")
+        bad['product']['salesPrice'] = {'numeral': 'N/A'}
+        data = make_response([bad, make_item()])
+
+        products = crawler._parse_search_results(data, "선반")
+
+        assert [p.product_no for p in products] == ["00123456"]
+
+    def test_parse_search_body_without_instance(self):
+        """응답 본문 파싱은 인스턴스(HTTP 연결) 없이 클래스에서 호출"""
+        body = json.dumps(make_response([make_item()])).encode()
+
+        products = IkeaAPICrawler.parse_search_body(body, "")
+
+        assert [p.product_no for p in products] == ["00123456"]
+
+    def test_context_manager_closes_session(self):
+        """with 블록을 벗어나면 연결 정리"""
+        with patch.object(IkeaAPICrawler, 'close') as close:
+            with IkeaAPICrawler():
+                pass
+
+        close.assert_called_once()
+
+
+class TestFetchCategories:
+    """카테고리 동시 검색 테스트"""
+
+    async def test_results_follow_category_order(self):
+        """결과는 카테고리 순서, 실패한 카테고리는 예외로 반환"""
+        async def fake_search(self, session, query, limit=50):
+            if query == "의자":
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.01 if query == "책상" else 0)
+            return [IkeaProduct(query, query, query, 1000, None, "", "", query, None, 0)]
+
+        crawler = IkeaAPICrawler()
+        with patch.object(IkeaAPICrawler, 'search_products_async', fake_search):
+            results = await fetch_categories(crawler, ["책상", "의자", "소파"], 10)
+
+        assert results[0][0].product_no == "책상"
+        assert isinstance(results[1], RuntimeError)
+        assert results[2][0].product_no == "소파"
+
+    async def test_queue_receives_results_as_completed(self):
+        """queue 지정 시 완료 순서대로 (인덱스, 결과) 전달"""
+        async def fake_search(self, session, query, limit=50):
+            await asyncio.sleep(0.01 if query == "책상" else 0)
+            return []
+
+        queue = asyncio.Queue()
+        with patch.object(IkeaAPICrawler, 'search_products_async', fake_search):
+            await fetch_categories(IkeaAPICrawler(), ["책상", "소파"], 10, queue=queue)
+
+        assert [queue.get_nowait()[0] for _ in range(queue.qsize())] == [1, 0]
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"{}"):
+        self.status = status
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """미리 정한 상태코드를 순서대로 돌려주는 세션"""
+
+    def __init__(self, statuses, body=b"{}"):
+        self.statuses = list(statuses)
+        self.body = body
+        self.calls = 0
+        self.params = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        self.params.append(params)
+        return FakeResponse(self.statuses.pop(0), self.body)
+
+
+class TestSearchRetry:
+    """일시적 오류 재시도 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def no_delay(self):
+        with patch.object(ikea_api_crawler, 'RETRY_BASE_DELAY', 0):
+            yield
+
+    async def test_retries_server_error(self):
+        """5xx 후 성공하면 결과 반환"""
+        body = json.dumps(make_response([make_item()])).encode()
+        session = FakeSession([503, 502, 200], body)
+
+        products = await IkeaAPICrawler().search_products_async(session, "선반")
+
+        assert session.calls == 3
+        assert len(products) == 1
+
+    async def test_gives_up_after_max_retries(self):
+        """재시도 횟수 초과 시 빈 결과"""
+        session = FakeSession([500] * ikea_api_crawler.MAX_RETRIES)
+
+        products = await IkeaAPICrawler().search_products_async(session, "선반")
+
+        assert session.calls == ikea_api_crawler.MAX_RETRIES
+        assert products == []
+
+    async def test_client_error_not_retried(self):
+        """404 같은 요청 오류는 재시도하지 않음"""
+        session = FakeSession([404])
+
+        assert await IkeaAPICrawler().search_products_async(session, "선반") == []
+        assert session.calls == 1
+
+
+class TestSearchPagination:
+    """페이지 분할 요청 테스트"""
+
+    async def test_splits_limit_into_pages(self):
+        """PAGE_SIZE 초과 limit은 start 오프셋별로 요청"""
+        items = [make_item(item_no=f"{i:08d}") for i in range(100)]
+        body = json.dumps(make_response(items)).encode()
+        session = FakeSession([200, 200, 200], body)
+
+        products = await IkeaAPICrawler().search_products_async(session, "선반", limit=250)
+
+        assert [(p.get('start', 0), p['size']) for p in session.params] == [(0, 100), (100, 100), (200, 50)]
+        assert len(products) == 250
+
+    async def test_single_page_has_no_start(self):
+        """한 페이지로 충분하면 start 파라미터 없음"""
+        session = FakeSession([200], json.dumps(make_response([])).encode())
+
+        await IkeaAPICrawler().search_products_async(session, "선반", limit=50)
+
+        assert session.params == [IkeaAPICrawler.search_params("선반", 50)]
+        assert 'start' not in session.params[0]
+
+
+class TestCategoryListing:
+    """카테고리 ID 목록 조회 테스트"""
+
+    @pytest.mark.parametrize("url, category_id", [
+        ("https://www.ikea.com/kr/ko/cat/sofas-fu003/", "fu003"),
+        ("https://www.ikea.com/kr/ko/cat/desks-computer-desks-20649/", "20649"),
+        ("https://www.ikea.com/kr/ko/cat/cups-mugs-702862", "702862"),
+        ("https://www.ikea.com/kr/ko/", ""),
+    ])
+    def test_category_id_from_url(self, url, category_id):
+        assert category_id_from_url(url) == category_id
+
+    async def test_pages_by_category_id(self):
+        """검색어 대신 카테고리 ID로 start/end 구간을 나눠 요청하고 productWindow 파싱"""
+        window = [make_item(item_no=f"{i:08d}")['product'] for i in range(100)]
+        body = json.dumps({'moreProducts': {'productWindow': window}}).encode()
+        session = FakeSession([200, 200], body)
+
+        products = await IkeaAPICrawler().category_products_async(session, "702862", "컵/머그", limit=150)
+
+        assert [(p['category'], p['start'], p['end']) for p in session.params] == [
+            ("702862", 0, 100), ("702862", 100, 150)]
+        assert 'q' not in session.params[0]
+        assert len(products) == 150
+        assert products[0].category == "컵/머그"
+
+    async def test_empty_listing(self):
+        """productWindow가 없으면 빈 목록"""
+        session = FakeSession([200], b'{}')
+
+        assert await IkeaAPICrawler().category_products_async(session, "fu003", "소파") == []
+
+
+class TestRunCatalogCrawl:
+    """카탈로그 저장 (UPSERT) 테스트"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        path = str(tmp_path / "products.db")
+        with patch.object(ikea_api_crawler, 'DB_PATH', path):
+            yield path
+
+    def _crawl(self, products_by_category):
+        async def fake_fetch(crawler, categories, limit_per_category=50, queue=None):
+            # 완료 순서가 카테고리 순서와 달라도 결과는 같아야 함
+            for i in reversed(range(len(categories))):
+                queue.put_nowait((i, products_by_category[categories[i]]))
+
+        with patch.object(ikea_api_crawler, 'fetch_categories', fake_fetch):
+            return run_ikea_catalog_crawl(list(products_by_category), limit_per_category=10)
+
+    def test_insert_then_update(self, db_path):
+        """같은 product_no는 새로 넣지 않고 갱신"""
+        def product(price):
+            return IkeaProduct("00123456", "KALLAX", "KALLAX 선반유닛", price, None,
+                               "", "", "선반", 4.5, 10)
+
+        first = self._crawl({"선반": [product(69900)]})
+        second = self._crawl({"선반": [product(59900)]})
+
+        assert first['added'] == 1
+        assert second['added'] == 0
+        assert second['updated'] == 1
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT product_no, price FROM ikea_catalog").fetchall()
+        conn.close()
+        assert rows == [("00123456", 59900)]
+
+    def test_duplicates_across_categories_written_once(self, db_path):
+        """여러 카테고리에 나온 상품은 한 번만 저장 (나중 카테고리 우선)"""
+        def product(category):
+            return IkeaProduct("00123456", "LAGKAPTEN", "LAGKAPTEN 상판", 50000, None,
+                               "", "", category, None, 0)
+
+        result = self._crawl({"책상": [product("책상")], "테이블": [product("테이블")]})
+
+        assert result['added'] == 1
+        assert result['updated'] == 0
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT category FROM ikea_catalog").fetchall()
+        conn.close()
+        assert rows == [("테이블",)]
+
+    def test_failed_category_counted_as_error(self, db_path):
+        """실패한 카테고리는 오류로 집계"""
+        result = self._crawl({"선반": RuntimeError("boom")})
+
+        assert result['errors'] == 1
+        assert result['total'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
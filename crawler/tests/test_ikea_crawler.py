@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+이케아 검색 크롤러 (IkeaCrawler) 테스트
+"""
+import httpx
+import pytest
+from unittest.mock import patch
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ikea_crawler
+from ikea_crawler import IkeaCrawler, IkeaProduct, RAPIDFUZZ_AVAILABLE
+
+
+def make_product(code="00123456", name="KALLAX", type_name="선반유닛", price=69900):
+    return IkeaProduct(code, name, type_name, price, "", "", "검색")
+
+
+class TestParseProduct:
+    """검색 API 아이템 파싱 테스트"""
+
+    def test_parse_fields(self):
+        """필드 매핑"""
+        item = {"product": {
+            "id": "00123456", "name": "KALLAX", "typeName": "선반유닛",
+            "priceNumeral": 69900, "mainImageUrl": "img", "pipUrl": "url",
+        }}
+
+        product = IkeaCrawler._parse_product(item, "선반")
+
+        assert product == IkeaProduct("00123456", "KALLAX", "선반유닛", 69900, "img", "url", "선반")
+
+    def test_skip_without_id_or_name(self):
+        """id/name 없는 아이템 제외"""
+        assert IkeaCrawler._parse_product({"product": {"name": "KALLAX"}}, "선반") is None
+        assert IkeaCrawler._parse_product({"product": {"id": "1"}}, "선반") is None
+        assert IkeaCrawler._parse_product({}, "선반") is None
+
+
+class TestSearchProducts:
+    """동기 검색 (공유 httpx.Client) 테스트"""
+
+    def _crawler(self, handler):
+        crawler = IkeaCrawler()
+        crawler.client.close()
+        crawler.client = httpx.Client(transport=httpx.MockTransport(handler))
+        return crawler
+
+    def test_yields_parsed_products(self):
+        """응답 아이템을 max_results개까지 순서대로 파싱"""
+        def handler(request):
+            assert request.url.params["q"] == "선반"
+            items = [{"product": {"id": str(i), "name": f"P{i}"}} for i in range(5)]
+            return httpx.Response(200, json={"searchResultPage": {"products": {"main": {"items": items}}}})
+
+        with self._crawler(handler) as crawler:
+            products = crawler.search_products("선반", max_results=3)
+
+        assert [p.product_code for p in products] == ["0", "1", "2"]
+
+    def test_returns_list(self):
+        """호출 즉시 요청하고 목록으로 반환 (다른 매장 매처와 동일)"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.params["q"])
+            return httpx.Response(200, json={})
+
+        with self._crawler(handler) as crawler:
+            result = crawler.search_products("선반")
+
+        assert result == []
+        assert calls == ["선반"]
+
+    def test_error_status(self):
+        """200이 아니면 빈 결과"""
+        with self._crawler(lambda request: httpx.Response(503)) as crawler:
+            assert crawler.search_products("선반") == []
+
+    def test_reuses_client(self):
+        """여러 번 검색해도 같은 연결 사용"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.params["q"])
+            return httpx.Response(200, json={})
+
+        with self._crawler(handler) as crawler:
+            client = crawler.client
+            crawler.search_products("a")
+            crawler.search_products("b")
+
+            assert crawler.client is client
+        assert calls == ["a", "b"]
+        assert client.is_closed
+
+
+class TestSearchAndMatch:
+    """검색 결과 매칭 테스트"""
+
+    def _match(self, query, products, **kwargs):
+        with patch.object(IkeaCrawler, 'search_products', return_value=products):
+            return IkeaCrawler().search_and_match(query, **kwargs)
+
+    def _jaccard(self, query, products, **kwargs):
+        with patch.object(ikea_crawler, 'RAPIDFUZZ_AVAILABLE', False):
+            return self._match(query, products, **kwargs)
+
+    def test_english_name_bonus(self):
+        """영문 제품명이 포함된 상품 우선"""
+        products = [make_product("1", "BILLY", "책장"), make_product("2", "KALLAX", "선반유닛")]
+
+        assert self._match("이케아 KALLAX 선반", products).product_code == "2"
+
+    def test_below_threshold(self):
+        """유사도가 낮으면 None"""
+        assert self._match("무선 청소기", [make_product()]) is None
+
+    @pytest.mark.skipif(not RAPIDFUZZ_AVAILABLE, reason="rapidfuzz 미설치")
+    def test_fuzzy_typo(self):
+        """오타가 있어도 매칭 (rapidfuzz)"""
+        products = [make_product("1", "BILLY", "책장"), make_product("2", "MALM 말름", "서랍장")]
+
+        assert self._match("이케아 말룸 서랍장", products).product_code == "2"
+
+    @pytest.mark.skipif(not RAPIDFUZZ_AVAILABLE, reason="rapidfuzz 미설치")
+    def test_fuzzy_threshold(self):
+        """threshold를 넘기면 rapidfuzz 최소 점수(threshold * 100)로 사용"""
+        products = [make_product("2", "MALM 말름", "서랍장")]
+
+        # WRatio("이케아 말룸 서랍장", "MALM 말름 서랍장") ~= 57
+        assert self._match("이케아 말룸 서랍장", products, threshold=0.55).product_code == "2"
+        assert self._match("이케아 말룸 서랍장", products, threshold=0.6) is None
+
+    def test_jaccard_score(self):
+        """겹치는 단어 비율로 점수 계산 (중복 단어는 한 번만)"""
+        products = [make_product("1", "HEMNES", "헴네스 서랍장")]
+
+        # {헴네스, 서랍장} vs {hemnes, 헴네스, 서랍장} -> 2/3
+        assert self._jaccard("서랍장 서랍장 헴네스", products, threshold=0.66) is not None
+        assert self._jaccard("서랍장 서랍장 헴네스", products, threshold=0.67) is None
+
+    def test_jaccard_stops_at_perfect_score(self):
+        """만점 상품이 나오면 나머지 검색 결과는 소비하지 않음"""
+        def products():
+            yield make_product("1", "KALLAX", "선반유닛")
+            raise AssertionError("만점 이후 결과까지 읽음")
+
+        assert self._jaccard("kallax 선반유닛", products()).product_code == "1"
+
+    def test_no_results(self):
+        """검색 결과 없으면 None"""
+        assert self._match("KALLAX", []) is None
+        assert self._jaccard("KALLAX", []) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+이케아 Playwright 크롤러 (run_ikea_crawl) 테스트
+"""
+import asyncio
+import json
+import sqlite3
+import pytest
+from unittest.mock import patch
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ikea_playwright_crawler
+from ikea_playwright_crawler import IkeaPlaywrightCrawler, IkeaProduct, run_ikea_crawl
+
+
+def make_product(product_no, category, price=10000):
+    return IkeaProduct(product_no, "KALLAX", "KALLAX 선반유닛", price, None,
+                       "", "", category, None, 0)
+
+
+def make_card(**overrides):
+    card = {
+        "href": "/kr/ko/p/linnmon-adils-table-white-s09246408/",
+        "brand": "LINNMON / ADILS",
+        "desc": "테이블",
+        "priceText": "가격 ￦ 49900￦49,900",
+        "wasPriceText": "",
+        "imgSrc": "img",
+        "ratingText": "검토: 4.4 밖으로 5 별. 총 리뷰 수: (1470)",
+        "isNew": False,
+    }
+    card.update(overrides)
+    return card
+
+
+class TestParseCard:
+    """상품 카드 텍스트 파싱 테스트"""
+
+    def test_parse_fields(self):
+        """ID/가격/평점/리뷰 수/URL 파싱"""
+        product = IkeaPlaywrightCrawler._parse_card(make_card(), "책상")
+
+        assert product.product_no == "09246408"
+        assert product.name == "LINNMON / ADILS"
+        assert product.name_ko == "LINNMON / ADILS 테이블"
+        assert product.price == 49900
+        assert product.rating == 4.4
+        assert product.review_count == 1470
+        assert product.product_url == "https://www.ikea.com/kr/ko/p/linnmon-adils-table-white-s09246408/"
+        assert product.category == "책상"
+
+    def test_alt_price_and_sale(self):
+        """'￦49,900' 형식 가격 및 정가가 더 높으면 할인 상품"""
+        product = IkeaPlaywrightCrawler._parse_card(
+            make_card(priceText="￦39,900", wasPriceText="정가 ￦ 49900", ratingText=""), "책상")
+
+        assert product.price == 39900
+        assert product.original_price == 49900
+        assert product.is_sale
+        assert product.rating is None
+        assert product.review_count == 0
+
+    def test_skip_without_id_or_price(self):
+        """ID나 가격이 없으면 None"""
+        assert IkeaPlaywrightCrawler._parse_card(make_card(href="/kr/ko/p/linnmon/"), "책상") is None
+        assert IkeaPlaywrightCrawler._parse_card(make_card(priceText=""), "책상") is None
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url="https://www.ikea.com/kr/ko/search/?q=책상"):
+        self.request = type("Request", (), {"resource_type": resource_type, "url": url})()
+        self.action = None
+
+    async def abort(self):
+        self.action = "abort"
+
+    async def continue_(self):
+        self.action = "continue"
+
+
+class TestBlockHeavyResources:
+    """불필요한 리소스 차단 테스트"""
+
+    @pytest.mark.parametrize("resource_type, url, action", [
+        ("image", "https://www.ikea.com/a.jpg", "abort"),
+        ("font", "https://www.ikea.com/a.woff2", "abort"),
+        ("stylesheet", "https://www.ikea.com/a.css", "abort"),
+        ("script", "https://www.ikea.com/analytics/tag.js", "abort"),
+        ("document", "https://www.ikea.com/kr/ko/search/?q=책상", "continue"),
+        ("xhr", "https://sik.search.blue.cdtapps.com/kr/ko/search", "continue"),
+    ])
+    async def test_route(self, resource_type, url, action):
+        route = FakeRoute(resource_type, url)
+
+        await IkeaPlaywrightCrawler._block_heavy_resources(route)
+
+        assert route.action == action
+
+
+class FakeButton:
+    def __init__(self, page):
+        self.page = page
+
+    async def click(self):
+        await asyncio.sleep(0.01)
+        self.page.clicks += 1
+
+
+class FakePage:
+    def __init__(self, has_banner=True):
+        self.has_banner = has_banner
+        self.clicks = 0
+        self.lookups = 0
+
+    async def query_selector(self, selector):
+        self.lookups += 1
+        return FakeButton(self) if self.has_banner else None
+
+
+class TestCookieBanner:
+    """쿠키 동의 팝업 처리 테스트"""
+
+    async def test_dismissed_once_per_session(self):
+        """동시에 여러 페이지가 와도 한 번만 클릭하고 이후엔 조회도 생략"""
+        crawler = IkeaPlaywrightCrawler()
+        pages = [FakePage() for _ in range(3)]
+
+        await asyncio.gather(*(crawler._dismiss_cookie_banner(page) for page in pages))
+        await crawler._dismiss_cookie_banner(pages[0])
+
+        assert sum(page.clicks for page in pages) == 1
+        assert sum(page.lookups for page in pages) == 1
+
+    async def test_retry_when_banner_missing(self):
+        """팝업이 없었으면 다음 검색에서 다시 확인"""
+        crawler = IkeaPlaywrightCrawler()
+        page = FakePage(has_banner=False)
+
+        await crawler._dismiss_cookie_banner(page)
+        page.has_banner = True
+        await crawler._dismiss_cookie_banner(page)
+
+        assert page.lookups == 2
+        assert page.clicks == 1
+
+
+class FakeListPage:
+    """스크롤할 때마다 batches의 다음 카드 목록을 보여 주는 검색 결과 페이지"""
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.scrolls = 0
+
+    def locator(self, selector):
+        page = self
+
+        class Locator:
+            async def evaluate_all(self, script):
+                return page.batches[min(page.scrolls, len(page.batches) - 1)]
+
+        return Locator()
+
+    async def evaluate(self, script):
+        self.scrolls += 1
+
+    async def wait_for_load_state(self, state, timeout=None):
+        pass
+
+
+def cards(count):
+    return [make_card(href=f"/kr/ko/p/kallax-s{i:08d}/") for i in range(count)]
+
+
+class TestScrollLoading:
+    """스크롤 추가 로딩 테스트"""
+
+    async def test_scrolls_until_limit(self):
+        """limit개가 모일 때까지 스크롤"""
+        page = FakeListPage([cards(2), cards(4), cards(6)])
+
+        products = await IkeaPlaywrightCrawler()._parse_search_results(page, "선반", limit=5)
+
+        assert len(products) == 5
+        assert page.scrolls == 2
+
+    async def test_stops_when_nothing_new(self):
+        """스크롤해도 늘지 않으면 결과가 적은 것으로 보고 중단"""
+        page = FakeListPage([cards(2), cards(2), cards(9)])
+
+        products = await IkeaPlaywrightCrawler()._parse_search_results(page, "선반", limit=5)
+
+        assert len(products) == 2
+        assert page.scrolls == 1
+
+    async def test_bounded_when_empty(self):
+        """끝내 카드가 없으면 재귀 없이 SCROLL_ATTEMPTS번만 시도"""
+        page = FakeListPage([[]])
+
+        products = await IkeaPlaywrightCrawler()._parse_search_results(page, "선반", limit=5)
+
+        assert products == []
+        assert page.scrolls == ikea_playwright_crawler.SCROLL_ATTEMPTS - 1
+
+
+def make_html(count):
+    cards = "".join(f'''
+        <div class="pip-product-compact">
+          <a href="/kr/ko/p/kallax-shelf-unit-white-s{i:08d}/">
+            <span class="pip-header-section__title--small">KALLAX</span>
+            <span class="pip-header-section__description-text">선반유닛</span>
+          </a>
+          <div class="pip-temp-price">￦69,900</div>
+          <img data-src="img{i}">
+        </div>''' for i in range(count))
+    return f"<html><body><div class='plp-product-list'>{cards}</div></body></html>"
+
+
+class TestHtmlFastPath:
+    """브라우저 없는 HTML 검색 테스트"""
+
+    def test_cards_from_html(self):
+        """HTML 카드를 브라우저 추출 결과와 같은 형식으로 변환"""
+        cards = IkeaPlaywrightCrawler._cards_from_html(make_html(1))
+        product = IkeaPlaywrightCrawler._parse_card(cards[0], "선반")
+
+        assert cards[0]["imgSrc"] == "img0"
+        assert product.product_no == "00000000"
+        assert product.name_ko == "KALLAX 선반유닛"
+        assert product.price == 69900
+
+    async def _search(self, html, browser_html=None):
+        crawler = IkeaPlaywrightCrawler()
+        browser_calls = []
+
+        async def fake_fetch(url):
+            if isinstance(html, BaseException):
+                raise html
+            return html
+
+        async def fake_browser(search_url, query, limit):
+            browser_calls.append(query)
+            if browser_html is None:
+                return []
+            return crawler._products_from_cards(crawler._cards_from_html(browser_html), query, limit)
+
+        crawler._fetch_html = fake_fetch
+        crawler._search_with_browser = fake_browser
+        with patch.object(ikea_playwright_crawler, 'PLAYWRIGHT_AVAILABLE', True):
+            products = await crawler.search_products("선반", limit=10)
+        return products, browser_calls
+
+    async def test_enough_products_skip_browser(self):
+        """HTML에서 충분히 나오면 브라우저를 띄우지 않음"""
+        products, browser_calls = await self._search(make_html(6))
+
+        assert len(products) == 6
+        assert browser_calls == []
+
+    async def test_few_products_fall_back_to_browser(self):
+        """HTML 결과가 적거나 요청이 실패하면 Playwright로 다시 검색"""
+        _, browser_calls = await self._search(make_html(2))
+        assert browser_calls == ["선반"]
+
+        _, browser_calls = await self._search(RuntimeError("403"))
+        assert browser_calls == ["선반"]
+
+    async def test_browser_tops_up_html_results(self):
+        """HTML에서 나온 상품은 유지하고 브라우저 결과로 나머지를 채움 (중복 제외)"""
+        products, _ = await self._search(make_html(2))
+        assert len(products) == 2
+
+        products, _ = await self._search(make_html(2), browser_html=make_html(8))
+        assert [p.product_no for p in products] == [f"{i:08d}" for i in range(8)]
+
+    def test_init_script_embeds_field_selectors(self):
+        """브라우저 추출 스크립트도 CARD_FIELD_SELECTORS를 사용"""
+        assert json.dumps(ikea_playwright_crawler.CARD_FIELD_SELECTORS) in ikea_playwright_crawler.CARD_FIELDS_INIT_JS
+
+
+class TestRunIkeaCrawl:
+    """카테고리 동시 검색 및 저장 테스트"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        path = str(tmp_path / "products.db")
+        with patch.object(ikea_playwright_crawler, 'DB_PATH', path):
+            yield path
+
+    async def _crawl(self, products_by_category, concurrency=2, delays=None, force=True, on_search=None):
+        state = {"running": 0, "peak": 0}
+
+        async def fake_search(crawler, query, limit=50):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep((delays or {}).get(query, 0.01))
+            if on_search:
+                on_search(query)
+            state["running"] -= 1
+            result = products_by_category[query]
+            if isinstance(result, BaseException):
+                raise result
+            return result
+
+        async def fake_close(crawler):
+            pass
+
+        with patch.object(IkeaPlaywrightCrawler, 'search_products', fake_search), \
+                patch.object(IkeaPlaywrightCrawler, 'close', fake_close), \
+                patch.object(ikea_playwright_crawler, 'CATEGORY_CONCURRENCY', concurrency):
+            result = await run_ikea_crawl(list(products_by_category), limit_per_category=10, force=force)
+        return result, state["peak"]
+
+    async def test_concurrency_bounded(self, db_path):
+        """동시 검색 수는 CATEGORY_CONCURRENCY 이하"""
+        categories = {f"카테고리{i}": [make_product(f"{i:08d}", f"카테고리{i}")] for i in range(6)}
+
+        result, peak = await self._crawl(categories, concurrency=2)
+
+        assert peak == 2
+        assert result['added'] == 6
+        assert result['total'] == 6
+
+    async def test_later_category_wins(self, db_path):
+        """여러 카테고리에 나온 상품은 카테고리 순서상 나중 것으로 저장"""
+        result, _ = await self._crawl({
+            "책상": [make_product("00123456", "책상")],
+            "테이블": [make_product("00123456", "테이블")],
+        })
+
+        assert result['added'] == 1
+        assert result['updated'] == 1
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT category FROM ikea_catalog").fetchall()
+        conn.close()
+        assert rows == [("테이블",)]
+
+    async def test_category_order_kept_when_finished_out_of_order(self, db_path):
+        """먼저 끝난 뒤쪽 카테고리가 있어도 저장은 카테고리 순서대로"""
+        result, _ = await self._crawl({
+            "책상": [make_product("00123456", "책상")],
+            "테이블": [make_product("00123456", "테이블")],
+        }, delays={"책상": 0.05})
+
+        assert result['updated'] == 1
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT category FROM ikea_catalog").fetchall()
+        conn.close()
+        assert rows == [("테이블",)]
+
+    async def test_unchanged_products_skipped(self, db_path):
+        """저장된 값과 같은 상품은 다시 쓰지 않고, 바뀐 상품만 갱신"""
+        await self._crawl({"책상": [make_product("00000001", "책상"), make_product("00000002", "책상")]})
+
+        result, _ = await self._crawl({
+            "책상": [make_product("00000001", "책상"), make_product("00000002", "책상", price=9000)],
+        })
+
+        assert result['added'] == 0
+        assert result['updated'] == 1
+
+        conn = sqlite3.connect(db_path)
+        price = conn.execute("SELECT price FROM ikea_catalog WHERE product_no = '00000002'").fetchone()[0]
+        conn.close()
+        assert price == 9000
+
+    async def test_recent_categories_skipped(self, db_path):
+        """최근 수집한 카테고리는 건너뛰고, 실패했던 카테고리는 다시 수집"""
+        await self._crawl({
+            "책상": [make_product("00000001", "책상")],
+            "선반": RuntimeError("boom"),
+        }, force=False)
+
+        result, _ = await self._crawl({
+            "책상": [make_product("00000001", "책상", price=9000)],
+            "선반": [make_product("00000002", "선반")],
+        }, force=False)
+
+        assert result['skipped'] == 1
+        assert result['added'] == 1
+        assert result['updated'] == 0
+
+    async def test_failed_category_counted_as_error(self, db_path):
+        """실패한 카테고리는 오류로 집계하고 나머지는 저장"""
+        result, _ = await self._crawl({
+            "선반": RuntimeError("boom"),
+            "책상": [make_product("00000001", "책상")],
+        })
+
+        assert result['errors'] == 1
+        assert result['total'] == 1
+
+    async def test_failed_save_rolls_back_category_only(self, db_path):
+        """저장 중 오류가 난 카테고리는 통째로 되돌리고 나머지는 유지"""
+        broken = make_product("00000003", "선반")
+        broken.name = None  # name NOT NULL 위반
+
+        result, _ = await self._crawl({
+            "책상": [make_product("00000001", "책상")],
+            "선반": [make_product("00000002", "선반"), broken],
+        })
+
+        assert result['errors'] == 1
+        assert result['added'] == 1
+        assert result['updated'] == 0
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT product_no FROM ikea_catalog").fetchall()
+        conn.close()
+        assert rows == [("00000001",)]
+
+    async def test_categories_committed_during_crawl(self, db_path):
+        """카테고리마다 커밋하므로 크롤링 중에도 앞서 저장한 카테고리가 다른 연결에 보임"""
+        seen = {}
+
+        def count_saved(query):
+            conn = sqlite3.connect(db_path)
+            seen[query] = conn.execute("SELECT COUNT(*) FROM ikea_catalog").fetchone()[0]
+            conn.close()
+
+        await self._crawl({
+            "책상": [make_product("00000001", "책상")],
+            "선반": [make_product("00000002", "선반")],
+        }, concurrency=1, delays={"선반": 0.05}, on_search=count_saved)
+
+        assert seen == {"책상": 0, "선반": 1}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
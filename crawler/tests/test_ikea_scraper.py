@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+이케아 스크래퍼 (IkeaScraper) 테스트
+"""
+import asyncio
+import httpx
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ikea_crawler
+import ikea_scraper
+from ikea_scraper import (IKEA_CATEGORIES, IKEA_SEARCH_KEYWORDS, IkeaBrowserPool, IkeaProduct,
+                          IkeaScraper, crawl_all, run_queries)
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.closed = False
+        self.pages = []
+
+    async def add_init_script(self, script):
+        pass
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def storage_state(self):
+        return {"cookies": [{"name": "OptanonAlertBoxClosed"}], "origins": []}
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def new_context(self, **options):
+        context = FakeContext(options)
+        self.pool.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+class FakeBrowserPool(IkeaBrowserPool):
+    """브라우저 대신 실행/생성 횟수만 세는 풀"""
+
+    def __init__(self, headless=True):
+        super().__init__(headless)
+        self.launches = 0
+        self.contexts = []
+
+    async def _launch(self):
+        self.launches += 1
+        self.browser = FakeBrowser(self)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake = FakeBrowserPool()
+    monkeypatch.setattr(ikea_scraper, 'get_browser_pool', lambda headless=True: fake)
+    return fake
+
+
+class TestIkeaProduct:
+    """상품 데이터 클래스 테스트"""
+
+    def test_to_dict_all_fields(self):
+        """to_dict는 모든 필드를 정의 순서대로 포함"""
+        product = IkeaProduct("00000001", "MALM", "서랍장", 99000, rating=4.2, review_count=7)
+
+        assert product.to_dict() == {
+            "product_id": "00000001", "name": "MALM", "type_name": "서랍장", "price": 99000,
+            "image_url": "", "product_url": "", "category": "", "color": "", "size": "",
+            "rating": 4.2, "review_count": 7,
+        }
+
+    def test_slots(self):
+        """인스턴스마다 __dict__를 만들지 않음"""
+        assert not hasattr(IkeaProduct("1", "A"), "__dict__")
+
+
+class TestBrowserPool:
+    """공유 브라우저 풀 테스트"""
+
+    async def test_scrapers_share_one_browser(self, pool):
+        """동시에 여러 스크래퍼가 있어도 브라우저는 하나, 컨텍스트는 스크래퍼마다"""
+        scrapers = [IkeaScraper() for _ in range(3)]
+
+        await asyncio.gather(*(scraper._init_browser() for scraper in scrapers))
+
+        assert pool.launches == 1
+        assert len(pool.contexts) == 3
+
+        for scraper in scrapers:
+            await scraper.close()
+
+    async def test_context_reused_and_browser_closed_when_idle(self, pool):
+        """반납된 컨텍스트는 재사용하고, 모두 반납되면 브라우저 종료"""
+        first, second = IkeaScraper(), IkeaScraper()
+        await first._init_browser()
+        await second._init_browser()
+        await first.close()
+
+        third = IkeaScraper()
+        await third._init_browser()
+
+        assert third.context is pool.contexts[0]
+        assert first.page is None
+        assert pool.contexts[0].pages[0].closed
+
+        await second.close()
+        await third.close()
+
+        assert pool.browser is None
+        assert all(context.closed for context in pool.contexts)
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = type("Request", (), {"resource_type": resource_type, "url": url})()
+        self.action = None
+
+    async def abort(self):
+        self.action = "abort"
+
+    async def continue_(self):
+        self.action = "continue"
+
+
+class TestBlockHeavyResources:
+    """불필요한 리소스 차단 테스트"""
+
+    @pytest.mark.parametrize("resource_type, url, action", [
+        ("image", "https://www.ikea.com/a.jpg", "abort"),
+        ("font", "https://www.ikea.com/a.woff2", "abort"),
+        ("stylesheet", "https://www.ikea.com/a.css", "abort"),
+        ("script", "https://www.googletagmanager.com/gtm.js", "abort"),
+        ("xhr", "https://stats.g.doubleclick.net/collect", "abort"),
+        ("document", "https://www.ikea.com/kr/ko/search/?q=책상", "continue"),
+        ("script", "https://www.ikea.com/kr/ko/search/app.js", "continue"),
+    ])
+    async def test_route(self, resource_type, url, action):
+        route = FakeRoute(resource_type, url)
+
+        await IkeaBrowserPool._block_heavy_resources(route)
+
+        assert route.action == action
+
+
+class FakeListingPage:
+    """호출 순서만 기록하는 목록 페이지"""
+
+    def __init__(self, context=None, has_banner=True):
+        self.context = context
+        self.has_banner = has_banner
+        self.calls = []
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.calls.append(("goto", wait_until))
+
+    async def wait_for_selector(self, selector, timeout=None):
+        self.calls.append(("wait", timeout))
+
+    async def query_selector(self, selector):
+        page = self
+
+        class Button:
+            async def click(self):
+                page.calls.append(("click", selector))
+
+        return Button() if self.has_banner else None
+
+
+class TestOpenListing:
+    """목록 페이지 로딩 테스트"""
+
+    URL = "https://www.ikea.com/kr/ko/search/?q=책상"
+
+    async def test_waits_for_cards_then_dismisses_cookie(self, pool, monkeypatch):
+        """고정 sleep 없이 상품 카드 대기 후 쿠키 팝업 클릭"""
+        async def no_sleep(delay):
+            raise AssertionError("고정 대기 사용")
+
+        monkeypatch.setattr(asyncio, 'sleep', no_sleep)
+        page = FakeListingPage(FakeContext({}))
+
+        await IkeaScraper()._open_listing(page, self.URL)
+
+        assert page.calls == [
+            ("goto", "domcontentloaded"),
+            ("wait", 15000),
+            ("click", "#onetrust-accept-btn-handler"),
+        ]
+
+    async def test_consent_reused_by_later_contexts(self, pool):
+        """한 번 동의하면 같은 컨텍스트는 다시 확인하지 않고, 새 컨텍스트는 동의 상태로 시작"""
+        first = IkeaScraper()
+        await first._init_browser()
+        page = FakeListingPage(first.context)
+
+        await first._open_listing(page, self.URL)
+        await first._open_listing(page, self.URL)
+
+        second = IkeaScraper()
+        await second._init_browser()
+        later_page = FakeListingPage(second.context)
+        await second._open_listing(later_page, self.URL)
+
+        assert [c for c in page.calls if c[0] == "click"] == [("click", "#onetrust-accept-btn-handler")]
+        assert "storage_state" not in pool.contexts[0].options
+        assert pool.contexts[1].options["storage_state"]["cookies"][0]["name"] == "OptanonAlertBoxClosed"
+        assert [c for c in later_page.calls if c[0] == "click"] == []
+
+        await first.close()
+        await second.close()
+
+
+class FakeEvaluatePage:
+    def __init__(self, columns):
+        self.columns = columns
+
+    async def evaluate(self, script):
+        return self.columns
+
+
+def make_columns(*ids):
+    return {
+        "ids": list(ids),
+        "names": [f"NAME{i}" for i in ids],
+        "types": ["책상"] * len(ids),
+        "prices": [49900] * len(ids),
+        "imgs": ["img"] * len(ids),
+        "urls": [f"https://www.ikea.com/kr/ko/p/x-{i}/" for i in ids],
+        "ratings": [4.5] * len(ids),
+    }
+
+
+class TestParseSearchResults:
+    """필드별 배열 추출 결과 파싱 테스트"""
+
+    async def test_zip_columns(self):
+        """같은 인덱스끼리 묶어 상품 생성, 중복 ID 제외, limit 적용"""
+        page = FakeEvaluatePage(make_columns("00000001", "00000001", "00000002", "00000003"))
+
+        products = await IkeaScraper()._parse_search_results(page, limit=2)
+
+        assert [p.product_id for p in products] == ["00000001", "00000002"]
+        assert products[1] == IkeaProduct("00000002", "NAME00000002", "책상", 49900, "img",
+                                          "https://www.ikea.com/kr/ko/p/x-00000002/", rating=4.5)
+
+    async def test_empty(self):
+        """카드가 없으면 빈 목록"""
+        assert await IkeaScraper()._parse_search_results(FakeEvaluatePage(make_columns()), limit=5) == []
+
+
+class TestRunOnPages:
+    """페이지 풀 동시 수집 테스트"""
+
+    @pytest.fixture
+    def state(self, pool, monkeypatch):
+        state = {"running": 0, "peak": 0, "pages": set(), "calls": []}
+
+        def fake_fetch(kind):
+            async def fetch(scraper, arg, limit=20, page=None):
+                assert page is not None
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+                state["pages"].add(id(page))
+                state["calls"].append((kind, arg, limit))
+                await asyncio.sleep(0.01)
+                state["running"] -= 1
+                return [IkeaProduct(product_id=arg, name=arg)]
+            return fetch
+
+        async def no_api_results(scraper, query, limit):
+            return []
+
+        monkeypatch.setattr(IkeaScraper, '_search_api', no_api_results)
+        monkeypatch.setattr(IkeaScraper, '_search_with_browser', fake_fetch("search"))
+        monkeypatch.setattr(IkeaScraper, 'get_category_products', fake_fetch("category"))
+        return state
+
+    async def test_run_queries_bounded(self, pool, state):
+        """동시 검색 수는 concurrency 이하, 컨텍스트 하나에 페이지 concurrency개"""
+        queries = [f"키워드{i}" for i in range(7)]
+        results = await run_queries(queries, limit=5, concurrency=3)
+
+        assert state["peak"] == 3
+        assert len(state["pages"]) == 3
+        assert [results[q][0].product_id for q in queries] == queries
+        assert {limit for _, _, limit in state["calls"]} == {5}
+        assert len(pool.contexts) == 1
+        assert pool.browser is None
+
+    async def test_crawl_all_keywords_and_categories(self, pool, state):
+        """키워드 검색과 카테고리 수집을 함께 실행"""
+        results = await crawl_all(concurrency=4)
+
+        assert state["peak"] == 4
+        assert set(results) == set(IKEA_SEARCH_KEYWORDS) | set(IKEA_CATEGORIES)
+        assert {arg for kind, arg, _ in state["calls"] if kind == "category"} == set(IKEA_CATEGORIES)
+        assert all(page.closed for page in pool.contexts[0].pages)
+
+
+def api_response(*ids, status=200):
+    items = [{"product": {"id": i, "name": f"NAME{i}", "typeName": "책상", "priceNumeral": 49900,
+                          "mainImageUrl": "img", "pipUrl": f"url{i}", "ratingValue": 4.5, "ratingCount": 12}}
+             for i in ids]
+    return httpx.Response(status, json={"searchResultPage": {"products": {"main": {"items": items}}}})
+
+
+def api_scraper(handler):
+    scraper = IkeaScraper()
+    scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return scraper
+
+
+class TestSearchApi:
+    """검색 API(JSON) 우선 검색 테스트"""
+
+    async def test_parses_items_without_browser(self, pool):
+        """API 아이템을 IkeaProduct로 변환 (limit개까지 받아 중복 제외), 브라우저는 띄우지 않음"""
+        def handler(request):
+            assert request.url.params["q"] == "책상"
+            assert request.url.params["size"] == "3"
+            return api_response("00000001", "00000001", "00000002", "00000003")
+
+        scraper = api_scraper(handler)
+        products = await scraper.search_products("책상", limit=3)
+        client = scraper._client
+        await scraper.close()
+
+        assert [p.product_id for p in products] == ["00000001", "00000002"]
+        assert products[0] == IkeaProduct("00000001", "NAME00000001", "책상", 49900, "img", "url00000001",
+                                          rating=4.5, review_count=12)
+        assert pool.launches == 0
+        assert client.is_closed
+
+    async def test_requests_go_through_limiter(self, pool, monkeypatch):
+        """검색 API 요청마다 공유 limiter 대기 (동시에 여러 키워드를 보내도 속도 제한)"""
+        waits = []
+
+        async def wait_async():
+            waits.append(1)
+
+        monkeypatch.setattr(ikea_crawler.SEARCH_LIMITER, 'wait_async', wait_async)
+        scraper = api_scraper(lambda request: api_response("00000001"))
+
+        await asyncio.gather(*(scraper._search_api(q, 5) for q in ("책상", "의자", "소파")))
+        await scraper.close()
+
+        assert len(waits) == 3
+
+    async def test_fallback_to_browser(self, pool, monkeypatch):
+        """API 결과가 없으면 fallback일 때만 브라우저 검색"""
+        async def browser_search(scraper, query, limit=20, page=None):
+            return [IkeaProduct(product_id="browser", name=query)]
+
+        monkeypatch.setattr(IkeaScraper, '_search_with_browser', browser_search)
+        scraper = api_scraper(lambda request: api_response(status=503))
+
+        assert [p.product_id for p in await scraper.search_products("책상")] == ["browser"]
+        assert await scraper.search_products("책상", fallback=False) == []
+        await scraper.close()
+
+    async def test_run_queries_only_missing_use_browser(self, pool, monkeypatch):
+        """API에서 결과가 나온 검색어는 브라우저 작업에서 제외"""
+        browser_queries = []
+
+        async def search_api(scraper, query, limit):
+            return [] if query == "없음" else [IkeaProduct(product_id=query, name=query)]
+
+        async def browser_search(scraper, query, limit=20, page=None):
+            browser_queries.append(query)
+            return [IkeaProduct(product_id="browser", name=query)]
+
+        monkeypatch.setattr(IkeaScraper, '_search_api', search_api)
+        monkeypatch.setattr(IkeaScraper, '_search_with_browser', browser_search)
+
+        results = await run_queries(["책상", "없음", "의자"])
+
+        assert list(results) == ["책상", "없음", "의자"]
+        assert results["없음"][0].product_id == "browser"
+        assert browser_queries == ["없음"]
+
+    async def test_run_queries_skips_browser_when_api_covers_all(self, pool, monkeypatch):
+        """모든 검색어가 API로 해결되면 브라우저를 띄우지 않음"""
+        async def search_api(scraper, query, limit):
+            return [IkeaProduct(product_id=query, name=query)]
+
+        monkeypatch.setattr(IkeaScraper, '_search_api', search_api)
+
+        await run_queries(["책상", "의자"])
+
+        assert pool.launches == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
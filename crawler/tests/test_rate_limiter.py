@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limiter 테스트
+"""
+import asyncio
+import threading
+import time
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rate_limiter import RateLimiter
+
+
+class TestWaitAsync:
+    """비동기 대기 (토큰 예약) 테스트"""
+
+    async def test_concurrent_callers_spaced_by_rate(self):
+        """동시에 호출한 N개는 버스트 이후 1/rate 간격으로 실행"""
+        limiter = RateLimiter(requests_per_second=20, burst_size=1)
+        start = time.monotonic()
+        times = []
+
+        async def call():
+            await limiter.wait_async()
+            times.append(time.monotonic() - start)
+
+        await asyncio.gather(*(call() for _ in range(5)))
+
+        times.sort()
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert times[0] == pytest.approx(0, abs=0.02)
+        assert all(gap == pytest.approx(1 / 20, abs=0.02) for gap in gaps)
+        assert times[-1] == pytest.approx(4 / 20, abs=0.03)
+
+    async def test_reserved_wait_times(self):
+        """예약된 대기 시간은 0, 1/rate, 2/rate, ... 순서"""
+        limiter = RateLimiter(requests_per_second=10, burst_size=1)
+
+        waits = await asyncio.gather(*(limiter.wait_async() for _ in range(4)))
+
+        assert waits == pytest.approx([0, 0.1, 0.2, 0.3], abs=0.02)
+        assert limiter.stats()["total_requests"] == 4
+        assert limiter.stats()["total_waits"] == 3
+
+
+class TestWaitSync:
+    """동기 대기 테스트"""
+
+    async def test_sync_wait_keeps_async_reservations(self):
+        """동기 wait도 예약 방식이라 먼저 대기 중인 비동기 호출 뒤로 줄을 섬"""
+        limiter = RateLimiter(requests_per_second=10, burst_size=1)
+        tasks = [asyncio.create_task(limiter.wait_async()) for _ in range(3)]
+        await asyncio.sleep(0)  # 비동기 호출들이 토큰을 예약할 때까지
+
+        waited = await asyncio.to_thread(limiter.wait)
+        await asyncio.gather(*tasks)
+
+        assert waited == pytest.approx(0.3, abs=0.02)
+
+    def test_threads_spaced_by_rate(self):
+        """여러 스레드에서 동시에 호출해도 1/rate 간격"""
+        limiter = RateLimiter(requests_per_second=20, burst_size=1)
+        start = time.monotonic()
+        times = []
+
+        def call():
+            limiter.wait()
+            times.append(time.monotonic() - start)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(times)[-1] == pytest.approx(3 / 20, abs=0.03)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -595,38 +595,32 @@ class UnlimitedPipeline:
             if not IKEA_SCRAPER_AVAILABLE:
                 return {"error": "이케아 스크래퍼를 불러올 수 없습니다"}
 
-            from ikea_scraper import IkeaScraper
-            scraper = IkeaScraper(headless=True)
+            from ikea_scraper import run_queries
 
-            try:
-                all_products = []
-                keywords = config.get("keywords", [])
-                print(f"\n검색 키워드: {len(keywords)}개")
+            keywords = config.get("keywords", [])
+            print(f"\n검색 키워드: {len(keywords)}개")
 
-                for keyword in keywords:
-                    print(f"  검색: '{keyword}'")
-                    try:
-                        products = await scraper.search_products(keyword, limit=20)
-                        stats["products_crawled"] += len(products)
-                        for p in products:
-                            all_products.append(p)
-                            print(f"    - {p.name} ({p.type_name}): {p.price:,}원")
-                    except Exception as e:
-                        print(f"    [에러] {e}")
-                        stats["errors"].append(f"{keyword}: {e}")
-                    await asyncio.sleep(3)
-
-                seen_ids = set()
-                for p in all_products:
+            # 키워드는 공유 브라우저의 페이지 여러 개로 동시에 검색
+            try:
+                results = await run_queries(keywords, limit=20, concurrency=4)
+            except Exception as e:
+                print(f"    [에러] {e}")
+                stats["errors"].append(f"ikea: {e}")
+                results = {}
+
+            seen_ids = set()
+            for keyword, products in results.items():
+                print(f"  검색: '{keyword}'")
+                stats["products_crawled"] += len(products)
+                for p in products:
+                    print(f"    - {p.name} ({p.type_name}): {p.price:,}원")
                     if p.product_id not in seen_ids:
                         seen_ids.add(p.product_id)
                         if self.db.insert_ikea_product(p.to_dict()):
                             stats["products_saved"] += 1
 
-                print(f"\n크롤링 완료: {stats['products_crawled']}개 수집, "
-                      f"{stats['products_saved']}개 저장")
-            finally:
-                await scraper.close()
+            print(f"\n크롤링 완료: {stats['products_crawled']}개 수집, "
+                  f"{stats['products_saved']}개 저장")
 
         elif store_key in ["cu", "gs25", "seveneleven", "emart24"]:
             if not CONVENIENCE_SCRAPER_AVAILABLE: